@@ -0,0 +1,50 @@
+"""Prints statistics across a bot's finished games.
+
+Call this with the bot's name (which can include spaces), and optionally:
+--workers N, the number of processes to load games in, defaulting to one per CPU;
+--csv DIRECTORY, to also save the extracted table as CSV files.
+"""
+
+from argparse import ArgumentParser
+from math import isnan
+from time import perf_counter
+
+from lib.analytics import GameTable
+
+
+def _duration(seconds: float) -> str:
+    """Format a duration in seconds as hours and minutes."""
+    if isnan(seconds):
+        return "unknown"
+    minutes = int(seconds // 60)
+    return f"{minutes // 60}h {minutes % 60:02}m"
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Print statistics across finished games.")
+    parser.add_argument("bot_name", nargs="+")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--csv", default=None)
+    args = parser.parse_args()
+
+    start = perf_counter()
+    table = GameTable.from_directory(
+        f"resources/backup/{' '.join(args.bot_name)}/old/", args.workers
+    )
+    print(f"Analyzed {len(table)} games in {perf_counter() - start:.3f}s.")
+
+    print("\nGood win rate by script:")
+    for script, games, rate in table.script_win_rates():
+        print(f"  {script}: {rate:.0%} of {games} games")
+
+    print("\nWin rate by character:")
+    for character, games, rate in table.character_win_rates():
+        print(f"  {character}: {rate:.0%} of {games} games")
+
+    print(f"\nAverage day length: {_duration(table.mean_day_length())}")
+    for script, days, length in table.day_lengths():
+        print(f"  {script}: {_duration(length)} over {days} days")
+
+    if args.csv:
+        table.to_csv(args.csv)
+        print(f"\nSaved the table to {args.csv}.")
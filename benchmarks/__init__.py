@@ -0,0 +1 @@
+"""Contains benchmarks, run as modules from the repository root."""
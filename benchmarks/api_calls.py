@@ -0,0 +1,127 @@
+"""Checks that key commands stay within their budgets of discord API calls.
+
+Run from the repository root:
+python -m benchmarks.api_calls
+
+Games are played on the headless bot, whose fakes count every request under the
+route discord.py would use. Each command's calls are compared with its budget, a
+base number of calls plus a number per seated player; the script prints the most
+calls each command made, by route, and exits with status 1 if any command went over.
+
+The budgets are recorded baselines: each is the worst case measured when it was set,
+with no headroom, so any added call fails the check on purpose. A change which needs
+more calls raises the budget alongside the reason for it, and a change which saves
+calls lowers it, so the budgets only loosen deliberately.
+"""
+
+import asyncio
+from collections import Counter
+from sys import exit as sys_exit
+from typing import Dict, Iterable, List, Tuple, Union
+
+from lib.apicalls import CallTracker
+from lib.headless.fakes import FakeMember, FakeMessage
+from lib.headless.simulation import Responder, Simulation
+
+# command: (base calls, calls per seated player), the recorded worst cases
+BUDGETS = {
+    "startgame": (17, 1),
+    "vote": (10, 2),
+    "pm": (6, 0),
+    "endday": (7, 0),
+    "execute": (7, 0),
+}
+
+# players: travelers
+_SIZES = {5: 1, 10: 2, 15: 3, 20: 4}
+_SEEDS = range(3)
+_DAYS = 3
+
+
+class _BudgetedSimulation(Simulation):
+    """A simulation which records the calls made by each budgeted command."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # command: (seated players, calls) for each invocation
+        self.invocations = {
+            command: [] for command in BUDGETS
+        }  # type: Dict[str, List[Tuple[int, Counter]]]
+
+    async def command(
+        self,
+        author: FakeMember,
+        text: str,
+        dm: bool = True,
+        replies: Union[Iterable[str], Responder] = (),
+    ) -> List[FakeMessage]:
+        """Run a command, recording its calls if it's budgeted."""
+        tracker = self.bot.api_calls  # type: CallTracker
+        before = len(tracker.recent)
+        out = await super().command(author, text, dm, replies)
+        if not tracker.recent or len(tracker.recent) == before:
+            return out
+
+        name, calls = tracker.recent[-1]
+        if name in self.invocations and self.bot.game:
+            seated = len(self.bot.game.seating_order)
+            self.invocations[name].append((seated, calls))
+        return out
+
+
+async def _play(players: int, travelers: int, seed: int) -> Dict:
+    """Play a game, returning its budgeted commands' invocations."""
+    simulation = await _BudgetedSimulation.create(players, travelers, seed=seed)
+    try:
+        await simulation.play(_DAYS)
+        errors = simulation.bot.command_errors + simulation.bot.errors
+        if errors:
+            print(f"  {len(errors)} errors, the first: {errors[0]!r}")
+    finally:
+        await simulation.close()
+    return simulation.invocations
+
+
+async def _run() -> Dict[str, List[Tuple[int, Counter]]]:
+    """Play games at every size, collecting the budgeted commands' invocations."""
+    out = {command: [] for command in BUDGETS}  # type: Dict[str, List]
+    for players, travelers in _SIZES.items():
+        print(f"Playing {len(_SEEDS)} games of {players} players + {travelers}.")
+        for seed in _SEEDS:
+            played = await _play(players, travelers, seed)
+            for command, invocations in played.items():
+                out[command] += invocations
+    return out
+
+
+def main():
+    """Check every budgeted command, exiting with status 1 if any went over."""
+    invocations = asyncio.run(_run())
+
+    over = False
+    for command, (base, per_player) in BUDGETS.items():
+        if not invocations[command]:
+            print(f"{command}: never invoked")
+            continue
+
+        worst = max(
+            invocations[command],
+            key=lambda item: sum(item[1].values()) - base - per_player * item[0],
+        )
+        seated, calls = worst
+        budget = base + per_player * seated
+        exceeded = sum(calls.values()) > budget
+        over = over or exceeded
+        print(
+            f"{command}: {sum(calls.values())} calls with {seated} players seated, "
+            f"budget {budget}" + ("  <-- over budget" if exceeded else "")
+        )
+        for route, count in calls.most_common():
+            print(f"  {route}: {count}")
+
+    if over:
+        sys_exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Measures the time and memory each gameplay command takes, from message to reply.
+
+Run from the repository root, optionally with the file to save results to and a
+previous results file to compare them with:
+python -m benchmarks.commands [results.json] [baseline.json]
+
+Games are played on the headless bot, so every command goes through the real cogs,
+checks, and after-invoke backup. Each game size is played twice with the same seeds:
+once for wall time, and once under tracemalloc for allocations, since tracing slows
+everything down. Results are saved as JSON, by default to
+benchmarks/results/commands-<commit>.json.
+"""
+
+import asyncio
+import json
+import platform
+import subprocess
+import tracemalloc
+from datetime import datetime
+from os import makedirs
+from os.path import dirname
+from statistics import mean, median
+from sys import argv
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Union
+
+from lib.headless.fakes import FakeMember, FakeMessage
+from lib.headless.simulation import Responder, Simulation
+
+# the commands measured, by name
+COMMANDS = ("nominate", "vote", "prevote", "pm", "nextstep", "endday")
+
+# players: travelers
+_SIZES = {5: 1, 10: 2, 15: 3, 20: 4}
+_SEEDS = range(3)
+_DAYS = 3
+_PMS_PER_DAY = 5
+_PREVOTES_PER_VOTE = 2
+
+# results whose time changes by more than this fraction are flagged in comparisons
+_THRESHOLD = 0.2
+
+
+class _MeasuredSimulation(Simulation):
+    """A simulation which records each measured command's time or allocations."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.trace = False
+        # command: the samples, in seconds or (peak, retained) bytes
+        self.samples = {
+            command: [] for command in COMMANDS
+        }  # type: Dict[str, List[Any]]
+
+    async def command(
+        self,
+        author: FakeMember,
+        text: str,
+        dm: bool = True,
+        replies: Union[Iterable[str], Responder] = (),
+    ) -> List[FakeMessage]:
+        """Run a command, measuring it if it's one of COMMANDS."""
+        name = text.split(" ")[0]
+        if name not in self.samples:
+            return await super().command(author, text, dm, replies)
+
+        if self.trace:
+            # restarting clears the traces, so the peak is this command's alone
+            tracemalloc.stop()
+            tracemalloc.start()
+            out = await super().command(author, text, dm, replies)
+            retained, peak = tracemalloc.get_traced_memory()
+            self.samples[name].append((peak, retained))
+        else:
+            start = perf_counter()
+            out = await super().command(author, text, dm, replies)
+            self.samples[name].append(perf_counter() - start)
+        return out
+
+
+async def _play_day(simulation: _MeasuredSimulation):
+    """Play a day exercising every measured command."""
+    game = simulation.bot.game
+    assert game
+    rng = simulation.rng
+    await simulation.open()
+
+    members = [player.member for player in game.seating_order]
+    for _ in range(_PMS_PER_DAY):
+        sender, recipient = rng.sample(members, 2)
+        await simulation.pm(sender, recipient)
+
+    nominators = [player.member for player in game.to_nominate]
+    nominees = [player.member for player in game.seating_order]
+    if nominators:
+        await simulation.nominate(rng.choice(nominators), rng.choice(nominees))
+
+    vote = game.current_day and game.current_day.current_vote
+    if vote:
+        later = vote.order[vote.position + 1 :]
+        for voter in rng.sample(later, min(_PREVOTES_PER_VOTE, len(later))):
+            await simulation.prevote(voter.member, rng.choice(["yes", "no"]))
+        await simulation.vote_all(lambda member: rng.choice(["yes", "no"]))
+
+    if simulation.bot.game and simulation.bot.game.current_day:
+        await simulation.command(simulation.storyteller, "endday", replies=["yes"])
+
+
+async def _play(players: int, travelers: int, seed: int, trace: bool) -> Dict:
+    """Play a game, returning its measured command samples."""
+    simulation = await _MeasuredSimulation.create(players, travelers, seed=seed)
+    simulation.trace = trace
+    try:
+        await simulation.start_game()
+        await simulation.run_night()
+        for _ in range(_DAYS):
+            if not simulation.bot.game:
+                break
+            await _play_day(simulation)
+            await simulation.run_night()
+        await simulation.end_game()
+        errors = simulation.bot.command_errors + simulation.bot.errors
+        if errors:
+            print(f"  {len(errors)} errors, the first: {errors[0]!r}")
+    finally:
+        await simulation.close()
+    return simulation.samples
+
+
+def _summarize(times: List[float], allocations: List[Any]) -> Dict[str, Any]:
+    """Summarize a command's samples."""
+    ordered = sorted(times)
+    return {
+        "count": len(times),
+        "mean_ms": mean(times) * 1000,
+        "median_ms": median(times) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "mean_peak_kib": mean(peak for peak, _ in allocations) / 1024,
+        "mean_retained_kib": mean(retained for _, retained in allocations) / 1024,
+    }
+
+
+async def _run() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Measure every command at every game size."""
+    # the first game loads the scripts and characters, so it isn't measured
+    await _play(min(_SIZES), _SIZES[min(_SIZES)], -1, False)
+
+    results = {}
+    for players, travelers in _SIZES.items():
+        print(f"Playing {len(_SEEDS)} games of {players} players + {travelers}.")
+        times = {command: [] for command in COMMANDS}  # type: Dict[str, List]
+        allocations = {command: [] for command in COMMANDS}  # type: Dict[str, List]
+        for seed in _SEEDS:
+            for trace, samples in ((False, times), (True, allocations)):
+                played = await _play(players, travelers, seed, trace)
+                for command in COMMANDS:
+                    samples[command] += played[command]
+        tracemalloc.stop()
+        results[f"{players}+{travelers}"] = {
+            command: _summarize(times[command], allocations[command])
+            for command in COMMANDS
+            if times[command]
+        }
+    return results
+
+
+def _commit() -> str:
+    """Determine the current commit's short hash, or "unknown" outside of git."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _compare(results: Dict, baseline: Dict):
+    """Print the change in each command's median time from a baseline."""
+    print(f"Compared with {baseline['commit']}:")
+    for size, commands in results.items():
+        for command, summary in commands.items():
+            try:
+                before = baseline["results"][size][command]["median_ms"]
+            except KeyError:
+                continue
+            change = summary["median_ms"] / before - 1
+            flag = "  <--" if abs(change) > _THRESHOLD else ""
+            print(f"{size:<8}{command:<10}{change:>+10.1%}{flag}")
+
+
+def main():
+    """Measure the commands, print a summary, and save the results."""
+    commit = _commit()
+    path = argv[1] if len(argv) > 1 else f"benchmarks/results/commands-{commit}.json"
+    results = asyncio.run(_run())
+
+    print(
+        f"{'size':<8}{'command':<10}{'count':>6}{'median (ms)':>13}"
+        f"{'p95 (ms)':>10}{'peak (KiB)':>12}"
+    )
+    for size, commands in results.items():
+        for command, summary in commands.items():
+            print(
+                f"{size:<8}{command:<10}{summary['count']:>6}"
+                f"{summary['median_ms']:>13.2f}{summary['p95_ms']:>10.2f}"
+                f"{summary['mean_peak_kib']:>12.1f}"
+            )
+
+    if len(argv) > 2:
+        with open(argv[2]) as file:
+            _compare(results, json.load(file))
+
+    if dirname(path):
+        makedirs(dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(
+            {
+                "commit": commit,
+                "date": datetime.utcnow().isoformat(),
+                "python": platform.python_version(),
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+    print(f"Saved results to {path}.")
+
+
+if __name__ == "__main__":
+    main()
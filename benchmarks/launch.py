@@ -0,0 +1,81 @@
+"""Measures the memory and startup time saved by running several bots in one process.
+
+Run from the repository root:
+python -m benchmarks.launch
+
+Each measurement runs in a fresh interpreter, which builds headless bots, loads their
+cogs, and prewarms them, as launcher.py and main.py would before connecting. Running
+n bots separately is estimated as n times a single bot's process.
+"""
+
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+from statistics import median
+from time import perf_counter
+from typing import Dict, Tuple
+
+# the numbers of bots measured in one process
+_COUNTS = (2, 5, 10)
+_REPEATS = 3
+
+
+async def _child(count: int):
+    """Build and prewarm count bots, then print the process's peak memory."""
+    # imported here, so their cost is part of the measurement
+    from lib.headless.bot import HeadlessBot  # pylint: disable=import-outside-toplevel
+    from lib.prewarm import prewarm  # pylint: disable=import-outside-toplevel
+
+    bots = [HeadlessBot(f"bot {i}") for i in range(count)]
+    for bot in bots:
+        bot.load_cogs()
+    await asyncio.gather(*(prewarm(bot) for bot in bots))
+    for bot in bots:
+        await bot.close()
+
+    # ru_maxrss is in KiB on Linux
+    print(json.dumps({"rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+
+
+def _measure(count: int) -> Tuple[float, float]:
+    """Measure a process running count bots, returning its median seconds and MiB."""
+    times = []
+    sizes = []
+    for _ in range(_REPEATS):
+        start = perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.launch", "--child", str(count)],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        times.append(perf_counter() - start)
+        sizes.append(json.loads(out.strip().split("\n")[-1])["rss_kib"] / 1024)
+    return median(times), median(sizes)
+
+
+def main():
+    """Measure one bot per process and several per process, printing a comparison."""
+    single_time, single_size = _measure(1)
+    print(f"One bot: {single_time:.2f}s, {single_size:.1f} MiB.")
+    print(
+        f"{'bots':>4}{'separate (s)':>14}{'shared (s)':>12}"
+        f"{'separate (MiB)':>16}{'shared (MiB)':>14}{'saved':>8}"
+    )
+    results = {}  # type: Dict[int, Tuple[float, float]]
+    for count in _COUNTS:
+        results[count] = time, size = _measure(count)
+        separate = single_size * count
+        print(
+            f"{count:>4}{single_time * count:>14.2f}{time:>12.2f}"
+            f"{separate:>16.1f}{size:>14.1f}{1 - size / separate:>8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        asyncio.run(_child(int(sys.argv[2])))
+    else:
+        main()
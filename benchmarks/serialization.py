@@ -0,0 +1,121 @@
+"""Compares the game state format with dill on size and speed.
+
+Run from the repository root, optionally with a path to an existing backup:
+python -m benchmarks.serialization [resources/backup/<bot>/current_game.pckl]
+
+Without a path, a synthetic mid-game state is built and benchmarked instead.
+"""
+
+from datetime import datetime, timedelta
+from random import Random
+from sys import argv
+from timeit import repeat
+from typing import Any, Callable
+
+import dill
+from discord import Object
+
+from lib import serialization
+from lib.logic.Character import Storyteller
+from lib.logic.Day import Day
+from lib.logic.Effect import Dead, Poisoned
+from lib.logic.Game import Game
+from lib.logic.Night import Night
+from lib.logic.Player import Player
+from lib.logic.Script import script_list
+from lib.logic.Vote import Vote
+
+_PLAYERS = 15
+_DAYS = 3
+_VOTES_PER_DAY = 3
+_REPEATS = 5
+_NUMBER = 20
+
+
+def synthetic_game(players: int = _PLAYERS, seed: int = 0) -> Game:
+    """Build a plausible mid-game state, without discord."""
+    rng = Random(seed)
+    script = next(script_list(None))  # type: ignore  # trouble brewing
+    characters = rng.sample(script.character_list, players)
+    seating_order = [
+        Player(Object(1000 + i), character, i) for i, character in enumerate(characters)
+    ]
+    storytellers = [Player(Object(1), Storyteller, None)]
+    # the message is stored by id, so any snowflake will do
+    game = Game(seating_order, Object(2), script, storytellers)  # type: ignore
+
+    start = datetime(2020, 1, 1)
+    for day in range(_DAYS):
+        game.current_night = Night(game)
+        game.past_nights.append(game.current_night)
+        game.current_night = None
+
+        rng.choice(seating_order).add_effect(game, Poisoned, rng.choice(seating_order))
+        rng.choice(seating_order).add_effect(game, Dead, rng.choice(seating_order))
+
+        game.current_day = Day()
+        for player in seating_order:
+            for _ in range(rng.randrange(4)):
+                to = rng.choice(seating_order)
+                message = {
+                    "from": player,
+                    "to": to,
+                    "content": "a private message " * rng.randrange(1, 8),
+                    "day": day + 1,
+                    "time": start + timedelta(days=day, minutes=rng.randrange(600)),
+                }
+                player.message_history.append(message)
+                to.message_history.append(message)
+
+        for _ in range(_VOTES_PER_DAY):
+            nominator, nominee = rng.sample(seating_order, 2)
+            vote = Vote(game, nominee, nominator)
+            vote.prevotes = {player: rng.randrange(2) for player in vote.order[::2]}
+            vote.voted = [player for player in vote.order if rng.random() < 0.5]
+            vote.votes = len(vote.voted)
+            vote.announcements = [rng.getrandbits(60) for _ in range(2)]
+            game.current_day.past_votes.append(vote)
+        game.current_day.about_to_die = (nominee, vote.votes, rng.getrandbits(60))
+
+        game.past_days.append(game.current_day)
+        game.current_day = None
+
+    game.current_day = Day()
+    return game
+
+
+def _best(func: Callable[[], Any]) -> float:
+    """Time func, returning the best mean time per call in milliseconds."""
+    return min(repeat(func, repeat=_REPEATS, number=_NUMBER)) / _NUMBER * 1000
+
+
+def main():
+    """Print the size and save and load times of each format."""
+    if len(argv) > 1:
+        with open(argv[1], "rb") as file:
+            game = serialization.load(file)
+        print(f"Benchmarking {argv[1]}.")
+    else:
+        game = synthetic_game()
+        print(f"Benchmarking a synthetic {_PLAYERS} player game.")
+
+    pickled = dill.dumps(game)
+    saved = serialization.dumps(game)
+
+    print(f"{'format':<8}{'size (B)':>10}{'save (ms)':>12}{'load (ms)':>12}")
+    for name, data, dumps, loads in (
+        ("dill", pickled, dill.dumps, dill.loads),
+        (
+            f"v{serialization.FORMAT_VERSION}",
+            saved,
+            serialization.dumps,
+            serialization.loads,
+        ),
+    ):
+        save_time = _best(lambda: dumps(game))
+        load_time = _best(lambda: loads(data))
+        print(f"{name:<8}{len(data):>10}{save_time:>12.2f}{load_time:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
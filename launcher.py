@@ -0,0 +1,72 @@
+"""Runs several bots in one process, sharing an event loop.
+
+Call this with the names of the bots to run, quoting names which include spaces, or
+with no arguments to run every bot in config.ini.
+
+The bots share everything read-only, like scripts, character info, and character
+modules, so those are loaded once for the process rather than once per bot.
+"""
+
+import asyncio
+import resource
+from configparser import ConfigParser
+from sys import argv
+from sys import exit as sysexit
+from time import perf_counter
+from typing import List
+
+import discord
+
+from lib.bot import BOTCBot
+from lib.launch import CONFIG_FILE, bot_names, build_bot
+
+
+async def _run(bot: BOTCBot, token: str):
+    """Run a bot until it closes, so that one bot failing leaves the others up."""
+    try:
+        await bot.start(token)
+    except discord.LoginFailure as e:
+        print(f'Bot "{bot.bot_name}" couldn\'t log in: {e}')
+    finally:
+        if not bot.is_closed():
+            await bot.close()
+
+
+def main():
+    """Build and run the bots."""
+    config = ConfigParser()
+    config.read(CONFIG_FILE)
+    names = argv[1:] or bot_names(config)
+
+    loop = asyncio.get_event_loop()
+    load_start = perf_counter()
+    bots = []  # type: List[BOTCBot]
+    for name in names:
+        try:
+            bots.append(build_bot(name, config))
+        except KeyError as error:
+            if str(error) == f"'{name}'":
+                print(f'Bot "{name}" not found.')
+            else:
+                print(f'Key {str(error)} not defined in config.ini for "{name}".')
+            print("Shutting down.")
+            sysexit()
+
+    # ru_maxrss is in KiB on Linux
+    print(
+        f"Loaded {len(bots)} bots in {perf_counter() - load_start:.3f}s, using "
+        f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB."
+    )
+
+    try:
+        loop.run_until_complete(
+            asyncio.gather(*(_run(bot, config[bot.bot_name]["TOKEN"]) for bot in bots))
+        )
+    except KeyboardInterrupt:
+        loop.run_until_complete(asyncio.gather(*(bot.close() for bot in bots)))
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Contains the ActorProfile class, describing who invoked a command."""
+
+from typing import TYPE_CHECKING, NamedTuple, Optional, Union
+
+import discord
+
+from lib.exceptions import PlayerNotFoundError
+from lib.utils import get_player
+
+if TYPE_CHECKING:
+    from lib.bot import BOTCBot
+    from lib.logic.Player import Player
+    from lib.typings.context import Context
+
+
+class ActorProfile(NamedTuple):
+    """Stores a command invoker's roles and player, resolved for each invocation.
+
+    Commands stack several checks, each of which used to look the invoker up again.
+
+    Attributes
+    ----------
+    is_storyteller : bool
+        Whether the invoker has the storyteller role.
+    is_observer : bool
+        Whether the invoker has the observer role.
+    is_playtester : bool
+        Whether the invoker has the playtest role, if the bot has playtesting enabled.
+    player : Optional[Player]
+        The invoker's player in the current game, not counting storytellers; None if
+        there's no game or they aren't playing.
+    """
+
+    is_storyteller: bool
+    is_observer: bool
+    is_playtester: bool
+    player: Optional["Player"]
+
+    @classmethod
+    def resolve(
+        cls, bot: "BOTCBot", user: Union[discord.User, discord.Member]
+    ) -> "ActorProfile":
+        """Look up a user's roles and player."""
+        player = None
+        if bot.game:
+            try:
+                player = get_player(bot.game, user.id, include_storytellers=False)
+            except PlayerNotFoundError:
+                pass
+
+        return cls(
+            bot.role_index.has(bot.storyteller_role, user),
+            bot.role_index.has(bot.observer_role, user),
+            bot.role_index.has(bot.playtest_role, user),
+            player,
+        )
+
+
+def get_actor(ctx: "Context") -> ActorProfile:
+    """Determine the context's actor profile, resolving it if it hasn't been.
+
+    BOTCBot resolves it for every command invocation, so this only does the lookup
+    for contexts built some other way, or whose profile lib.locking.unlocked cleared
+    since it may be stale.
+    """
+    actor = getattr(ctx, "actor", None)
+    if actor is None:
+        actor = ctx.actor = ActorProfile.resolve(ctx.bot, ctx.author)
+    return actor
@@ -0,0 +1,248 @@
+"""Contains the GameTable class, for statistics across archived games.
+
+Games are loaded in worker processes, which reduce each to a GameFacts of plain
+values, so only one game per worker is ever in memory. The facts are collected into
+NumPy columns for aggregate queries.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from csv import writer
+from datetime import datetime
+from os.path import isfile
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from lib.archive import MANIFEST, Archive, archived_files
+from lib.serialization import load
+
+# the value of a winner or an alignment in the table's integer columns
+ALIGNMENTS = {"good": 1, "evil": -1}
+
+# games per task sent to a worker; games are small, so this mostly saves overhead
+_CHUNKSIZE = 4
+
+
+class GameFacts(NamedTuple):
+    """Stores the facts analytics needs about a single game.
+
+    Attributes
+    ----------
+    number : int
+        The game's archive number.
+    script : str
+        The name of the game's script.
+    winner : int
+        1 if good won, -1 if evil won, or 0 if neither or unknown.
+    characters : List[str]
+        The players' characters' names.
+    alignments : List[int]
+        The players' alignments at the end of the game, 1 for good and -1 for evil.
+    day_lengths : List[float]
+        Each day's length in seconds, or NaN if unknown.
+    """
+
+    number: int
+    script: str
+    winner: int
+    characters: List[str]
+    alignments: List[int]
+    day_lengths: List[float]
+
+
+def _day_lengths(game: Any) -> List[float]:
+    """Determine each day's length in seconds.
+
+    Days from before days were timestamped are estimated from their first and last
+    private messages.
+    """
+    message_times = {}  # type: Dict[int, List[datetime]]
+    seen = set()
+    for player in game.seating_order:
+        for message in player.message_history:
+            if id(message) not in seen:  # each message is in two histories
+                seen.add(id(message))
+                message_times.setdefault(message["day"], []).append(message["time"])
+
+    days = game.past_days + ([game.current_day] if game.current_day else [])
+    out = []
+    for number, day in enumerate(days, 1):
+        start = getattr(day, "start_time", None)
+        end = getattr(day, "end_time", None)
+        if start and end:
+            out.append((end - start).total_seconds())
+        elif len(message_times.get(number, [])) > 1:
+            times = message_times[number]
+            out.append((max(times) - min(times)).total_seconds())
+        else:
+            out.append(float("nan"))
+    return out
+
+
+def _alignment(game: Any, player: Any) -> int:
+    """Determine a player's alignment at the end of a game."""
+    if player.is_status(game, "good"):
+        return ALIGNMENTS["good"]
+    if player.is_status(game, "evil"):
+        return ALIGNMENTS["evil"]
+    return 0
+
+
+def extract(number: int, path: str) -> Optional[GameFacts]:
+    """Load an archived game and reduce it to its facts, or None if it can't be read.
+
+    This runs in worker processes, so it must stay a module-level function.
+    """
+    try:
+        with open(path, "rb") as file:
+            game = load(file)
+        return GameFacts(
+            number,
+            game.script.name,
+            ALIGNMENTS.get(getattr(game, "winner", None) or "", 0),
+            [player.character.name for player in game.seating_order],
+            [_alignment(game, player) for player in game.seating_order],
+            _day_lengths(game),
+        )
+    except Exception as e:  # pylint: disable=broad-except
+        # one unreadable game shouldn't stop the rest being analyzed
+        print(f"Couldn't analyze {path}: {e!r}")
+        return None
+
+
+def game_files(directory: str) -> Dict[int, str]:
+    """Find an archive directory's games' paths, by number."""
+    if isfile(directory + MANIFEST):
+        files = {entry.number: entry.file for entry in Archive(directory).entries}
+    else:
+        files = archived_files(directory)
+    return {number: directory + file for number, file in sorted(files.items())}
+
+
+class GameTable:
+    """Stores facts about many games as NumPy columns.
+
+    Parameters
+    ----------
+    facts : Iterable[GameFacts]
+        The games' facts, consumed one at a time.
+
+    Attributes
+    ----------
+    games : Dict[str, np.ndarray]
+        One row per game: "number", "script", "winner", and "players".
+    players : Dict[str, np.ndarray]
+        One row per player: "game" (the row in games), "character", "alignment", and
+        "won" (1 or 0, or -1 if the game had no winner or the alignment is unknown).
+    days : Dict[str, np.ndarray]
+        One row per day: "game" (the row in games), "day", and "length" in seconds.
+    """
+
+    def __init__(self, facts: Iterable[GameFacts]):
+        games = ([], [], [], [])  # type: Tuple[List, List, List, List]
+        players = ([], [], [], [])  # type: Tuple[List, List, List, List]
+        days = ([], [], [])  # type: Tuple[List, List, List]
+
+        for row, game in enumerate(facts):
+            for column, value in zip(
+                games,
+                (game.number, game.script, game.winner, len(game.characters)),
+            ):
+                column.append(value)
+            for character, alignment in zip(game.characters, game.alignments):
+                players[0].append(row)
+                players[1].append(character)
+                players[2].append(alignment)
+                players[3].append(
+                    int(alignment == game.winner) if alignment and game.winner else -1
+                )
+            for day, length in enumerate(game.day_lengths, 1):
+                days[0].append(row)
+                days[1].append(day)
+                days[2].append(length)
+
+        self.games = {
+            "number": np.array(games[0], dtype=np.int64),
+            "script": np.array(games[1], dtype=object),
+            "winner": np.array(games[2], dtype=np.int8),
+            "players": np.array(games[3], dtype=np.int16),
+        }  # type: Dict[str, np.ndarray]
+        self.players = {
+            "game": np.array(players[0], dtype=np.int64),
+            "character": np.array(players[1], dtype=object),
+            "alignment": np.array(players[2], dtype=np.int8),
+            "won": np.array(players[3], dtype=np.int8),
+        }  # type: Dict[str, np.ndarray]
+        self.days = {
+            "game": np.array(days[0], dtype=np.int64),
+            "day": np.array(days[1], dtype=np.int16),
+            "length": np.array(days[2], dtype=np.float64),
+        }  # type: Dict[str, np.ndarray]
+
+    @classmethod
+    def from_directory(
+        cls, directory: str, workers: Optional[int] = None
+    ) -> "GameTable":
+        """Analyze every game in an archive directory in a process pool."""
+        files = game_files(directory)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            facts = executor.map(
+                extract, list(files), list(files.values()), chunksize=_CHUNKSIZE
+            )
+            return cls(game for game in facts if game is not None)
+
+    def __len__(self) -> int:
+        """Determine the number of games in the table."""
+        return len(self.games["number"])
+
+    def script_win_rates(self) -> List[Tuple[str, int, float]]:
+        """Determine each script's decided games and good win rate."""
+        decided = self.games["winner"] != 0
+        return _grouped_means(
+            self.games["script"][decided], self.games["winner"][decided] == 1
+        )
+
+    def character_win_rates(self) -> List[Tuple[str, int, float]]:
+        """Determine each character's decided games and win rate."""
+        decided = self.players["won"] != -1
+        return _grouped_means(
+            self.players["character"][decided], self.players["won"][decided] == 1
+        )
+
+    def day_lengths(self) -> List[Tuple[str, int, float]]:
+        """Determine each script's known days and mean day length in seconds."""
+        known = ~np.isnan(self.days["length"])
+        scripts = self.games["script"][self.days["game"][known]]
+        return _grouped_means(scripts, self.days["length"][known])
+
+    def mean_day_length(self) -> float:
+        """Determine the mean length of every known day, in seconds."""
+        lengths = self.days["length"]
+        if np.isnan(lengths).all():
+            return float("nan")
+        return float(np.nanmean(lengths))
+
+    def to_csv(self, directory: str):
+        """Save the table as games.csv, players.csv, and days.csv in directory."""
+        for name, table in (
+            ("games", self.games),
+            ("players", self.players),
+            ("days", self.days),
+        ):
+            with open(f"{directory}/{name}.csv", "w", newline="") as file:
+                csv = writer(file)
+                csv.writerow(table)
+                csv.writerows(zip(*table.values()))
+
+
+def _grouped_means(
+    keys: np.ndarray, values: np.ndarray
+) -> List[Tuple[str, int, float]]:
+    """Determine the count and mean of values for each key, most common first."""
+    if not len(keys):
+        return []
+    groups, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse)
+    means = np.bincount(inverse, weights=values.astype(np.float64)) / counts
+    order = sorted(range(len(groups)), key=lambda i: (-counts[i], groups[i]))
+    return [(groups[i], int(counts[i]), float(means[i])) for i in order]
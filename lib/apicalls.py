@@ -0,0 +1,100 @@
+"""Contains the CallTracker class, for counting each command's discord API calls."""
+
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from discord.http import HTTPClient, Route
+    from lib.typings.context import Context
+
+# the number of recent invocations kept
+HISTORY = 50
+
+# the calls made by the command running in the current task, by route
+_calls = ContextVar("calls", default=None)  # type: ContextVar[Optional[Counter]]
+
+
+def route_key(method: str, path: str) -> str:
+    """Describe a route by its method and unformatted path, like "GET /channels"."""
+    return f"{method} {path}"
+
+
+def record(method: str, path: str):
+    """Count a call against the command running in the current task, if any.
+
+    Parameters
+    ----------
+    method : str
+        The HTTP method.
+    path : str
+        The unformatted path, like "/channels/{channel_id}/messages".
+    """
+    calls = _calls.get()
+    if calls is not None:
+        calls[route_key(method, path)] += 1
+
+
+class CallTracker:
+    """Counts the discord API calls each command invocation makes, by route.
+
+    A command's calls are counted from its before-invoke hook until the messages it
+    queued are sent, in the task running it. Tasks it starts, like typing
+    indicators and queued messages, inherit the count, but other commands and event
+    handlers don't.
+
+    Attributes
+    ----------
+    recent : Deque[Tuple[str, Counter]]
+        The last HISTORY invocations' commands and calls, oldest first.
+    totals : Dict[str, Tuple[int, Counter]]
+        Each command's number of invocations and total calls.
+    """
+
+    def __init__(self):
+        self.recent = deque(maxlen=HISTORY)  # type: Deque[Tuple[str, Counter]]
+        self.totals = {}  # type: Dict[str, Tuple[int, Counter]]
+
+    def install(self, http: "HTTPClient"):
+        """Count every request a discord HTTP client makes."""
+        request = http.request
+
+        async def counted(route: "Route", **kwargs):
+            record(route.method, route.path)
+            return await request(route, **kwargs)
+
+        http.request = counted  # type: ignore
+
+    @staticmethod
+    def start(ctx: "Context"):
+        """Start counting a command invocation's calls."""
+        ctx.api_calls = Counter()
+        _calls.set(ctx.api_calls)
+
+    def finish(self, ctx: "Context") -> Counter:
+        """Stop counting a command invocation's calls, and record them."""
+        _calls.set(None)
+        try:
+            calls = ctx.api_calls
+        except AttributeError:
+            calls = Counter()
+        name = ctx.command.qualified_name
+        self.recent.append((name, calls))
+        count, total = self.totals.get(name, (0, Counter()))
+        self.totals[name] = (count + 1, total + calls)
+        return calls
+
+    def summary(self, name: Optional[str] = None) -> List[Tuple[str, int, Counter]]:
+        """Determine commands' invocations and total calls, the most calls first.
+
+        Parameters
+        ----------
+        name : Optional[str]
+            The command to summarize, or None for every command.
+        """
+        out = [
+            (command, count, total)
+            for command, (count, total) in self.totals.items()
+            if name in (None, command)
+        ]
+        return sorted(out, key=lambda item: -sum(item[2].values()) / item[1])
@@ -0,0 +1,209 @@
+"""Contains the Archive class, for storing finished games."""
+
+import json
+from datetime import datetime
+from os import listdir, replace, stat
+from os.path import isdir, isfile
+from re import compile as re_compile
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple
+
+from discord.utils import snowflake_time
+
+from lib.serialization import dumps, load
+
+if TYPE_CHECKING:
+    from lib.logic.Game import Game
+
+MANIFEST = "manifest.json"
+
+# matches archived games' file names, including pickles from before the archive
+_GAME_FILE = re_compile(r"game_(\d+)\.(state|pckl)")
+
+
+class ArchiveEntry(NamedTuple):
+    """Stores the summary of an archived game, so listing never loads a game.
+
+    Attributes
+    ----------
+    number : int
+        The game's number, counting from 1.
+    script : str
+        The name of the game's script.
+    winner : Optional[str]
+        "good", "evil", or "neutral"; None if unknown.
+    started : Optional[str]
+        The ISO time the game started, or None if unknown.
+    ended : str
+        The ISO time the game was archived.
+    players : List[Tuple[int, str]]
+        The players' discord IDs and characters' names, in seating order.
+    storytellers : List[int]
+        The storytellers' discord IDs.
+    file : str
+        The game's file name in the archive directory.
+    """
+
+    number: int
+    script: str
+    winner: Optional[str]
+    started: Optional[str]
+    ended: str
+    players: List[Tuple[int, str]]
+    storytellers: List[int]
+    file: str
+
+
+def _id(obj: Any) -> int:
+    """Determine a discord object's ID, whether or not it's been restored."""
+    return getattr(obj, "id", obj)
+
+
+def _summarize(game: "Game", number: int, file: str, ended: datetime) -> ArchiveEntry:
+    """Build the manifest entry for a game."""
+    message_id = _id(game.seating_order_message)
+    return ArchiveEntry(
+        number,
+        game.script.name,
+        getattr(game, "winner", None),
+        snowflake_time(message_id).isoformat() if message_id else None,
+        ended.isoformat(),
+        [
+            (_id(player.member), player.character.name)
+            for player in game.seating_order
+        ],
+        [_id(st.member) for st in game.storytellers],
+        file,
+    )
+
+
+def archived_files(directory: str) -> Dict[int, str]:
+    """Find the games in an archive directory, by number, without the manifest."""
+    files = {}  # type: Dict[int, str]
+    if isdir(directory):
+        for file in listdir(directory):
+            match = _GAME_FILE.fullmatch(file)
+            if match:
+                files.setdefault(int(match.group(1)), file)
+    return files
+
+
+class Archive:
+    """Stores finished games, with a manifest summarizing them.
+
+    Games are saved in the compressed state format from lib.serialization, as
+    game_<number>.state. The manifest stores the next free number, so archiving a game
+    writes two files no matter how many are archived, and a summary of each game, so
+    listing them never loads a game.
+
+    A directory of pickles from before the archive is indexed on first use, which loads
+    each of them once.
+
+    Parameters
+    ----------
+    directory : str
+        The directory to store games in, ending in a slash.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._next = 1
+        self._entries = None  # type: Optional[List[ArchiveEntry]]
+
+    @property
+    def entries(self) -> List[ArchiveEntry]:
+        """Determine the archived games' summaries, oldest first."""
+        if self._entries is None:
+            if isfile(self.directory + MANIFEST):
+                self._entries = self._read_manifest()
+            else:
+                self._entries = self._index_legacy()
+        return self._entries
+
+    def __len__(self) -> int:
+        """Determine the number of archived games."""
+        return len(self.entries)
+
+    def get(self, number: int) -> Optional[ArchiveEntry]:
+        """Find the summary of a game by number, or None."""
+        for entry in reversed(self.entries):
+            if entry.number == number:
+                return entry
+        return None
+
+    def add(self, game: "Game") -> ArchiveEntry:
+        """Archive a game, returning its summary."""
+        entries = self.entries
+        number = self._next
+        file = f"game_{number}.state"
+        entry = _summarize(game, number, file, datetime.utcnow())
+
+        with open(self.directory + file, "wb") as f:
+            f.write(dumps(game))
+        entries.append(entry)
+        self._next += 1
+        self._write_manifest()
+        return entry
+
+    def load(self, number: int) -> "Game":
+        """Load an archived game by number.
+
+        Raises
+        ------
+        KeyError
+            If no game has that number.
+        """
+        entry = self.get(number)
+        if entry is None:
+            raise KeyError(number)
+        with open(self.directory + entry.file, "rb") as file:
+            return load(file)
+
+    def _read_manifest(self) -> List[ArchiveEntry]:
+        """Load the entries and next number from the manifest, returning the entries."""
+        with open(self.directory + MANIFEST) as file:
+            manifest = json.load(file)
+        self._next = manifest["next"]
+        return [
+            entry._replace(
+                players=[(idn, character) for idn, character in entry.players]
+            )
+            for entry in (ArchiveEntry(**game) for game in manifest["games"])
+        ]
+
+    def _write_manifest(self):
+        """Save the entries and next number to the manifest."""
+        # write then rename, so a crash never leaves a partial manifest
+        manifest = {
+            "next": self._next,
+            "games": [entry._asdict() for entry in self.entries],
+        }
+        with open(self.directory + MANIFEST + ".tmp", "w") as file:
+            json.dump(manifest, file)
+        replace(self.directory + MANIFEST + ".tmp", self.directory + MANIFEST)
+
+    def _index_legacy(self) -> List[ArchiveEntry]:
+        """Build the manifest from the games already in the directory.
+
+        Returns
+        -------
+        List[ArchiveEntry]
+            The games' entries.
+        """
+        entries = []  # type: List[ArchiveEntry]
+        files = archived_files(self.directory)
+        for number, file in sorted(files.items()):
+            path = self.directory + file
+            try:
+                with open(path, "rb") as f:
+                    game = load(f)
+                ended = datetime.utcfromtimestamp(stat(path).st_mtime)
+                entries.append(_summarize(game, number, file, ended))
+            except Exception as e:  # pylint: disable=broad-except
+                # an unreadable game shouldn't stop the rest being indexed
+                print(f"Couldn't index archived game {file}: {e!r}")
+
+        self._next = max(files, default=0) + 1
+        self._entries = entries
+        if isdir(self.directory):
+            self._write_manifest()
+        return entries
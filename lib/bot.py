@@ -1,13 +1,24 @@
 """Contains the BOTCBot class."""
 
+import asyncio
 import typing
-from os import remove
-from os.path import isfile
-
+from contextlib import contextmanager
+from contextvars import ContextVar
+from os import listdir, remove
+from os.path import isfile, splitext
+from time import perf_counter
+from weakref import WeakSet
+
+import dill
 import discord
-from dill import dump, load
 from discord.ext import commands
 
+from lib.actor import ActorProfile
+from lib.apicalls import CallTracker
+from lib.archive import Archive
+from lib.exceptions import SerializationError
+from lib.latency import THRESHOLD, LatencyTracker
+from lib.locking import acquire, needs_lock, release
 from lib.logic.Character import Storyteller
 from lib.logic.Game import Game
 from lib.logic.Player import Player
@@ -15,16 +26,38 @@ from lib.logic.converters import to_character_list
 from lib.logic.playerconverter import to_member_list
 from lib.logic.tools import generate_game_info_message
 from lib.preferences import load_preferences
+from lib.profiling import Profiler
+from lib.proxies import restore_members, restore_message
+from lib.roles import RoleIndex
+from lib.router import InputRouter
+from lib.sending import SendScheduler
+from lib.serialization import dumps, load
+from lib.tables import Table
 from lib.utils import safe_send, get_input, safe_bug_report
+from lib.watchdog import LoopWatchdog
 
 if typing.TYPE_CHECKING:
     from lib.logic.Script import Script
     from lib.typings.context import Context
     from configparser import SectionProxy
 
+COGS = "lib/cogs"
+
+# a user's aliases, mapped to the commands they invoke
+Aliases = typing.Dict[str, commands.Command]
+
+# the bots running in this process, whose aliases a user's changes invalidate
+_bots = WeakSet()  # type: WeakSet[BOTCBot]
+
 
 class BOTCBot(commands.Bot):
-    """An extension of the commands.Bot class, storing globally necessary attributes."""
+    """An extension of the commands.Bot class, storing globally necessary attributes.
+
+    A bot hosts a game at each of its tables, the first of which is built from the
+    channel and roles it's constructed with. The game, channel, roles, and archive
+    attributes are the current table's: the table set with use_table in the
+    current task, or the first table. Commands use the table found by tables_for.
+    """
 
     def __init__(
         self,
@@ -39,55 +72,184 @@ class BOTCBot(commands.Bot):
         config: "SectionProxy",
         **options,
     ):
+        # user ID: alias: command, compiled from their preferences
+        # set first, since the superclass adds the help command
+        self._aliases = {}  # type: typing.Dict[int, Aliases]
+        _bots.add(self)
         super().__init__(**options)
 
         self.bot_name = bot_name
         self._serverid = serverid
-        self._channelid = channelid
-        self._storytellerid = storytellerid
-        self._playerid = playerid
-        self._inactiveid = inactiveid
-        self._playtestid = playtestid
-        self._observerid = observerid
         self.config = config
-        self.game: typing.Optional[Game] = None
+        # channel ID: table, in the order they were added
+        self.tables = {}  # type: typing.Dict[int, Table]
+        # user ID: the channel ID of the table they chose for their DMs
+        self.dm_tables = {}  # type: typing.Dict[int, int]
+        self._table = ContextVar(
+            "table", default=None
+        )  # type: ContextVar[typing.Optional[Table]]
+        self.add_table(
+            Table(
+                bot_name,
+                channelid,
+                storytellerid,
+                playerid,
+                inactiveid,
+                playtestid,
+                observerid,
+            )
+        )
+        self.input_router = InputRouter()
+        self.role_index = RoleIndex()
+        self.api_calls = CallTracker()
+        self.api_calls.install(self.http)
+        self.command_latency = LatencyTracker(
+            "resources/logs/" + bot_name + "/slow_commands.jsonl",
+            config.getfloat("slowcommandms", fallback=THRESHOLD),
+        )
+        self.profiler = Profiler()
+        self.sends = SendScheduler(self.http)
+        self.watchdog = LoopWatchdog(
+            "resources/logs/" + bot_name + "/loop_stalls.jsonl",
+            config.getfloat("loopwatchdogms", fallback=0),
+        )
+        self.before_invoke(self.command_setup)
+        self.after_invoke(self.command_cleanup)
 
     @property
     def server(self) -> discord.Guild:
         """Determine the bot's main server."""
         return self.get_guild(self._serverid)
 
+    @property
+    def table(self) -> Table:
+        """Determine the current table."""
+        return self._table.get() or next(iter(self.tables.values()))
+
+    @property
+    def game(self) -> typing.Optional[Game]:
+        """Determine the current table's game."""
+        return self.table.game
+
+    @game.setter
+    def game(self, game: typing.Optional[Game]):
+        self.table.game = game
+
+    @property
+    def archive(self) -> Archive:
+        """Determine the current table's archive."""
+        return self.table.archive
+
+    @archive.setter
+    def archive(self, archive: Archive):
+        self.table.archive = archive
+
     @property
     def channel(self) -> discord.TextChannel:
-        """Determine the bot's main channel."""
-        return self.get_channel(self._channelid)
+        """Determine the current table's channel."""
+        return self.get_channel(self.table.channelid)
 
     @property
     def storyteller_role(self) -> discord.Role:
-        """Determine the bot's Storyteller role."""
-        return self.server.get_role(self._storytellerid)
+        """Determine the current table's Storyteller role."""
+        return self.server.get_role(self.table.storytellerid)
 
     @property
     def player_role(self) -> discord.Role:
-        """Determine the bot's player role."""
-        return self.server.get_role(self._playerid)
+        """Determine the current table's player role."""
+        return self.server.get_role(self.table.playerid)
 
     @property
     def inactive_role(self) -> discord.Role:
-        """Determine the bot's inactive role."""
-        return self.server.get_role(self._inactiveid)
+        """Determine the current table's inactive role."""
+        return self.server.get_role(self.table.inactiveid)
 
     @property
     def playtest_role(self) -> typing.Optional[discord.Role]:
-        """Determine the bot's playtest role."""
+        """Determine the current table's playtest role."""
         if self.playtest:
-            return self.server.get_role(self._playtestid)
+            return self.server.get_role(self.table.playtestid)
         return None
 
     @property
     def observer_role(self) -> discord.Role:
-        """Determine the bot's observer role."""
-        return self.server.get_role(self._observerid)
+        """Determine the current table's observer role."""
+        return self.server.get_role(self.table.observerid)
+
+    @property
+    def indexed_roles(self) -> typing.List[typing.Optional[discord.Role]]:
+        """Determine the roles the bot tests membership of, at every table."""
+        out = []  # type: typing.List[typing.Optional[discord.Role]]
+        for table in self.tables.values():
+            with self.using_table(table):
+                out += [
+                    self.storyteller_role,
+                    self.player_role,
+                    self.inactive_role,
+                    self.observer_role,
+                    self.playtest_role,
+                ]
+        return out
+
+    def add_table(self, table: Table):
+        """Host games at another table."""
+        self.tables[table.channelid] = table
+
+    def use_table(self, table: Table):
+        """Make a table current for the rest of the current task."""
+        self._table.set(table)
+
+    @contextmanager
+    def using_table(self, table: Table) -> typing.Iterator[Table]:
+        """Make a table current within a with block."""
+        token = self._table.set(table)
+        try:
+            yield table
+        finally:
+            self._table.reset(token)
+
+    def tables_for(self, message: discord.Message) -> typing.List[Table]:
+        """Determine the tables a message's commands could be for, the likeliest first.
+
+        Messages in a gameplay channel are for its table, and messages elsewhere in
+        the server are for none. Direct messages are for the table the author chose
+        with the table command, if any; otherwise for the tables whose games the
+        author is playing or storytelling, then the tables whose storyteller or
+        player role they have, then the first table. Several tables means the message
+        is ambiguous.
+        """
+        if message.guild is not None:
+            table = self.tables.get(message.channel.id)
+            return [table] if table else []
+
+        tables = list(self.tables.values())
+        if len(tables) == 1:
+            return tables
+
+        chosen = self.tables.get(self.dm_tables.get(message.author.id, 0))
+        if chosen is not None:
+            return [chosen]
+
+        playing = [
+            table
+            for table in tables
+            if table.game
+            and any(
+                player.member.id == message.author.id
+                for player in table.game.seating_order + table.game.storytellers
+            )
+        ]
+        if playing:
+            return playing
+
+        with_roles = []
+        for table in tables:
+            with self.using_table(table):
+                if self.role_index.has(
+                    self.storyteller_role, message.author
+                ) or self.role_index.has(self.player_role, message.author):
+                    with_roles.append(table)
+        return with_roles or tables[:1]
 
     @property
     def instant_message_reporting(self) -> bool:
@@ -178,7 +340,7 @@ class BOTCBot(commands.Bot):
             # storytellers
             storytellers = [
                 Player(person, Storyteller, None)
-                for person in self.storyteller_role.members
+                for person in self.role_index.members(self.storyteller_role)
             ]
 
             # start the game
@@ -187,9 +349,70 @@ class BOTCBot(commands.Bot):
                 await safe_send(ctx, "Started the game successfully.")
             await self.game.start_night(ctx)
 
+    async def start(self, *args, **kwargs):
+        """Log in and connect to discord.
+
+        Modified to start the event loop watchdog, if the config enables it.
+        """
+        if self.watchdog.enabled:
+            self.watchdog.start()
+        await super().start(*args, **kwargs)
+
+    async def close(self):
+        """Close the connection to discord.
+
+        Modified to stop the event loop watchdog.
+        """
+        self.watchdog.stop()
+        await super().close()
+
+    def load_cogs(self):
+        """Load every cog in lib/cogs."""
+        for file in listdir(COGS):
+            if file.endswith(".py") and not file.startswith("_"):
+                self.load_extension(COGS.replace("/", ".") + "." + file[:-3])
+
+    async def command_setup(self, ctx: "Context"):
+        """Run before every command.
+
+        Starts counting the command's API calls and collecting the messages it
+        queues, and ends the timing of its checks.
+        """
+        LatencyTracker.mark(ctx, "checks")
+        self.api_calls.start(ctx)
+        self.sends.start()
+
+    async def command_cleanup(self, ctx: "Context"):
+        """Run after every command.
+
+        Backs up the bot and updates the status, timing each step as a phase of the
+        command's latency. The messages the command queued are waited for by invoke,
+        once the table's lock is released.
+        """
+        LatencyTracker.mark(ctx, "body")
+        if self.game and self.game.current_day:
+            await self.game.reseat(ctx, self.game.seating_order)
+            LatencyTracker.mark(ctx, "reseat")
+        self.backup()
+        LatencyTracker.mark(ctx, "backup")
+        await self.update_status()
+        LatencyTracker.mark(ctx, "status")
+
     async def update_status(self):
-        """Update the bot's status to display information about the game."""
-        if not self.game:
+        """Update the bot's status to display information about the game.
+
+        Bots with several tables display the number of ongoing games instead.
+        """
+        if len(self.tables) > 1:
+            games = sum(table.game is not None for table in self.tables.values())
+            await self.change_presence(
+                status=discord.Status.online if games else discord.Status.dnd,
+                activity=discord.Game(
+                    name=f"{games} ongoing game{'' if games == 1 else 's'}!"
+                ),
+            )
+
+        elif not self.game:
             await self.change_presence(
                 status=discord.Status.dnd,
                 activity=discord.Game(name="No ongoing game!"),
@@ -216,20 +439,33 @@ class BOTCBot(commands.Bot):
                 ),
             )
 
-    def backup(self, file_name: str = "current_game.pckl"):
-        """Backs up the current gamestate."""
-        file_name = "resources/backup/" + self.bot_name + "/" + file_name
+    def backup(self, file_name: str = "current_game.state"):
+        """Backs up the current table's gamestate."""
+        file_name = self.table.directory + file_name
+
+        # a pickle left from before the state format would shadow a removed backup
+        legacy_file_name = splitext(file_name)[0] + ".pckl"
+        if isfile(legacy_file_name):
+            remove(legacy_file_name)
 
         if self.game:
+            try:
+                data = dumps(self.game)
+            except SerializationError as e:
+                # keep backing up; load still reads pickles
+                print(f"Backing up with dill: {e}")
+                data = dill.dumps(self.game)
             with open(file_name, "wb") as file:
-                dump(self.game, file)
+                file.write(data)
         else:
             if isfile(file_name):
                 remove(file_name)
 
-    async def restore_backup(self, file_name: str = "current_game.pckl", mute=False):
-        """Restores a backup."""
-        file_name = "resources/backup/" + self.bot_name + "/" + file_name
+    async def restore_backup(self, file_name: str = "current_game.state", mute=False):
+        """Restores the current table's backup, or the dill pickle it replaced."""
+        file_name = self.table.directory + file_name
+        if not isfile(file_name):
+            file_name = splitext(file_name)[0] + ".pckl"
 
         # restore backups
         try:
@@ -242,13 +478,17 @@ class BOTCBot(commands.Bot):
             assert self.game
 
             # do some unpickling
+            # the message and members are pickled as ints, and resolved lazily, so
+            # the bot is usable without waiting on discord
             # noinspection PyTypeChecker
-            # the seating order message is pickled as an int so this is fine
-            self.game.seating_order_message = await self.channel.fetch_message(
-                self.game.seating_order_message
+            self.game.seating_order_message = restore_message(
+                self.channel, self.game.seating_order_message
             )
-            for player in self.game.seating_order + self.game.storytellers:
-                player.member = self.server.get_member(player.member)
+            players = self.game.seating_order + self.game.storytellers
+            # noinspection PyTypeChecker
+            members = restore_members(self, [player.member for player in players])
+            for player, member in zip(players, members):
+                player.member = member
 
             # print
             if not mute:
@@ -267,34 +507,182 @@ class BOTCBot(commands.Bot):
             # represents an error
             return None
 
+        except SerializationError as e:
+            # an unknown format version, or a type that's since been removed
+            self.game = None
+            print(f"Backup unreadable: {e}")  # do this even if mute, as above
+            return None
+
+    def aliases(self, user: typing.Union[discord.User, discord.Member]) -> Aliases:
+        """Determine a user's aliases, mapped to the commands they invoke.
+
+        Aliases are compiled from the user's preferences once, then cached by user,
+        even if they have none, until invalidate_aliases is called for the user or
+        the bot's commands change.
+        """
+        try:
+            return self._aliases[user.id]
+        except KeyError:
+            pass
+
+        preferences = load_preferences(user)
+        compiled = {}  # type: Aliases
+        for alias, invocation in preferences.aliases.items():
+            names = invocation.split(" ")
+            command = self.all_commands.get(names[0])
+            for name in names[1:]:
+                if command is None:
+                    break
+                command = command.get_command(name)
+            if command is not None:
+                compiled[alias] = command
+
+        self._aliases[user.id] = compiled
+        return compiled
+
+    def invalidate_aliases(self, idn: typing.Optional[int] = None):
+        """Recompile a user's aliases on next use, or everyone's if idn is None.
+
+        A user's aliases are recompiled by every bot in the process, since they
+        share the user's preferences; everyone's only by this bot, whose commands
+        changed.
+        """
+        if idn is None:
+            self._aliases.clear()
+        else:
+            for bot in _bots:
+                bot._aliases.pop(idn, None)  # pylint: disable=protected-access
+
+    def cancel_prompts(self, game: Game):
+        """Cancel the prompts waiting on a game's players and storytellers.
+
+        Prompts in the current table's channel and in their DMs raise
+        ValueError("cancelled").
+        """
+        for player in game.seating_order + game.storytellers:
+            member = player.member
+            self.input_router.cancel(member.id, self.table.channelid)
+            if member.dm_channel is not None:
+                self.input_router.cancel(member.id, member.dm_channel.id)
+
+    def add_command(self, command: commands.Command):
+        """Add a command.
+
+        Modified to recompile aliases, which may refer to a replaced command.
+        """
+        super().add_command(command)
+        self.invalidate_aliases()
+
+    def remove_command(self, name: str) -> typing.Optional[commands.Command]:
+        """Remove a command.
+
+        Modified to recompile aliases, which may refer to the removed command.
+        """
+        self.invalidate_aliases()
+        return super().remove_command(name)
+
+    def dispatch(self, event_name: str, *args, **kwargs):
+        """Dispatch an event.
+
+        Modified to route messages to pending prompts from lib.utils.get_input.
+        """
+        if event_name == "message":
+            self.input_router.route(args[0])
+        super().dispatch(event_name, *args, **kwargs)
+
+    async def get_context(self, message: discord.Message, *, cls=commands.Context):
+        """Build the context for a message, resolving the invoker's actor profile.
+
+        The profile is only resolved if the message has a prefix, since otherwise it
+        can't invoke anything. Commands which need the table's lock resolve it again
+        once they have it.
+        """
+        ctx = await super().get_context(message, cls=cls)
+        if ctx.prefix is not None:
+            ctx.actor = ActorProfile.resolve(self, ctx.author)
+        return ctx
+
     async def process_commands(self, message: discord.Message):
         """Process commands registered to the bot.
 
-        Modified to handle custom aliases.
+        Modified to handle custom aliases, to time building the context, and to use
+        the message's table for the rest of the task. Commands which touch a game
+        aren't run from DMs which could be for several tables; the author is asked
+        to choose one instead.
         """
         if message.author.bot:
             return
 
-        if not (message.guild is None or message.channel == self.channel):
+        tables = self.tables_for(message)
+        if not tables:
             return
+        self.use_table(tables[0])
 
+        started = perf_counter()
         ctx = await self.get_context(message)
+        LatencyTracker.start(ctx, started)
+
+        # messages without a prefix can't be aliases, so skip the lookup for chat
+        if ctx.prefix is not None:
+            aliases = self.aliases(message.author)
+            if ctx.invoked_with in aliases:
+                ctx.command = aliases[ctx.invoked_with]
 
-        preferences = load_preferences(message.author)
-        if ctx.invoked_with in preferences.aliases:
-            ctx.command = self.all_commands.get(
-                preferences.aliases[ctx.invoked_with].split(" ")[0]
+        # commands which don't touch a game can run at any table
+        if len(tables) > 1 and ctx.command is not None and needs_lock(ctx.command):
+            await safe_send(
+                ctx,
+                (
+                    "You're at several tables: "
+                    f"{', '.join(table.name for table in tables)}. "
+                    f"Choose one with `{ctx.prefix}table name`."
+                ),
             )
-            if " " in preferences.aliases[ctx.invoked_with]:
-                for cmd in preferences.aliases[ctx.invoked_with].split(" ")[1:]:
-                    ctx.command = ctx.command.get_command(cmd)
+            return
 
         await self.invoke(ctx)
 
+    async def invoke(self, ctx: commands.Context):
+        """Invoke the command given under the invocation context.
+
+        Modified to send the invocation's messages with the send scheduler, to hold
+        the table's lock throughout, to cancel the author's prompts in the channel if
+        the invocation is cancelled, to record the invocation's latency and API calls,
+        and to count it toward a running profile.
+
+        The messages the command queued are waited for after the lock is released,
+        so the table's next command doesn't wait behind them, and the scheduler can
+        send its more urgent messages first.
+        """
+        self.sends.use()
+        if not hasattr(ctx, "timings"):
+            LatencyTracker.start(ctx, perf_counter())
+        if ctx.command is not None and needs_lock(ctx.command):
+            await acquire(ctx)
+            # the game may have changed while waiting, so look the author up again
+            ctx.actor = ActorProfile.resolve(self, ctx.author)
+            LatencyTracker.mark(ctx, "lock")
+        try:
+            await super().invoke(ctx)
+        except asyncio.CancelledError:
+            # leave none of the author's prompts waiting on a command that's gone
+            self.input_router.cancel(ctx.author.id, ctx.channel.id)
+            raise
+        finally:
+            release(ctx)
+        if ctx.command is not None:
+            # the after-invoke hook ran, so the command may have queued messages
+            if "body" in ctx.timings:
+                await self.sends.finish()
+                LatencyTracker.mark(ctx, "sends")
+                self.api_calls.finish(ctx)
+            self.command_latency.finish(ctx)
+            await self.profiler.count(ctx)
+
     async def _startgame_role_cleanup(self, users: typing.List[discord.Member]):
         """Handle role cleanup for startgame."""
         # clear all player roles
-        for memb in self.player_role.members:
+        for memb in self.role_index.members(self.player_role):
             await memb.remove_roles(self.player_role)
 
         # modify roles for players
@@ -308,5 +696,5 @@ class BOTCBot(commands.Bot):
                 await user.remove_roles(self.storyteller_role)
 
         # add player role for storytellers
-        for memb in self.storyteller_role.members:
+        for memb in self.role_index.members(self.storyteller_role):
             await memb.add_roles(self.player_role)
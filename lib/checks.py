@@ -4,8 +4,7 @@ from typing import TYPE_CHECKING, Callable
 
 from discord.ext import commands
 
-from lib.exceptions import PlayerNotFoundError
-from lib.utils import get_player
+from lib.actor import get_actor
 
 if TYPE_CHECKING:
     from lib.typings.context import Context
@@ -124,7 +123,7 @@ def is_storyteller() -> Callable:
             True if the command succeeds, else raises an exception.
 
         """
-        if ctx.bot.server.get_member(ctx.author.id) in ctx.bot.storyteller_role.members:
+        if get_actor(ctx).is_storyteller:
             return True
         raise commands.CheckFailure(message="Sorry! Only storytellers can do that.")
 
@@ -148,14 +147,8 @@ def is_player() -> Callable:
             True if the command succeeds, else raises an exception.
 
         """
-        if ctx.bot.game:
-            try:
-                get_player(
-                    ctx.bot.game, ctx.message.author.id, include_storytellers=False
-                )
-                return True
-            except PlayerNotFoundError:
-                pass
+        if get_actor(ctx).player is not None:
+            return True
         raise commands.CheckFailure(message="Sorry! Only players can do that.")
 
     return commands.check(predicate)
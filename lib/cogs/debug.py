@@ -1,12 +1,17 @@
 """Contains the Debug cog for commands related to debugging."""
 
-from typing import List
+import asyncio
+from time import perf_counter
+from typing import List, Optional
 
 from discord.ext import commands
 
 from lib import checks
 from lib.bot import BOTCBot
+from lib.latency import BUCKETS, PERCENTILES, histogram
+from lib.locking import unlocked_command
 from lib.logic.Effect import status_list
+from lib.profiling import ENTRIES, send_report
 from lib.typings.context import Context, GameContext
 from lib.utils import aexec, list_to_plural_string, safe_send
 
@@ -63,13 +68,16 @@ class Debug(commands.Cog, command_attrs=dict(hidden=True)):  # type: ignore
     @checks.is_dm()
     async def _reload(self, ctx: Context, *, cog: str):
         """Reload cog."""
+        start = perf_counter()
         try:
             self.bot.reload_extension(cog)
-            await safe_send(ctx, "Reload successful.")
+            await safe_send(ctx, f"Reload successful ({perf_counter() - start:.3f}s).")
         except commands.errors.ExtensionNotLoaded:
             try:
                 self.bot.reload_extension("lib.cogs." + cog)
-                await safe_send(ctx, "Reload successful.")
+                await safe_send(
+                    ctx, f"Reload successful ({perf_counter() - start:.3f}s)."
+                )
             except commands.errors.ExtensionNotLoaded:
                 await safe_send(ctx, f"Extension not loaded: {cog}.")
 
@@ -88,6 +96,157 @@ class Debug(commands.Cog, command_attrs=dict(hidden=True)):  # type: ignore
             except commands.errors.ExtensionNotLoaded:
                 await safe_send(ctx, f"Extension not loaded: {cog}.")
 
+    @commands.command(name="apicalls")
+    @unlocked_command()
+    @commands.is_owner()
+    @checks.is_dm()
+    async def _apicalls(self, ctx: Context, *, command: Optional[str] = None):
+        """Display the mean discord API calls per invocation of each command, by route.
+
+        command: The command to display, or every command if omitted.
+        """
+        summary = ctx.bot.api_calls.summary(command)
+        if not summary:
+            await safe_send(ctx, "No API calls have been recorded.")
+            return
+
+        message_text = "**API calls per invocation:**"
+        for name, count, total in summary:
+            mean = sum(total.values()) / count
+            message_text += f"\n\n__{name}__ ({count} invocations): {mean:.1f}"
+            for route, calls in total.most_common():
+                message_text += f"\n> {route}: {calls / count:.1f}"
+
+        await safe_send(ctx, message_text)
+
+    @commands.command(name="latency")
+    @unlocked_command()
+    @commands.check_any(commands.is_owner(), checks.is_storyteller())
+    @checks.is_dm()
+    async def _latency(self, ctx: Context, *, command: Optional[str] = None):
+        """Display the percentiles of each command's latency, by phase.
+
+        command: The command to display, with a histogram of its total latency, or
+        every command if omitted.
+        """
+        summary = ctx.bot.command_latency.summary(command)
+        if not summary:
+            await safe_send(ctx, "No latencies have been recorded.")
+            return
+
+        percentiles = "/".join(f"p{pct}" for pct in PERCENTILES)
+        message_text = f"**Latency in ms ({percentiles}):**"
+        for name, phases in summary:
+            message_text += f"\n\n__{name}__ ({phases['total'][0]} invocations)"
+            for phase, (_, values) in phases.items():
+                times = "/".join(f"{value:.1f}" for value in values)
+                message_text += f"\n> {phase}: {times}"
+
+        if command is not None:
+            message_text += "\n\n**Total latency histogram:**"
+            samples = list(ctx.bot.command_latency.samples[command]["total"])
+            for bound, count in histogram(samples):
+                label = f"<= {bound} ms" if bound else f"> {BUCKETS[-1]} ms"
+                message_text += f"\n> {label}: {count}"
+
+        await safe_send(ctx, message_text)
+
+    @commands.group(name="profile")
+    @unlocked_command()
+    @commands.is_owner()
+    @checks.is_dm()
+    async def _profile(self, ctx: Context):
+        """Profile the bot with cProfile.
+
+        The report is sent as an attachment, listing the functions with the most
+        cumulative time and the most time of their own.
+        """
+        if ctx.invoked_subcommand is None:
+            await safe_send(
+                ctx, "Use profile commands, profile seconds, or profile stop."
+            )
+
+    @_profile.command(name="commands")
+    @commands.is_owner()
+    @checks.is_dm()
+    async def _profile_commands(self, ctx: Context, count: int):
+        """Profile everything the bot does until it finishes the next count commands.
+
+        The report is sent here once they've finished.
+        """
+        if ctx.bot.profiler.running:
+            await safe_send(ctx, "A profile is already running.")
+            return
+        ctx.bot.profiler.start(ctx, max(count, 1))
+        await safe_send(ctx, f"Profiling the next {max(count, 1)} commands.")
+
+    @_profile.command(name="seconds")
+    @commands.is_owner()
+    @checks.is_dm()
+    async def _profile_seconds(self, ctx: Context, length: float):
+        """Profile everything the bot does for length seconds."""
+        if ctx.bot.profiler.running:
+            await safe_send(ctx, "A profile is already running.")
+            return
+        ctx.bot.profiler.start(ctx)
+        await safe_send(ctx, f"Profiling for {length} seconds.")
+        await asyncio.sleep(length)
+        if ctx.bot.profiler.owner is ctx:
+            await send_report(ctx, ctx.bot.profiler.stop(), "profile.txt")
+
+    @_profile.command(name="stop")
+    @commands.is_owner()
+    @checks.is_dm()
+    async def _profile_stop(self, ctx: Context):
+        """Stop the running profile early and send its report."""
+        if not ctx.bot.profiler.running:
+            await safe_send(ctx, "No profile is running.")
+            return
+        await send_report(ctx, ctx.bot.profiler.stop(), "profile.txt")
+
+    @commands.group(name="memory")
+    @unlocked_command()
+    @commands.is_owner()
+    @checks.is_dm()
+    async def _memory(self, ctx: Context):
+        """Compare allocations with a baseline using tracemalloc."""
+        if ctx.invoked_subcommand is None:
+            await safe_send(
+                ctx, "Use memory baseline, memory diff, or memory stop."
+            )
+
+    @_memory.command(name="baseline")
+    @commands.is_owner()
+    @checks.is_dm()
+    async def _memory_baseline(self, ctx: Context):
+        """Start tracing allocations, and take the baseline to compare with.
+
+        Tracing slows the bot down until memory stop.
+        """
+        ctx.bot.profiler.take_baseline()
+        await safe_send(ctx, "Took a baseline snapshot.")
+
+    @_memory.command(name="diff")
+    @commands.is_owner()
+    @checks.is_dm()
+    async def _memory_diff(self, ctx: Context, entries: int = ENTRIES):
+        """Compare allocations with the baseline, listing the lines which grew most.
+
+        entries: The number of lines to list.
+        """
+        if not ctx.bot.profiler.baseline:
+            await safe_send(ctx, "Take a baseline with memory baseline first.")
+            return
+        await send_report(ctx, ctx.bot.profiler.compare(entries), "memory.txt")
+
+    @_memory.command(name="stop")
+    @commands.is_owner()
+    @checks.is_dm()
+    async def _memory_stop(self, ctx: Context):
+        """Stop tracing allocations."""
+        ctx.bot.profiler.stop_tracing()
+        await safe_send(ctx, "Stopped tracing allocations.")
+
     @commands.command(name="detailedgrimoire")
     @commands.is_owner()
     @checks.is_game()
@@ -8,7 +8,8 @@ from discord.ext import commands
 from lib.bot import BOTCBot
 from lib.exceptions import PlayerNotFoundError
 from lib.logic.Character import Storyteller
-from lib.logic.Player import Player
+from lib.logic.Player import Player, make_active
+from lib.prewarm import prewarm
 from lib.typings.context import Context
 from lib.utils import get_player, safe_bug_report, safe_send
 
@@ -43,7 +44,7 @@ async def _generic_error_handler(ctx: Context, error, text):
 def _update_player_members(bot, after):
     """Update player members when they change."""
     try:
-        player = get_player(bot.game, after)
+        player = get_player(bot.game, after.id)
         player.member = after
     except PlayerNotFoundError:
         pass
@@ -68,14 +69,24 @@ class Events(commands.Cog):
         print("Logged in as", self.bot.user.name)
         print("ID:", self.bot.user.id)
         print("Server:", self.bot.server)
-        print("Gameplay Channel: #", self.bot.channel.name)
+        for table in self.bot.tables.values():
+            print("Gameplay Channel: #", self.bot.get_channel(table.channelid).name)
 
-        # restore backups
-        await self.bot.restore_backup()
+        # index role membership from the member cache; if the server isn't chunked
+        # yet, prewarm seeds the index again once its members are loaded
+        self.bot.role_index.seed(self.bot.indexed_roles)
+
+        # restore every table's backup
+        for table in self.bot.tables.values():
+            with self.bot.using_table(table):
+                await self.bot.restore_backup()
 
         # update status
         await self.bot.update_status()
 
+        # load caches now rather than in the middle of the first commands
+        await prewarm(self.bot)
+
         print("------")
 
     @commands.Cog.listener()
@@ -116,6 +127,13 @@ class Events(commands.Cog):
                 # raised by lib.utils.get_input if another command is called
                 return
 
+            if str(error) == "game changed":
+                # raised by lib.utils.get_input if the game changed while waiting
+                await safe_send(
+                    ctx, "The game changed while you were answering. Try again!"
+                )
+                return
+
         elif isinstance(error, HTTPException):
             # errors in HTTP request operations
             await _http_error_handler(ctx, error)
@@ -162,13 +180,22 @@ class Events(commands.Cog):
     @commands.Cog.listener()
     async def on_member_update(self, before, after):
         """Handle member updates."""
-        if self.bot.game:
+        self.bot.role_index.update(after)
 
-            # update player objects with changes
-            _update_player_members(self.bot, after)
+        for table in self.bot.tables.values():
+            if table.game:
+                with self.bot.using_table(table):
 
-            # add new storytellers to the seating order
-            _update_storyteller_list(self.bot, after, before)
+                    # update player objects with changes
+                    _update_player_members(self.bot, after)
+
+                    # add new storytellers to the seating order
+                    _update_storyteller_list(self.bot, after, before)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        """Handle members leaving the server."""
+        self.bot.role_index.remove(member)
 
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -176,17 +203,11 @@ class Events(commands.Cog):
         if message.author.bot:
             return
 
-        if not message.channel == self.bot.channel:
-            return
-
-        if self.bot.game is None or self.bot.game.current_day is None:
+        table = self.bot.tables.get(message.channel.id)
+        if table is None or table.game is None or table.game.current_day is None:
             return
 
-        try:
-            player = get_player(self.bot.game, message.author.id, False)
-            await player.make_active(self.bot.game)
-        except PlayerNotFoundError:
-            pass
+        await make_active(table.game, message.author.id)
 
 
 def setup(bot: BOTCBot):
@@ -75,6 +75,9 @@ class GameManagement(commands.Cog, name="Game Management"):  # type: ignore
                     f"{player.character.name} is not a traveler."
                 )
 
+            # schedule the default effects' cleanups
+            ctx.bot.game.scheduler.add_player(player)
+
             # add the alignment
             if alignment.lower() == "good":
                 player.add_effect(ctx.bot.game, Good, player)
@@ -1,6 +1,5 @@
 """Contains the GameProgression cog, for commands related to game progression."""
 from datetime import datetime, timedelta
-from os.path import isfile
 
 import pytz
 from discord.ext import commands
@@ -85,11 +84,8 @@ class GameProgression(commands.Cog, name="Game Progression"):  # type: ignore
                 ):
                     await msg.unpin()
 
-            # backup
-            i = 1
-            while isfile(f"resources/backup/{ctx.bot.bot_name}/old/game_{i}.pckl"):
-                i += 1
-            ctx.bot.backup(f"old/game_{i}.pckl")
+            # archive
+            ctx.bot.archive.add(ctx.bot.game)
 
             # thank storytellers
             for st in ctx.bot.game.storytellers:
@@ -98,6 +94,7 @@ class GameProgression(commands.Cog, name="Game Progression"):  # type: ignore
                 )
 
             # delete game
+            ctx.bot.cancel_prompts(ctx.bot.game)
             ctx.bot.game = None
 
             # complete
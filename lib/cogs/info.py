@@ -9,7 +9,7 @@ from lib.bot import BOTCBot
 from lib.logic.Player import Player
 from lib.logic.playerconverter import to_player
 from lib.logic.tools import generate_message_tally
-from lib.typings.context import DayContext, GameContext
+from lib.typings.context import Context, DayContext, GameContext
 from lib.utils import safe_send
 
 
@@ -99,6 +99,38 @@ class Info(commands.Cog, name="Info"):  # type: ignore
 
         await safe_send(ctx, player1_actual.message_history_with(player2_actual))
 
+    @commands.command()
+    @checks.is_storyteller()
+    @checks.is_dm()
+    async def pastgames(self, ctx: "Context", count: int = 5):
+        """List recently finished games.
+
+        count: How many games to list. Defaults to 5.
+        """
+        entries = ctx.bot.archive.entries[-count:] if count > 0 else []
+        if not entries:
+            await safe_send(ctx, "There are no finished games.")
+            return
+
+        def name(idn: int) -> str:
+            member = ctx.bot.server.get_member(idn)
+            return member.display_name if member else str(idn)
+
+        message_text = "**Past Games:**"
+        for entry in reversed(entries):
+            result = f"{entry.winner} won" if entry.winner else "unknown result"
+            if entry.winner == "neutral":
+                result = "remade"
+            date = (entry.started or entry.ended)[:10]
+            message_text += (
+                f"\n**Game {entry.number}** ({entry.script}, {result}, {date}): "
+                + ", ".join(
+                    f"{name(idn)} ({character})" for idn, character in entry.players
+                )
+            )
+
+        await safe_send(ctx, message_text)
+
 
 def setup(bot: BOTCBot):
     """Set the cog up."""
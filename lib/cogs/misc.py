@@ -2,6 +2,7 @@
 from discord.ext import commands
 
 from lib import checks
+from lib.locking import unlocked_command
 from lib.typings.context import Context
 from lib.utils import safe_send
 
@@ -13,6 +14,7 @@ class Misc(commands.Cog):
         self.bot = bot
 
     @commands.command()
+    @unlocked_command()
     @checks.is_dm()
     async def playercommands(self, ctx: Context):
         """View all player commands."""
@@ -34,6 +36,43 @@ class Misc(commands.Cog):
         await safe_send(ctx, message_text)
 
     @commands.command()
+    @unlocked_command()
+    @checks.is_dm()
+    async def table(self, ctx: Context, *, name: str = ""):
+        """Choose the table your direct messages are for.
+
+        name: The table's name. Leave it out to see the tables, or use 'auto' to let
+            the bot choose from the games and roles you have.
+
+        This only matters if the bot hosts games at several tables.
+        """
+        tables = ctx.bot.tables.values()
+        if not name:
+            chosen = ctx.bot.dm_tables.get(ctx.author.id)
+            await safe_send(
+                ctx,
+                "**Tables:**\n"
+                + "\n".join(
+                    table.name + (" (chosen)" if table.channelid == chosen else "")
+                    for table in tables
+                ),
+            )
+            return
+
+        if name.lower() == "auto":
+            ctx.bot.dm_tables.pop(ctx.author.id, None)
+            await safe_send(ctx, "Your direct messages are for the likeliest table.")
+            return
+
+        for table in tables:
+            if table.name.lower() == name.lower():
+                ctx.bot.dm_tables[ctx.author.id] = table.channelid
+                await safe_send(ctx, f"Your direct messages are now for {table.name}.")
+                return
+        raise commands.BadArgument(f"There is no table named {name}.")
+
+    @commands.command()
+    @unlocked_command()
     @checks.is_dm()
     async def clear(self, ctx: Context):
         """Send whitespace to clear past messages."""
@@ -4,7 +4,8 @@ from discord.ext import commands
 
 from lib import checks
 from lib.bot import BOTCBot
-from lib.preferences import load_preferences
+from lib.locking import unlocked_command
+from lib.preferences import edit_preferences
 from lib.typings.context import Context
 from lib.utils import safe_send, to_bool
 
@@ -19,6 +20,7 @@ class PreferenceManagement(commands.Cog, name="Preferences"):  # type: ignore
         self.bot = bot
 
     @commands.command()
+    @unlocked_command()
     @checks.is_dm()
     async def makealias(
         self, ctx: Context, alias: str, command: str, *, subcommand: str = ""
@@ -28,7 +30,7 @@ class PreferenceManagement(commands.Cog, name="Preferences"):  # type: ignore
         alias: The alias to be created.
         command: The command to create the alias for.
         """
-        preferences = load_preferences(ctx.message.author)
+        preferences = edit_preferences(ctx.message.author)
         cmd = ctx.bot.all_commands.get(command)
         if cmd is None:
             await safe_send(
@@ -50,6 +52,7 @@ class PreferenceManagement(commands.Cog, name="Preferences"):  # type: ignore
                 command + (" " if subcommand else "") + subcommand
             )
             preferences.save_preferences()
+            ctx.bot.invalidate_aliases(ctx.message.author.id)
             await safe_send(
                 ctx,
                 "Successfully created alias `{alias}` for command `{command}`.".format(
@@ -58,21 +61,24 @@ class PreferenceManagement(commands.Cog, name="Preferences"):  # type: ignore
             )
 
     @commands.command()
+    @unlocked_command()
     @checks.is_dm()
     async def removealias(self, ctx: Context, alias: str):
         """Remove a personal alias for a command.
 
         alias: The alias to remove.
         """
-        preferences = load_preferences(ctx.message.author)
+        preferences = edit_preferences(ctx.message.author)
         try:
             del preferences.aliases[alias]
             preferences.save_preferences()
+            ctx.bot.invalidate_aliases(ctx.message.author.id)
             await safe_send(ctx, f"Successfully deleted your alias {alias}.")
         except KeyError:
             raise commands.BadArgument(f"You do not have an alias {alias}.")
 
     @commands.command()
+    @unlocked_command()
     @checks.is_dm()
     async def setnick(self, ctx: Context, *, nick: str):
         """Set your nickname for bot messages.
@@ -81,12 +87,13 @@ class PreferenceManagement(commands.Cog, name="Preferences"):  # type: ignore
 
         This input is case-sensitive.
         """
-        preferences = load_preferences(ctx.message.author)
+        preferences = edit_preferences(ctx.message.author)
         preferences.nick = nick
         preferences.save_preferences()
         await safe_send(ctx, f"Successfully set your nickname to {nick}.")
 
     @commands.command()
+    @unlocked_command()
     @checks.is_dm()
     async def setpronouns(
         self,
@@ -128,7 +135,7 @@ class PreferenceManagement(commands.Cog, name="Preferences"):  # type: ignore
         """
         plural_actual = to_bool(plural, "argument")
 
-        preferences = load_preferences(ctx.message.author)
+        preferences = edit_preferences(ctx.message.author)
         preferences.pronouns = (
             subjective,
             objective,
@@ -160,6 +167,7 @@ class PreferenceManagement(commands.Cog, name="Preferences"):  # type: ignore
         )
 
     @commands.command(hidden=True)
+    @unlocked_command()
     @checks.is_dm()
     async def emergencyvote(
         self, ctx: Context, vote: str, time: int, specific: str = "yes",
@@ -172,7 +180,7 @@ class PreferenceManagement(commands.Cog, name="Preferences"):  # type: ignore
         """
         vote_actual = to_bool(vote, "vote")
         specific_actual = to_bool(specific, "argument")
-        preferences = load_preferences(ctx.message.author)
+        preferences = edit_preferences(ctx.message.author)
         if specific_actual:
             preferences.specific_emergencys[ctx.bot.user.id] = (vote_actual, time)
             preferences.save_preferences()
@@ -199,6 +207,7 @@ class PreferenceManagement(commands.Cog, name="Preferences"):  # type: ignore
             )
 
     @commands.command(hidden=True)
+    @unlocked_command()
     @checks.is_dm()
     async def removeemergencyvote(self, ctx: Context, specific: str = "yes"):
         """Remove your emergency vote.
@@ -206,7 +215,7 @@ class PreferenceManagement(commands.Cog, name="Preferences"):  # type: ignore
         specific: Whether to remove the bot-specific emergency vote or the generic one.
         """
         specific_actual = to_bool(specific, "argument")
-        preferences = load_preferences(ctx.message.author)
+        preferences = edit_preferences(ctx.message.author)
         if specific_actual:
             try:
                 del preferences.specific_emergencys[ctx.bot.user.id]
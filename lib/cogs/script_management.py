@@ -3,7 +3,9 @@
 from discord.ext import commands
 
 from lib import checks
+from lib.actor import get_actor
 from lib.bot import BOTCBot
+from lib.locking import unlocked_command
 from lib.logic.converters import to_character, to_character_list, to_script
 from lib.logic.Script import Script, script_list
 from lib.preferences import load_preferences
@@ -20,6 +22,7 @@ class ScriptManagement(commands.Cog, name="Scripts"):  # type: ignore
         self.bot = bot
 
     @commands.group()
+    @unlocked_command()
     @checks.is_dm()
     async def script(self, ctx: Context):
         """Manage custom scripts.
@@ -166,10 +169,7 @@ class ScriptManagement(commands.Cog, name="Scripts"):  # type: ignore
         with ctx.typing():
             for script in script_list(
                 ctx,
-                playtest=(
-                    ctx.bot.playtest_role is not None
-                    and ctx.author in ctx.bot.playtest_role.members
-                ),
+                playtest=get_actor(ctx).is_playtester,
             ):
                 await safe_send(ctx, script.short_info(ctx))
 
@@ -28,3 +28,7 @@ class AlreadyNomniatedError(Exception):
 
 class PlayerNotFoundError(ValueError):
     """No matching player was found."""
+
+
+class SerializationError(TypeError):
+    """A value can't be saved or loaded in the game state format."""
@@ -0,0 +1,6 @@
+"""Contains a headless runtime, for running the bot without discord.
+
+lib.headless.bot.HeadlessBot runs the real cogs against the in-memory fakes of
+lib.headless.fakes, and lib.headless.simulation.Simulation plays whole games on it by
+sending commands as its members.
+"""
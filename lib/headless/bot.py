@@ -0,0 +1,196 @@
+"""Contains the HeadlessBot class, a BOTCBot on a FakeGuild instead of discord."""
+
+import asyncio
+import sys
+from configparser import ConfigParser
+from os import makedirs
+from shutil import rmtree
+from tempfile import mkdtemp
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from discord.ext import commands
+
+from lib.apicalls import record
+from lib.archive import Archive
+from lib.bot import BOTCBot
+from lib.headless.fakes import FakeChannel, FakeGuild, FakeMember, FakeMessage
+from lib.serialization import dumps
+from lib.tables import Table
+
+# the config a headless bot runs with
+CONFIG = {"instantmessagereports": "false", "playtest": "false"}
+
+PREFIX = ","
+
+
+class _Typing:
+    """A typing indicator which does nothing, usable with or without async.
+
+    Entering it counts the one typing request discord.py would make.
+    """
+
+    def __enter__(self):
+        record("POST", "/channels/{channel_id}/typing")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+class HeadlessContext(commands.Context):
+    """A context which replies through the fakes rather than discord's HTTP API."""
+
+    async def send(self, content: Optional[str] = None, **kwargs) -> FakeMessage:
+        """Reply in the context's channel."""
+        return await self.channel.send(content, **kwargs)
+
+    def typing(self) -> _Typing:
+        """Show nothing while a command works."""
+        return _Typing()
+
+
+class HeadlessBot(BOTCBot):
+    """A bot running on a FakeGuild, with backups and the archive kept off the disk.
+
+    Nothing connects to discord: messages are handed to the bot with dispatch, and
+    everything the bot sends is recorded in the guild's log. Backups are still
+    serialized after every command, so their cost is part of a command's, but they're
+    kept in memory.
+
+    Parameters
+    ----------
+    bot_name : str
+        The bot's name.
+
+    Attributes
+    ----------
+    guild : FakeGuild
+        The bot's server.
+    backups : Dict[str, bytes]
+        The latest backup under each table's name and file name, like
+        "headless/current_game.state".
+    presence : Dict[str, Any]
+        The keyword arguments of the latest change_presence call.
+    command_errors : List[Tuple[str, Exception]]
+        The invoking message and the error, for every command which raised.
+    errors : List[Tuple[str, BaseException]]
+        The event and the exception, for every event handler which raised.
+    """
+
+    def __init__(self, bot_name: str = "headless"):
+        self.guild = FakeGuild(bot_name)
+        channel = self.guild.add_channel("gameplay")
+        storyteller, player, inactive, playtest, observer = (
+            self.guild.add_role(name)
+            for name in ("storyteller", "player", "inactive", "playtest", "observer")
+        )
+
+        config = ConfigParser()
+        config.read_dict({bot_name: CONFIG})
+
+        self.backups = {}  # type: Dict[str, bytes]
+        self.presence = {}  # type: Dict[str, Any]
+        self.command_errors = []  # type: List[Tuple[str, Exception]]
+        self.errors = []  # type: List[Tuple[str, BaseException]]
+        self.tasks = set()  # type: Set[asyncio.Task]
+        self._directory = mkdtemp(prefix="botc-")
+
+        super().__init__(
+            bot_name,
+            self.guild.id,
+            channel.id,
+            storyteller.id,
+            player.id,
+            inactive.id,
+            playtest.id,
+            observer.id,
+            config=config[bot_name],
+            command_prefix=(PREFIX,),
+            case_insensitive=True,
+            loop=asyncio.get_event_loop(),
+        )
+        self.archive = Archive(self._directory + "/")
+        self.command_latency.log_path = self._directory + "/slow_commands.jsonl"
+        self.guild.dispatch = self.dispatch
+
+    def open_table(self, name: str) -> Table:
+        """Add a table with a new channel and roles, archiving in the temp directory."""
+        channel = self.guild.add_channel(name)
+        roles = [
+            self.guild.add_role(f"{name} {role}")
+            for role in ("storyteller", "player", "inactive", "playtest", "observer")
+        ]
+        table = Table(name, channel.id, *(role.id for role in roles))
+        table.archive = Archive(self._directory + "/" + name + "/")
+        makedirs(table.archive.directory)
+        self.add_table(table)
+        self.role_index.seed(self.indexed_roles)
+        return table
+
+    @property
+    def user(self) -> FakeMember:
+        """Determine the bot's own member."""
+        return self.guild.me
+
+    def get_guild(self, idn: int) -> Optional[FakeGuild]:
+        """Find the server, if idn is its ID."""
+        return self.guild if idn == self.guild.id else None
+
+    def get_channel(self, idn: int) -> Optional[FakeChannel]:
+        """Find a channel in the server."""
+        return self.guild.get_channel(idn)
+
+    def get_user(self, idn: int) -> Optional[FakeMember]:
+        """Find a member of the server."""
+        return self.guild.get_member(idn)
+
+    async def change_presence(self, **kwargs):
+        """Record the bot's status."""
+        self.presence = kwargs
+
+    def backup(self, file_name: str = "current_game.state"):
+        """Back up the current table's gamestate in memory."""
+        file_name = self.table.name + "/" + file_name
+        if self.game:
+            self.backups[file_name] = dumps(self.game)
+        else:
+            self.backups.pop(file_name, None)
+
+    async def get_context(self, message, *, cls=HeadlessContext):
+        """Build the context for a message, replying through the fakes."""
+        return await super().get_context(message, cls=cls)
+
+    def _schedule_event(self, coro, event_name, *args, **kwargs):
+        """Run an event handler, keeping track of it until it finishes."""
+        task = super()._schedule_event(coro, event_name, *args, **kwargs)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def on_error(self, event_method: str, *args, **kwargs):
+        """Record an exception raised by an event handler."""
+        exception = sys.exc_info()[1]
+        if exception is not None:
+            self.errors.append((event_method, exception))
+
+    async def on_command_error(self, context: commands.Context, exception: Exception):
+        """Record an exception raised by a command.
+
+        The Events cog handles the exception as usual; errors it can't handle are
+        re-raised, and recorded by on_error.
+        """
+        self.command_errors.append((context.message.content, exception))
+
+    async def close(self):
+        """Stop every event handler and delete the archive."""
+        for task in list(self.tasks):
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        await super().close()
+        rmtree(self._directory, ignore_errors=True)
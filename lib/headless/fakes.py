@@ -0,0 +1,424 @@
+"""Contains in-memory stand-ins for the discord objects the bot uses.
+
+The fakes implement only what the bot touches: sending, pinning, and editing
+messages, fetching them by ID, and adding and removing roles. Requests which would
+fail on discord, like empty or overlong messages and fetches of missing messages,
+raise the same exceptions here, and every request is counted by lib.apicalls under
+the route discord.py would use.
+"""
+
+from copy import copy
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from discord import File, HTTPException, NotFound
+from discord.utils import snowflake_time, time_snowflake
+
+from lib.apicalls import record
+
+# discord's limit on message length
+MESSAGE_LIMIT = 2000
+
+# the response HTTPExceptions read their status from
+_BAD_REQUEST = SimpleNamespace(status=400, reason="Bad Request")
+_NOT_FOUND = SimpleNamespace(status=404, reason="Not Found")
+
+_last_snowflake = 0
+
+
+def snowflake() -> int:
+    """Generate an ID for the current time, greater than every ID generated before.
+
+    Message creation times are read from their IDs, as on discord, so IDs have to be
+    both timestamped and strictly increasing.
+    """
+    global _last_snowflake  # pylint: disable=global-statement
+    _last_snowflake = max(_last_snowflake + 1, time_snowflake(datetime.utcnow()))
+    return _last_snowflake
+
+
+class FakeRole:
+    """A role in a FakeGuild.
+
+    Parameters
+    ----------
+    guild : FakeGuild
+        The role's guild.
+    name : str
+        The role's name.
+    """
+
+    def __init__(self, guild: "FakeGuild", name: str):
+        self.id = snowflake()
+        self.guild = guild
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"<FakeRole id={self.id} name={self.name!r}>"
+
+    @property
+    def mention(self) -> str:
+        """Determine the string mentioning the role."""
+        return f"<@&{self.id}>"
+
+    @property
+    def members(self) -> List["FakeMember"]:
+        """Determine the guild's members with the role."""
+        return [member for member in self.guild.members if self in member.roles]
+
+
+class FakeMessage:
+    """A message in a FakeChannel or FakeDMChannel.
+
+    Messages which aren't in their channel, because they were deleted or were never
+    sent, raise NotFound from every request, like a deleted message.
+
+    Parameters
+    ----------
+    idn : int
+        The message's ID.
+    content : str
+        The message's text.
+    author : Optional[FakeMember]
+        The member who sent the message; None for messages which were never sent.
+    channel : Union[FakeChannel, FakeDMChannel]
+        The channel the message was sent in.
+    files : List[File]
+        The files attached to the message.
+    """
+
+    _state = None
+
+    def __init__(
+        self,
+        idn: int,
+        content: str,
+        author: Optional["FakeMember"],
+        channel: "_FakeMessageable",
+        files: Optional[List[File]] = None,
+    ):
+        self.id = idn
+        self.content = content
+        self.author = author
+        self.channel = channel
+        self.files = files or []
+        self.guild = channel.guild
+        self.pinned = False
+
+    def __repr__(self) -> str:
+        return f"<FakeMessage id={self.id} author={self.author!r}>"
+
+    @property
+    def created_at(self) -> datetime:
+        """Determine when the message was sent, in naive UTC."""
+        return snowflake_time(self.id)
+
+    async def edit(self, *, content: Optional[str] = None, **_kwargs):
+        """Edit the message's text."""
+        record("PATCH", "/channels/{channel_id}/messages/{message_id}")
+        self._check_exists()
+        if content is not None:
+            _check_content(content)
+            self.content = content
+
+    async def pin(self, **_kwargs):
+        """Pin the message."""
+        record("PUT", "/channels/{channel_id}/pins/{message_id}")
+        self._check_exists()
+        self.pinned = True
+
+    async def unpin(self, **_kwargs):
+        """Unpin the message."""
+        record("DELETE", "/channels/{channel_id}/pins/{message_id}")
+        self._check_exists()
+        self.pinned = False
+
+    async def delete(self, **_kwargs):
+        """Delete the message."""
+        record("DELETE", "/channels/{channel_id}/messages/{message_id}")
+        self._check_exists()
+        del self.channel.messages[self.id]
+
+    def _check_exists(self):
+        """Raise NotFound if the message isn't in its channel."""
+        if self.channel.messages.get(self.id) is not self:
+            raise NotFound(_NOT_FOUND, {"code": 10008, "message": "Unknown Message"})
+
+
+def _check_content(content: Any):
+    """Raise the HTTPException discord would for an empty or overlong message."""
+    if content is None or not str(content):
+        raise HTTPException(
+            _BAD_REQUEST, {"code": 50006, "message": "Cannot send an empty message"}
+        )
+    if len(str(content)) > MESSAGE_LIMIT:
+        raise HTTPException(
+            _BAD_REQUEST, {"code": 50035, "message": "Invalid Form Body"}
+        )
+
+
+class _FakeMessageable:
+    """Stores and sends the messages in a fake channel."""
+
+    guild = None  # type: Optional[FakeGuild]
+
+    def __init__(self, log: List[FakeMessage]):
+        self.id = snowflake()
+        self.messages = {}  # type: Dict[int, FakeMessage]
+        self._log = log
+
+    @property
+    def _me(self) -> "FakeMember":
+        raise NotImplementedError
+
+    def post(
+        self, author: "FakeMember", content: Optional[str], files: Sequence[File] = ()
+    ) -> FakeMessage:
+        """Add a message to the channel, without dispatching it.
+
+        Messages with files attached may have no text.
+        """
+        if not files or content is not None:
+            _check_content(content)
+        text = "" if content is None else str(content)
+        message = FakeMessage(snowflake(), text, author, self, list(files))
+        self.messages[message.id] = message
+        self._log.append(message)
+        return message
+
+    async def send(
+        self, content: Optional[str] = None, *, file: Optional[File] = None, **_kwargs
+    ) -> FakeMessage:
+        """Send a message from the bot."""
+        record("POST", "/channels/{channel_id}/messages")
+        return self.post(self._me, content, [file] if file else [])
+
+    async def fetch_message(self, idn: int) -> FakeMessage:
+        """Find a message in the channel by ID."""
+        record("GET", "/channels/{channel_id}/messages/{message_id}")
+        try:
+            return self.messages[idn]
+        except KeyError:
+            raise NotFound(
+                _NOT_FOUND, {"code": 10008, "message": "Unknown Message"}
+            ) from None
+
+    async def pins(self) -> List[FakeMessage]:
+        """Determine the pinned messages, newest first."""
+        record("GET", "/channels/{channel_id}/pins")
+        messages = reversed(list(self.messages.values()))
+        return [message for message in messages if message.pinned]
+
+
+class FakeChannel(_FakeMessageable):
+    """A text channel in a FakeGuild.
+
+    Parameters
+    ----------
+    guild : FakeGuild
+        The channel's guild.
+    name : str
+        The channel's name.
+    """
+
+    def __init__(self, guild: "FakeGuild", name: str):
+        super().__init__(guild.log)
+        self.guild = guild  # type: FakeGuild
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"<FakeChannel id={self.id} name={self.name!r}>"
+
+    @property
+    def mention(self) -> str:
+        """Determine the string mentioning the channel."""
+        return f"<#{self.id}>"
+
+    @property
+    def _me(self) -> "FakeMember":
+        return self.guild.me
+
+
+class FakeDMChannel(_FakeMessageable):
+    """The direct message channel between the bot and a FakeMember.
+
+    Parameters
+    ----------
+    recipient : FakeMember
+        The member the bot is messaging.
+    """
+
+    def __init__(self, recipient: "FakeMember"):
+        super().__init__(recipient.guild.log)
+        self.recipient = recipient
+
+    def __repr__(self) -> str:
+        return f"<FakeDMChannel id={self.id} recipient={self.recipient!r}>"
+
+    @property
+    def _me(self) -> "FakeMember":
+        return self.recipient.guild.me
+
+
+class FakeMember:
+    """A member of a FakeGuild.
+
+    Adding or removing roles dispatches member_update through the guild, as the
+    gateway would.
+
+    Parameters
+    ----------
+    guild : FakeGuild
+        The member's guild.
+    name : str
+        The member's username, which is also their display name.
+    bot : bool
+        Whether the member is a bot.
+    """
+
+    def __init__(self, guild: "FakeGuild", name: str, bot: bool = False):
+        self.id = snowflake()
+        self.guild = guild
+        self.name = name
+        self.display_name = name
+        self.nick = None  # type: Optional[str]
+        self.discriminator = "0001"
+        self.bot = bot
+        self.roles = []  # type: List[FakeRole]
+        self.dm_channel = FakeDMChannel(self)
+
+    def __repr__(self) -> str:
+        return f"<FakeMember id={self.id} name={self.name!r}>"
+
+    def __str__(self) -> str:
+        return f"{self.name}#{self.discriminator}"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, FakeMember) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return self.id >> 22
+
+    @property
+    def mention(self) -> str:
+        """Determine the string mentioning the member."""
+        return f"<@{self.id}>"
+
+    async def send(self, content: Optional[str] = None, **kwargs) -> FakeMessage:
+        """Send the member a direct message from the bot.
+
+        The bot has to open the DM channel first, unless either has used it before.
+        """
+        if not self.dm_channel.messages:
+            record("POST", "/users/@me/channels")
+        return await self.dm_channel.send(content, **kwargs)
+
+    async def add_roles(self, *roles: FakeRole, **_kwargs):
+        """Give the member roles."""
+        before = self._snapshot()
+        for _ in roles:
+            record("PUT", "/guilds/{guild_id}/members/{user_id}/roles/{role_id}")
+        self.roles += [role for role in roles if role not in self.roles]
+        self.guild.dispatch("member_update", before, self)
+
+    async def remove_roles(self, *roles: FakeRole, **_kwargs):
+        """Take roles from the member."""
+        before = self._snapshot()
+        for _ in roles:
+            record("DELETE", "/guilds/{guild_id}/members/{user_id}/roles/{role_id}")
+        self.roles = [role for role in self.roles if role not in roles]
+        self.guild.dispatch("member_update", before, self)
+
+    def _snapshot(self) -> "FakeMember":
+        """Copy the member as it is now, for the before of a member_update."""
+        before = copy(self)
+        before.roles = list(self.roles)
+        return before
+
+
+class FakeGuild:
+    """A guild holding fake members, roles, and channels.
+
+    Parameters
+    ----------
+    name : str
+        The guild's name.
+    bot_name : str
+        The name of the bot's own member.
+
+    Attributes
+    ----------
+    log : List[FakeMessage]
+        Every message sent in the guild or to its members, oldest first.
+    dispatch : Callable[..., None]
+        Called with an event name and its arguments when a member changes; set this
+        to the bot's dispatch.
+    me : FakeMember
+        The bot's own member.
+    """
+
+    chunked = True
+
+    def __init__(self, name: str = "Headless", bot_name: str = "BOTC Bot"):
+        self.id = snowflake()
+        self.name = name
+        self.log = []  # type: List[FakeMessage]
+        self.dispatch = lambda *args: None  # type: Callable[..., None]
+        self._members = {}  # type: Dict[int, FakeMember]
+        self._roles = {}  # type: Dict[int, FakeRole]
+        self._channels = {}  # type: Dict[int, FakeChannel]
+        self.me = self.add_member(bot_name, bot=True)
+
+    def __repr__(self) -> str:
+        return f"<FakeGuild id={self.id} name={self.name!r}>"
+
+    @property
+    def members(self) -> List[FakeMember]:
+        """Determine the guild's members."""
+        return list(self._members.values())
+
+    @property
+    def member_count(self) -> int:
+        """Determine the number of members."""
+        return len(self._members)
+
+    @property
+    def roles(self) -> List[FakeRole]:
+        """Determine the guild's roles."""
+        return list(self._roles.values())
+
+    @property
+    def channels(self) -> List[FakeChannel]:
+        """Determine the guild's channels."""
+        return list(self._channels.values())
+
+    def get_member(self, idn: int) -> Optional[FakeMember]:
+        """Find a member by ID."""
+        return self._members.get(idn)
+
+    def get_role(self, idn: int) -> Optional[FakeRole]:
+        """Find a role by ID."""
+        return self._roles.get(idn)
+
+    def get_channel(self, idn: int) -> Optional[FakeChannel]:
+        """Find a channel by ID."""
+        return self._channels.get(idn)
+
+    def add_member(self, name: str, bot: bool = False) -> FakeMember:
+        """Add a new member, without any roles."""
+        member = FakeMember(self, name, bot)
+        self._members[member.id] = member
+        return member
+
+    def add_role(self, name: str) -> FakeRole:
+        """Add a new role."""
+        role = FakeRole(self, name)
+        self._roles[role.id] = role
+        return role
+
+    def add_channel(self, name: str) -> FakeChannel:
+        """Add a new text channel."""
+        channel = FakeChannel(self, name)
+        self._channels[channel.id] = channel
+        return channel
@@ -0,0 +1,391 @@
+"""Contains the Simulation class, for playing scripted games on a HeadlessBot."""
+
+import asyncio
+from random import Random
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from lib.headless.bot import PREFIX, HeadlessBot
+from lib.headless.fakes import FakeMember, FakeMessage
+from lib.logic.Character import Demon, Minion, Outsider, Townsfolk
+from lib.logic.Player import Player
+from lib.logic.Script import Script, script_list
+
+# the members' names, which are chosen so none contains another
+NAMES = (
+    "Alpha Bravo Charlie Delta Echo Foxtrot Golf Hotel India Juliett Kilo Lima Mike "
+    "November Oscar Papa Quebec Romeo Sierra Tango Uniform Victor Whiskey Xray "
+    "Yankee Zulu"
+).split()
+STORYTELLER = "Narrator"
+TRAVELER = "Gunslinger"
+
+# players: (townsfolk, outsiders, minions, demons)
+# larger games add townsfolk to the fifteen player distribution
+_DISTRIBUTIONS = {
+    5: (3, 0, 1, 1),
+    6: (3, 1, 1, 1),
+    7: (5, 0, 1, 1),
+    8: (5, 1, 1, 1),
+    9: (5, 2, 1, 1),
+    10: (7, 0, 2, 1),
+    11: (7, 1, 2, 1),
+    12: (7, 2, 2, 1),
+    13: (9, 0, 3, 1),
+    14: (9, 1, 3, 1),
+    15: (9, 2, 3, 1),
+}
+_TYPES = (Townsfolk, Outsider, Minion, Demon)
+
+# the most prompts a command is answered before it's cancelled
+MAX_PROMPTS = 20
+
+# the most event loop iterations settle waits for handlers to finish or block
+_MAX_ITERATIONS = 10000
+
+# the most commands a night can take to finish
+_MAX_STEPS = 100
+
+# answers a prompt
+Responder = Callable[[str], str]
+
+# a simulation, or a subclass's
+_S = TypeVar("_S", bound="Simulation")
+
+
+def _distribution(players: int) -> List[int]:
+    """Determine the number of each type of character in a game."""
+    if players < 5:
+        raise ValueError("Games need at least five players.")
+    if players in _DISTRIBUTIONS:
+        return list(_DISTRIBUTIONS[players])
+    townsfolk, outsiders, minions, demons = _DISTRIBUTIONS[15]
+    return [townsfolk + players - 15, outsiders, minions, demons]
+
+
+def _characters(script: Script, players: int, rng: Random) -> List[str]:
+    """Choose the characters for a game, repeating some if the script runs out."""
+    out = []  # type: List[str]
+    for kind, count in zip(_TYPES, _distribution(players)):
+        pool = [char for char in script.character_list if issubclass(char, kind)]
+        chosen = rng.sample(pool, min(count, len(pool)))
+        chosen += [rng.choice(pool) for _ in range(count - len(chosen))]
+        out += [char.name for char in chosen]
+    rng.shuffle(out)
+    return out
+
+
+class Simulation:
+    """Plays a game on a HeadlessBot by sending commands as its members.
+
+    Each command is sent as a message and then run until it finishes or waits for
+    input. Prompts are answered by the command's replies, and then by respond, which
+    picks random targets and answers yes to every question; a command still asking
+    after MAX_PROMPTS answers is cancelled.
+
+    Build simulations with create, inside a running event loop.
+
+    Parameters
+    ----------
+    bot : HeadlessBot
+        The bot to play on.
+    players : List[FakeMember]
+        The members to seat, in seating order.
+    travelers : List[FakeMember]
+        The members who join as travelers once the game starts.
+    storyteller : FakeMember
+        The member who storytells.
+    script : Script
+        The script to play.
+    seed : int
+        The seed for every random choice.
+    """
+
+    def __init__(
+        self,
+        bot: HeadlessBot,
+        players: List[FakeMember],
+        travelers: List[FakeMember],
+        storyteller: FakeMember,
+        script: Script,
+        seed: int = 0,
+    ):
+        self.bot = bot
+        self.players = players
+        self.travelers = travelers
+        self.storyteller = storyteller
+        self.script = script
+        self.rng = Random(seed)
+        self.characters = _characters(script, len(players), self.rng)
+
+    @classmethod
+    async def create(
+        cls: Type[_S],
+        players: int,
+        travelers: int = 0,
+        script: Optional[Script] = None,
+        seed=0,
+    ) -> _S:
+        """Build a bot and its members, ready to start a game.
+
+        Trouble Brewing is played by default.
+        """
+        if players + travelers > len(NAMES):
+            raise ValueError(f"Simulations have at most {len(NAMES)} members.")
+
+        bot = HeadlessBot()
+        bot.load_cogs()
+        members = [bot.guild.add_member(name) for name in NAMES[: players + travelers]]
+        storyteller = bot.guild.add_member(STORYTELLER)
+        await storyteller.add_roles(bot.storyteller_role)
+        bot.role_index.seed(bot.indexed_roles)
+
+        if script is None:
+            script = next(script_list(None))  # type: ignore  # trouble brewing
+        return cls(bot, members[:players], members[players:], storyteller, script, seed)
+
+    @property
+    def game_players(self) -> Dict[int, Player]:
+        """Determine the game's players, by their members' IDs."""
+        if not self.bot.game:
+            return {}
+        return {player.member.id: player for player in self.bot.game.seating_order}
+
+    async def settle(self):
+        """Run the event loop until every event handler has finished or is blocked.
+
+        Handlers only block on prompts, so the loop has settled once there are no
+        more running handlers than pending prompts.
+
+        Raises
+        ------
+        RuntimeError
+            If the handlers are still running after _MAX_ITERATIONS iterations.
+        """
+        for _ in range(_MAX_ITERATIONS):
+            await asyncio.sleep(0)
+            running = sum(not task.done() for task in self.bot.tasks)
+            if running <= len(self.bot.input_router):
+                return
+        raise RuntimeError("The event handlers didn't settle.")
+
+    def send(self, author: FakeMember, content: str, dm: bool = True) -> FakeMessage:
+        """Send a message as a member, in their DMs or the gameplay channel."""
+        channel = author.dm_channel if dm else self.bot.channel
+        message = channel.post(author, content)
+        self.bot.dispatch("message", message)
+        return message
+
+    async def command(
+        self,
+        author: FakeMember,
+        text: str,
+        dm: bool = True,
+        replies: Union[Iterable[str], Responder] = (),
+    ) -> List[FakeMessage]:
+        """Run a command as a member, answering its prompts.
+
+        Parameters
+        ----------
+        author : FakeMember
+            The member invoking the command.
+        text : str
+            The command and its arguments, without the prefix.
+        dm : bool
+            Whether to send the command in DMs, rather than the gameplay channel.
+        replies : Union[Iterable[str], Responder]
+            The answers to the command's first prompts, or a function answering
+            every prompt.
+
+        Returns
+        -------
+        List[FakeMessage]
+            The messages the bot sent while running the command.
+        """
+        channel = author.dm_channel if dm else self.bot.channel
+        start = len(self.bot.guild.log)
+        if callable(replies):
+            respond = replies
+        else:
+            respond = _then(iter(replies), self.respond)
+
+        self.send(author, PREFIX + text, dm)
+        await self.settle()
+        for _ in range(MAX_PROMPTS):
+            if (author.id, channel.id) not in self.bot.input_router:
+                break
+            self.send(author, respond(self._prompt(channel)), dm)
+            await self.settle()
+        if (author.id, channel.id) in self.bot.input_router:
+            self.send(author, "cancel", dm)
+            await self.settle()
+
+        return [
+            message
+            for message in self.bot.guild.log[start:]
+            if message.author == self.bot.user
+        ]
+
+    def respond(self, prompt: str) -> str:
+        """Answer a prompt the command's replies didn't."""
+        if "'yes'" in prompt:  # an invalid yes or no
+            return "yes"
+        if '"no one"' in prompt:  # an invalid target
+            return "no one"
+        if "Who do you mean" in prompt:
+            return "1"
+        if prompt.startswith("Who") or "\nWho" in prompt:
+            return self.rng.choice(list(self.game_players.values())).member.name
+        if prompt.endswith("What would you like to send?"):
+            return "Hello!"
+        return "yes"
+
+    def _prompt(self, channel) -> str:
+        """Find the text the bot has sent in a channel since its author last spoke."""
+        lines = []  # type: List[str]
+        for message in reversed(list(channel.messages.values())):
+            if message.author != self.bot.user:
+                break
+            lines.insert(0, message.content)
+        return "\n".join(lines)
+
+    async def start_game(self):
+        """Start the game, then add the travelers."""
+        await self.command(
+            self.storyteller,
+            f"startgame {self.script.name}",
+            replies=[
+                "\n".join(member.name for member in self.players),
+                "\n".join(self.characters),
+            ],
+        )
+        for traveler in self.travelers:
+            neighbor = self.rng.choice(self.bot.game.seating_order)
+            await self.command(
+                self.storyteller,
+                f"addtraveler {traveler.name} {neighbor.member.name} "
+                f"{self.rng.choice(['good', 'evil'])} {TRAVELER}",
+            )
+
+    async def run_night(self):
+        """Step through the night until the day starts.
+
+        Raises
+        ------
+        RuntimeError
+            If the night doesn't end within _MAX_STEPS steps.
+        """
+        for _ in range(_MAX_STEPS):
+            if not (self.bot.game and self.bot.game.current_night):
+                return
+            await self.command(self.storyteller, "nextstep")
+        raise RuntimeError("The night didn't end.")
+
+    async def open(self) -> List[FakeMessage]:
+        """Open PMs and nominations."""
+        return await self.command(self.storyteller, "open")
+
+    async def pm(
+        self, sender: FakeMember, recipient: FakeMember, content: str = "Hello!"
+    ) -> List[FakeMessage]:
+        """Send a private message between members."""
+        return await self.command(sender, f"pm {recipient.name}", replies=[content])
+
+    async def nominate(
+        self, nominator: FakeMember, nominee: FakeMember
+    ) -> List[FakeMessage]:
+        """Nominate a member, in the gameplay channel."""
+        return await self.command(nominator, f"nominate {nominee.name}", dm=False)
+
+    async def prevote(self, voter: FakeMember, vote: str = "yes") -> List[FakeMessage]:
+        """Prevote in the current vote."""
+        return await self.command(voter, f"prevote {vote}")
+
+    async def vote_all(
+        self, vote: Callable[[FakeMember], str] = lambda member: "yes"
+    ) -> int:
+        """Vote in turn until the current vote ends, returning the number of votes."""
+        count = 0
+        while self._current_vote:
+            voter = self._current_vote.to_vote.member
+            await self.command(voter, f"vote {vote(voter)}", dm=False)
+            count += 1
+            if count > len(self.game_players) * 2:
+                raise RuntimeError("The vote didn't end.")
+        return count
+
+    @property
+    def _current_vote(self):
+        """Determine the current vote, or None."""
+        if self.bot.game and self.bot.game.current_day:
+            return self.bot.game.current_day.current_vote
+        return None
+
+    async def end_day(self):
+        """Execute whoever is about to die, or end the day without an execution."""
+        day = self.bot.game.current_day
+        if day.about_to_die:
+            await self.command(
+                self.storyteller, f"execute {day.about_to_die[0].member.name}"
+            )
+        else:
+            await self.command(self.storyteller, "endday", replies=["yes"])
+
+    async def end_game(self, winner: str = "neutral"):
+        """End the game."""
+        await self.command(self.storyteller, f"endgame {winner}")
+
+    async def play_day(self):
+        """Play a day: a few private messages, then a nomination if there can be one."""
+        await self.open()
+        game = self.bot.game
+        members = [player.member for player in game.seating_order]
+        for sender in self.rng.sample(members, min(3, len(members))):
+            recipient = self.rng.choice([x for x in members if x != sender])
+            await self.pm(sender, recipient)
+
+        nominators = [player.member for player in game.to_nominate]
+        nominees = [
+            player.member
+            for player in game.seating_order
+            if not player.has_been_nominated and not player.ghost(game)
+        ]
+        if nominators and nominees:
+            await self.nominate(
+                self.rng.choice(nominators), self.rng.choice(nominees)
+            )
+            await self.vote_all(lambda member: self.rng.choice(["yes", "no"]))
+
+        if self.bot.game and self.bot.game.current_day:
+            await self.end_day()
+
+    async def play(self, days: int = 3, winner: str = "neutral"):
+        """Play a whole game: start it, play days and nights, then end it."""
+        await self.start_game()
+        await self.run_night()
+        for _ in range(days):
+            await self.play_day()
+            await self.run_night()
+        await self.end_game(winner)
+
+    async def close(self):
+        """Shut the bot down."""
+        await self.bot.close()
+
+
+def _then(replies: Iterator[str], respond: Responder) -> Responder:
+    """Answer prompts with replies until they run out, and then with respond."""
+
+    def inner(prompt: str) -> str:
+        return next(replies, None) or respond(prompt)
+
+    return inner
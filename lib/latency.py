@@ -0,0 +1,196 @@
+"""Contains the LatencyTracker class, for timing each phase of command invocations."""
+
+import json
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from os import makedirs
+from os.path import dirname
+from time import perf_counter
+from typing import TYPE_CHECKING, Deque, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from lib.typings.context import Context
+
+# the phases of an invocation, in order
+# context: building the context and resolving aliases
+# lock: waiting for the table's lock
+# checks: checks, cooldowns, and argument conversion
+# body: the command itself, except waiting for replies to its prompts
+# input: waiting for replies to the command's prompts, which is left out of total
+# reseat, backup, status: the after-invoke hook's work
+# sends: waiting for the messages the command queued, after releasing the lock
+PHASES = (
+    "context",
+    "lock",
+    "checks",
+    "body",
+    "input",
+    "reseat",
+    "backup",
+    "status",
+    "sends",
+    "total",
+)
+
+# the total time in milliseconds from which an invocation is slow, by default
+THRESHOLD = 1000
+
+# the number of recent samples kept per command and phase
+SAMPLES = 1000
+
+# the percentiles reported
+PERCENTILES = (50, 90, 99)
+
+# the histogram's bucket upper bounds, in milliseconds
+BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Determine a percentile of samples by the nearest rank."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def histogram(samples: List[float]) -> List[Tuple[Optional[float], int]]:
+    """Count samples into BUCKETS, and the ones above the last bucket.
+
+    Returns
+    -------
+    List[Tuple[Optional[float], int]]
+        Each bucket's upper bound, or None for the last, and its count.
+    """
+    counts = [0] * (len(BUCKETS) + 1)
+    for sample in samples:
+        counts[next((i for i, x in enumerate(BUCKETS) if sample <= x), -1)] += 1
+    return list(zip(BUCKETS + (None,), counts))  # type: ignore
+
+
+class LatencyTracker:
+    """Times each phase of every command invocation, and logs slow invocations.
+
+    An invocation's phases are timed by marking the end of each: start marks the
+    end of building the context, and mark the rest. Phases which don't run, like
+    reseating at night, aren't recorded. Waits for replies to prompts are timed by
+    waiting instead, as the input phase, and left out of the phase they happen in
+    and of the total, since they measure how fast people answer.
+
+    Invocations whose total time reaches the threshold are appended to the slow
+    log, one JSON object per line.
+
+    Parameters
+    ----------
+    log_path : str
+        The slow log's file name.
+    threshold : float
+        The total time in milliseconds from which an invocation is slow.
+
+    Attributes
+    ----------
+    samples : Dict[str, Dict[str, Deque[float]]]
+        Each command's recent times in milliseconds, by phase.
+    """
+
+    def __init__(self, log_path: str, threshold: float):
+        self.log_path = log_path
+        self.threshold = threshold
+        self.samples = {}  # type: Dict[str, Dict[str, Deque[float]]]
+
+    @staticmethod
+    def start(ctx: "Context", started: float):
+        """Start timing an invocation, whose context building started at started."""
+        ctx.started = started
+        ctx.timings = {}
+        ctx.timing_mark = started
+        LatencyTracker.mark(ctx, "context")
+
+    @staticmethod
+    def mark(ctx: "Context", phase: str):
+        """End an invocation's phase, starting the next."""
+        now = perf_counter()
+        ctx.timings[phase] = (now - ctx.timing_mark) * 1000
+        ctx.timing_mark = now
+
+    @staticmethod
+    @contextmanager
+    def waiting(ctx: "Context") -> Iterator[None]:
+        """Time a wait for a reply within a with block, as the input phase.
+
+        Contexts which aren't being timed are ignored.
+        """
+        if not hasattr(ctx, "timings"):
+            yield
+            return
+
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            waited = perf_counter() - started
+            ctx.timings["input"] = ctx.timings.get("input", 0) + waited * 1000
+            ctx.timing_mark += waited
+
+    def finish(self, ctx: "Context"):
+        """Stop timing an invocation, and record it."""
+        waited = ctx.timings.get("input", 0)
+        ctx.timings["total"] = (perf_counter() - ctx.started) * 1000 - waited
+        name = ctx.command.qualified_name
+        phases = self.samples.setdefault(name, {})
+        for phase, time in ctx.timings.items():
+            phases.setdefault(phase, deque(maxlen=SAMPLES)).append(time)
+
+        if ctx.timings["total"] >= self.threshold:
+            self.log(ctx)
+
+    def log(self, ctx: "Context"):
+        """Append an invocation to the slow log."""
+        entry = {
+            "time": datetime.utcnow().isoformat(),
+            "command": ctx.command.qualified_name,
+            "invoked_with": ctx.invoked_with,
+            "author": ctx.author.id,
+            "channel": ctx.channel.id,
+            "failed": ctx.command_failed,
+            "timings_ms": {
+                phase: round(ctx.timings[phase], 3)
+                for phase in PHASES
+                if phase in ctx.timings
+            },
+        }
+        if dirname(self.log_path):
+            makedirs(dirname(self.log_path), exist_ok=True)
+        with open(self.log_path, "a") as file:
+            file.write(json.dumps(entry) + "\n")
+
+    def summary(
+        self, name: Optional[str] = None
+    ) -> List[Tuple[str, Dict[str, Tuple[int, List[float]]]]]:
+        """Determine commands' sample counts and percentiles, by phase.
+
+        Parameters
+        ----------
+        name : Optional[str]
+            The command to summarize, or None for every command.
+
+        Returns
+        -------
+        List[Tuple[str, Dict[str, Tuple[int, List[float]]]]]
+            Each command and its phases' sample counts and PERCENTILES, slowest
+            median total first.
+        """
+        out = [
+            (
+                command,
+                {
+                    phase: (
+                        len(phases[phase]),
+                        [percentile(list(phases[phase]), pct) for pct in PERCENTILES],
+                    )
+                    for phase in PHASES
+                    if phase in phases
+                },
+            )
+            for command, phases in self.samples.items()
+            if name in (None, command)
+        ]
+        return sorted(out, key=lambda item: -item[1]["total"][1][0])
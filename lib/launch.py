@@ -0,0 +1,99 @@
+"""Contains build_bot, for building bots from their sections of config.ini.
+
+A bot's section may list more tables to host games at, as the names of other
+sections, separated by commas:
+
+[My Bot]
+tables = My Bot 2, My Bot 3
+
+Each table's section defines its channel and roles like a bot's: channel,
+storytellerid, playerid, inactiveid, playtestid, and observerid.
+"""
+
+from configparser import ConfigParser, SectionProxy
+from os import makedirs
+from typing import List
+
+from lib.bot import BOTCBot
+from lib.tables import Table
+
+CONFIG_FILE = "config.ini"
+
+DESCRIPTION = (
+    "An unofficial Discord bot for helping run games of Blood on the "
+    "Clocktower. \nThis bot is in beta and is not associated with BOTC or "
+    "TPI. Please be forgiving of bugs.\n\nI'm Riley - message me "
+    "(nihilistkitten#6937) with questions, feedback, bug reports, or just "
+    "to talk!"
+)
+
+OWNER_ID = 149969652141785088
+
+
+def bot_names(config: ConfigParser) -> List[str]:
+    """Determine the names of the bots in the config, leaving out their tables."""
+    tables = {
+        name.strip()
+        for section in config.values()
+        for name in section.get("tables", "").split(",")
+    }
+    return [name for name in config.sections() if name not in tables]
+
+
+def _table(name: str, section: SectionProxy) -> Table:
+    """Build a table from its section of the config, making its backup directory."""
+    table = Table(
+        name,
+        int(section["channel"]),
+        int(section["storytellerid"]),
+        int(section["playerid"]),
+        int(section["inactiveid"]),
+        int(section["playtestid"]),
+        int(section["observerid"]),
+    )
+    makedirs(table.archive.directory, exist_ok=True)
+    return table
+
+
+def build_bot(bot_name: str, config: ConfigParser) -> BOTCBot:
+    """Build a bot from its section of the config, with its tables and cogs.
+
+    Parameters
+    ----------
+    bot_name : str
+        The bot's name, which is its section of the config.
+    config : ConfigParser
+        The config.
+
+    Returns
+    -------
+    BOTCBot
+        The bot, ready to run.
+
+    Raises
+    ------
+    KeyError
+        If the bot or one of its tables isn't in the config, or a key it needs isn't
+        defined for it.
+    """
+    section = config[bot_name]
+    bot = BOTCBot(
+        bot_name,
+        int(section["server"]),
+        int(section["channel"]),
+        int(section["storytellerid"]),
+        int(section["playerid"]),
+        int(section["inactiveid"]),
+        int(section["playtestid"]),
+        int(section["observerid"]),
+        config=section,
+        command_prefix=tuple(section["prefixes"]),
+        description=DESCRIPTION,
+        case_insensitive=True,
+        owner_id=OWNER_ID,
+    )
+    for name in section.get("tables", "").split(","):
+        if name.strip():
+            bot.add_table(_table(name.strip(), config[name.strip()]))
+    bot.load_cogs()
+    return bot
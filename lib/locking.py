@@ -0,0 +1,72 @@
+"""Contains functions for running each table's commands one at a time.
+
+Every command holds its table's lock from before its checks until after its
+after-invoke hook, so it never sees another command's half-finished changes to the
+game. Commands give the lock up with unlocked while waiting for prompts or doing
+I/O which doesn't touch the game. Commands which never touch a game can be marked
+with unlocked_command to run without it.
+"""
+
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Callable
+
+from discord.ext import commands
+
+if TYPE_CHECKING:
+    from lib.typings.context import Context
+
+
+def unlocked_command() -> Callable:
+    """Mark a command to run without its table's lock.
+
+    Apply this below the command decorator, like a check.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        target = func.callback if isinstance(func, commands.Command) else func
+        target.__unlocked__ = True  # type: ignore
+        return func
+
+    return decorator
+
+
+def needs_lock(command: commands.Command) -> bool:
+    """Determine whether a command runs with its table's lock."""
+    return not getattr(command.callback, "__unlocked__", False)
+
+
+async def acquire(ctx: "Context"):
+    """Wait for the current table's lock, and hold it for the invocation."""
+    lock = ctx.bot.table.lock
+    await lock.acquire()
+    ctx.table_lock = lock
+
+
+def release(ctx: "Context"):
+    """Release the invocation's lock, if it holds one."""
+    lock = getattr(ctx, "table_lock", None)
+    if lock is not None:
+        ctx.table_lock = None
+        lock.release()
+
+
+@asynccontextmanager
+async def unlocked(ctx: "Context") -> AsyncIterator[None]:
+    """Release the invocation's lock within an async with block, if it holds one.
+
+    Other commands can change the game within the block, so anything read from the
+    game before it may be stale after it. That includes the invocation's actor
+    profile, which is cleared, so lib.actor.get_actor resolves it again.
+    """
+    lock = getattr(ctx, "table_lock", None)
+    if lock is None:
+        yield
+        return
+
+    release(ctx)
+    try:
+        yield
+    finally:
+        await lock.acquire()
+        ctx.table_lock = lock
+        ctx.actor = None
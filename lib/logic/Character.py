@@ -2,11 +2,13 @@
 
 import json
 from abc import ABC
+from functools import lru_cache
 from typing import TYPE_CHECKING, Dict, List, Tuple, Type
 
 from discord.ext import commands
 
 from lib.abc import NightOrderMember
+from lib.logic.hooks import default_hook
 from lib.logic.Effect import (Dead, DemonEffect, Evil, Good, MinionEffect,
                               OutsiderEffect, StorytellerEffect,
                               TownsfolkEffect, TravelerEffect)
@@ -17,6 +19,19 @@ if TYPE_CHECKING:
     from lib.logic.Player import Player
     from lib.typings.context import GameContext, DayContext
 
+BASEGAME_CHARACTER_INFO = "resources/basegame/character_info.json"
+PLAYTEST_CHARACTER_INFO = "resources/d/character_info.json"
+
+
+@lru_cache(maxsize=None)
+def load_character_info(path: str) -> Dict[str, Dict]:
+    """Load a character info file.
+
+    These ship with the bot and don't change while it's running, so each is read once.
+    """
+    with open(path, "r") as fp:
+        return json.load(fp)
+
 
 class Character(NightOrderMember):
     """A generic character.
@@ -64,6 +79,7 @@ class Character(NightOrderMember):
         return [], []
 
     # noinspection PyUnusedLocal
+    @default_hook
     async def nomination(
         self, ctx: "DayContext", nominee: "Player", nominator: "Player",
     ) -> bool:
@@ -98,11 +114,9 @@ class Character(NightOrderMember):
     @classmethod
     def _char_info(cls) -> Dict:
         if not cls.playtest:
-            with open("resources/basegame/character_info.json", "r") as fp:
-                return json.load(fp)[cls.name]
+            return load_character_info(BASEGAME_CHARACTER_INFO)[cls.name]
         else:
-            with open("resources/d/character_info.json", "r") as fp:
-                return json.load(fp)[cls.name]
+            return load_character_info(PLAYTEST_CHARACTER_INFO)[cls.name]
 
     @classmethod
     def rules_text(cls) -> str:
@@ -1,16 +1,19 @@
 """Contains the Day class."""
 
+from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from discord.ext import commands
 from numpy import ceil
 
 from lib.exceptions import AlreadyNomniatedError
+from lib.logic.hooks import overrides, subscribed
 from lib.logic.Player import Player
 from lib.logic.playerconverter import to_player
+from lib.logic.scheduler import EVENING
 from lib.logic.tools import generate_message_tally
 from lib.logic.Vote import Vote
-from lib.utils import safe_bug_report, safe_send
+from lib.utils import queue_send, safe_bug_report, safe_send
 
 if TYPE_CHECKING:
     from lib.logic.Game import Game
@@ -34,6 +37,10 @@ class Day:
         The player currently about to die, their vote tally, and the announcement ID.
     vote_end_messages : List[int]
         The IDs of messages announcing the end of votes.
+    start_time : datetime
+        When the day started, in UTC.
+    end_time : Optional[datetime]
+        When the day ended, in UTC, or None if it hasn't.
     """
 
     def __init__(self):
@@ -43,6 +50,8 @@ class Day:
         self.current_vote = None  # type: Optional[Vote]
         self.about_to_die = None  # type: Optional[Tuple[Player, int, int]]
         self.vote_end_messages = []  # type: List[int]
+        self.start_time = datetime.utcnow()  # type: datetime
+        self.end_time = None  # type: Optional[datetime]
 
     async def nominate(self, ctx: "DayContext", nominee_str: str, nominator: Player):
         """Begin a vote on the nominee.
@@ -68,10 +77,12 @@ class Day:
         # check effects
         proceed = True
         for player in ctx.bot.game.seating_order:
-            proceed = (
-                await player.character.nomination(ctx, nominee, nominator) and proceed
-            )
-            effect_list = [x for x in player.effects]
+            if overrides(type(player.character), "nomination"):
+                proceed = (
+                    await player.character.nomination(ctx, nominee, nominator)
+                    and proceed
+                )
+            effect_list = list(subscribed(player.effects, "nomination"))
             for effect in effect_list:
                 proceed = await effect.nomination(ctx, nominee, nominator) and proceed
 
@@ -135,37 +146,34 @@ class Day:
         """Open PMs."""
         self.is_pms = True
         for st in ctx.bot.game.storytellers:
-            await safe_send(st.member, "PMs are now open.")
+            await queue_send(st.member, "PMs are now open.")
         await ctx.bot.update_status()
 
     async def open_noms(self, ctx: "DayContext"):
         """Open nominations."""
         self.is_noms = True
         for st in ctx.bot.game.storytellers:
-            await safe_send(st.member, "Nominations are now open.")
+            await queue_send(st.member, "Nominations are now open.")
         await ctx.bot.update_status()
 
     async def close_pms(self, ctx: "DayContext"):
         """Close PMs."""
         self.is_pms = False
         for st in ctx.bot.game.storytellers:
-            await safe_send(st.member, "PMs are now closed.")
+            await queue_send(st.member, "PMs are now closed.")
         await ctx.bot.update_status()
 
     async def close_noms(self, ctx: "DayContext"):
         """Close nominations."""
         self.is_noms = False
         for st in ctx.bot.game.storytellers:
-            await safe_send(st.member, "Nominations are now closed.")
+            await queue_send(st.member, "Nominations are now closed.")
         await ctx.bot.update_status()
 
     async def end(self, ctx: "DayContext"):
         """End the day."""
         # cleanup effects
-        for player in ctx.bot.game.seating_order:
-            effect_list = [x for x in player.effects]
-            for effect in effect_list:
-                effect.evening_cleanup(ctx.bot.game)
+        ctx.bot.game.scheduler.run(ctx.bot.game, EVENING)
 
         # remove the current vote
         if self.current_vote:
@@ -180,6 +188,7 @@ class Day:
         await self._send_message_tally(ctx)
 
         # remove the day
+        self.end_time = datetime.utcnow()
         ctx.bot.game.past_days.append(self)
         ctx.bot.game.current_day = None
 
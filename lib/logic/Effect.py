@@ -1,6 +1,8 @@
 """Contains the Effect class and several Effect subclass ABCs."""
 
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, Optional
+
+from lib.logic.hooks import default_hook, subscribed
 
 if TYPE_CHECKING:
     from lib.logic.Player import Player
@@ -47,12 +49,16 @@ class Effect:
     ----------
     disabled: bool
         Whether the effect is currently disabled.
+    expires: Optional[str]
+        "morning" or "evening" if the effect is deleted at a dawn or dusk; see
+        lib.logic.charcreation.morning_delete.
     affected_player
     source_player
     """
 
     _name: str = "Effect"
     appears: bool = True
+    expires: Optional[str] = None
 
     def __init__(
         self, affected_player: "Player", source_player: "Player",
@@ -123,15 +129,17 @@ class Effect:
         assert status_name in status_list
         return getattr(self, "registers_" + status_name, lambda x: False)(game)
 
+    @default_hook
     def morning_cleanup(self, game: "Game"):
         """Call at the start of each day.
 
-        Primarily used to delete effects, when appropriate.
+        Only called for effects which override it; see lib.logic.scheduler.
         """
         pass
 
     # noinspection PyUnusedLocal
     @staticmethod
+    @default_hook
     async def nomination(game: "Game", nominee: "Player", nominator: "Player") -> bool:
         """Call at the start of each nomination.
 
@@ -151,13 +159,15 @@ class Effect:
         """
         return True
 
+    @default_hook
     def evening_cleanup(self, game: "Game"):
         """Call at the end of each day.
 
-        Primarily used to delete effects, when appropriate.
+        Only called for effects which override it; see lib.logic.scheduler.
         """
         pass
 
+    @default_hook
     def source_drunkpoisoned_cleanup(self, game: "Game"):
         """Call when source_player stops functioning.
 
@@ -165,6 +175,7 @@ class Effect:
         """
         pass
 
+    @default_hook
     def source_death_cleanup(self, game: "Game"):
         """Call when source_player dies.
 
@@ -195,18 +206,29 @@ class Effect:
         originally_dead = self.affected_player.ghost(game)
 
         enabler_func()
+        game.changed()
 
         if originally_functioning and not self.affected_player.functioning(game):
 
             if not originally_dead and self.affected_player.ghost(game):
-                effect_list = [x for x in self.affected_player.source_effects(game)]
+                effect_list = list(
+                    subscribed(
+                        self.affected_player.source_effects(game),
+                        "source_death_cleanup",
+                    )
+                )
                 for effect in effect_list:
                     # can't call it on self because of recursion errors
                     if not self == effect:
                         effect.source_death_cleanup(game)
 
             else:
-                effect_list = [x for x in self.affected_player.source_effects(game)]
+                effect_list = list(
+                    subscribed(
+                        self.affected_player.source_effects(game),
+                        "source_drunkpoisoned_cleanup",
+                    )
+                )
                 for effect in effect_list:
                     if not self == effect:
                         effect.source_drunkpoisoned_cleanup(game)
@@ -243,12 +265,19 @@ class Effect:
         originally_functioning = self.affected_player.functioning(game)
 
         disabler_func()
+        game.changed()
 
         if not originally_functioning and self.affected_player.functioning(game):
-            effect_list = [x for x in self.affected_player.source_effects(game)]
+            effect_list = list(
+                subscribed(
+                    self.affected_player.source_effects(game),
+                    "source_starts_functioning",
+                )
+            )
             for effect in effect_list:
                 effect.source_starts_functioning(game)
 
+    @default_hook
     def source_starts_functioning(self, game: "Game"):
         """Call when source_player restarts functioning.
 
@@ -2,13 +2,17 @@
 
 from typing import TYPE_CHECKING, List, Optional
 
-from discord import Message
+from discord import Message, NotFound
 from discord.ext import commands
 
+from lib.logic.activity import ActivityTracker
 from lib.logic.Day import Day
+from lib.logic.derived import DerivedState
 from lib.logic.Night import Night
 from lib.logic.Player import Player
+from lib.logic.scheduler import PhaseScheduler
 from lib.logic.tools import generate_game_info_message
+from lib.utils import safe_send
 
 if TYPE_CHECKING:
     from lib.logic.Script import Script
@@ -56,6 +60,9 @@ class Game:
         self.seating_order_message = seating_order_message
         self.script = script
         self.storytellers = storytellers
+        self._scheduler = PhaseScheduler.for_players(
+            self.phase, seating_order + storytellers
+        )
 
     def __getstate__(self) -> dict:
         """Cleanup when pickled."""
@@ -63,6 +70,8 @@ class Game:
         state[
             "seating_order_message"
         ] = self.seating_order_message.id  # discord snowflake objects are not picklable
+        state.pop("_activity", None)  # rebuilt on demand
+        state.pop("_derived", None)
         return state
 
     @property
@@ -70,10 +79,48 @@ class Game:
         """Determine the current day number."""
         return len(self.past_days) + int(bool(self.current_day))
 
+    @property
+    def phase(self) -> int:
+        """Determine the number of dawns and dusks so far."""
+        return 2 * len(self.past_days) + int(bool(self.current_day))
+
+    @property
+    def scheduler(self) -> PhaseScheduler:
+        """Determine the game's effect scheduler.
+
+        Games saved before the scheduler existed get one on first use.
+        """
+        scheduler = self.__dict__.get("_scheduler")
+        if scheduler is None:
+            scheduler = self._scheduler = PhaseScheduler.for_players(
+                self.phase, self.seating_order + self.storytellers
+            )
+        return scheduler
+
+    @property
+    def activity(self) -> ActivityTracker:
+        """Determine the tracker of who has spoken today, rebuilding it if outdated."""
+        tracker = self.__dict__.get("_activity")
+        if tracker is None or not tracker.tracks(self):
+            tracker = self._activity = ActivityTracker(self)
+        return tracker
+
+    @property
+    def derived(self) -> DerivedState:
+        """Determine the cache of players' statuses, rebuilding it if outdated."""
+        derived = self.__dict__.get("_derived")
+        if derived is None or not derived.tracks(self):
+            derived = self._derived = DerivedState(self)
+        return derived
+
+    def changed(self):
+        """Discard state derived from players' effects, after they change."""
+        self.__dict__.pop("_derived", None)
+
     @property
     def not_active(self) -> List[Player]:
         """Determine the players who have not spoken today."""
-        return [player for player in self.seating_order if not player.has_spoken]
+        return self.activity.not_active()
 
     @property
     def to_nominate(self) -> List[Player]:
@@ -81,7 +128,7 @@ class Game:
         return [
             player
             for player in self.seating_order
-            if player.can_nominate(self) and not player.has_skipped
+            if not player.has_skipped and player.can_nominate(self)
         ]
 
     async def reseat(self, ctx: "GameContext", new_seating_order: List[Player]):
@@ -101,9 +148,14 @@ class Game:
             )
 
         # Edit the message
-        await self.seating_order_message.edit(
-            content=generate_game_info_message(new_seating_order, ctx.bot.game)
-        )
+        content = generate_game_info_message(new_seating_order, ctx.bot.game)
+        try:
+            await self.seating_order_message.edit(content=content)
+        except NotFound:
+            # the message was deleted, perhaps while the bot was offline
+            self.seating_order_message = await safe_send(
+                ctx.bot.channel, content, pin=True
+            )
 
         # Update seating order
         self.seating_order = new_seating_order
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING, List, Tuple
 from lib.abc import NightOrderMember
 from lib.exceptions import InvalidMorningTargetError
 from lib.logic.Day import Day
+from lib.logic.scheduler import MORNING
 from lib.utils import list_to_plural_string, safe_bug_report, safe_send
 
 if TYPE_CHECKING:
@@ -16,17 +17,10 @@ if TYPE_CHECKING:
 def _get_minion_demon_text(
     ctx: "GameContext",
 ) -> Tuple[Tuple[str, bool], Tuple[str, bool]]:
-    minions = [
-        player.nick
-        for player in ctx.bot.game.seating_order
-        if player.is_status(ctx.bot.game, "minion")
-    ]
+    derived = ctx.bot.game.derived
+    minions = [player.nick for player in derived.with_status("minion")]
     minion_text = list_to_plural_string(minions, "")
-    demons = [
-        player.nick
-        for player in ctx.bot.game.seating_order
-        if player.is_status(ctx.bot.game, "demon")
-    ]
+    demons = [player.nick for player in derived.with_status("demon")]
     demon_text = list_to_plural_string(demons, "no one")
     return minion_text, demon_text
 
@@ -127,11 +121,10 @@ class Night:
             await self.current_step(ctx)
 
     async def _end(self, ctx: "GameContext"):
+        inactive_ids = ctx.bot.role_index.ids(ctx.bot.inactive_role)
         for player in ctx.bot.game.seating_order:
-            player.morning(ctx.bot.inactive_role)
-            effect_list = [x for x in player.effects]
-            for effect in effect_list:
-                effect.morning_cleanup(ctx)
+            player.morning(inactive_ids)
+        ctx.bot.game.scheduler.run(ctx.bot.game, MORNING)
 
         # announcements
         # kills
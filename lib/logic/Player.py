@@ -4,12 +4,15 @@ import traceback
 import typing
 from typing import Optional
 
-from discord import Member, Role
+from discord import Member
 from discord.ext import commands
 
+from lib.locking import unlocked
 from lib.logic.Effect import Dead, Effect, Evil, Good
+from lib.logic.hooks import subscribed
 from lib.preferences import load_preferences
-from lib.utils import get_input, safe_bug_report, safe_send
+from lib.sending import RELAY
+from lib.utils import get_input, queue_send, safe_bug_report, safe_send
 
 if typing.TYPE_CHECKING:
     from lib.logic.Character import Character
@@ -49,13 +52,41 @@ async def _update_activity(
     except _UpdateUnnecessaryError:
         return
 
-    if len(player_list) == 0:
+    await _notify_activity(
+        game,
+        len(player_list),
+        player_list[0] if len(player_list) == 1 else None,
+        zero_string,
+        one_string,
+    )
+
+
+async def _notify_activity(
+    game: "Game",
+    remaining: int,
+    last: Optional["Player"],
+    zero_string: str,
+    one_string: str,
+):
+    """Tell the storytellers when no players, or only one, remain to act."""
+    if remaining == 0:
         for st in game.storytellers:
-            await safe_send(st.member, f"Everyone has {zero_string}!")
+            await queue_send(st.member, f"Everyone has {zero_string}!")
 
-    elif len(player_list) == 1:
+    elif remaining == 1 and last is not None:
         for st in game.storytellers:
-            await safe_send(st.member, f"Just {player_list[0].nick} to {one_string}.")
+            await queue_send(st.member, f"Just {last.nick} to {one_string}.")
+
+
+async def make_active(game: "Game", idn: int):
+    """Mark the player with the ID as having spoken today, and update storytellers.
+
+    This runs for every message in the game channel during the day, so it returns
+    immediately for anyone who isn't a player yet to speak.
+    """
+    tracker = game.activity
+    if tracker.speak(idn):
+        await _notify_activity(game, len(tracker), tracker.last(), "spoken", "speak")
 
 
 class Player:
@@ -169,14 +200,15 @@ class Player:
 
     def can_nominate(self, game: "Game") -> bool:
         """Determine whether the player can nominate."""
+        derived = game.derived
         return (
-            not self.ghost(game, registers=True)
-            or self.is_status(game, "can_nominate_while_dead")
+            not derived.has_status(self, "dead", registers=True)
+            or derived.has_status(self, "can_nominate_while_dead")
         ) and (
             self.nominations_today == 0
             or (
                 self.nominations_today == 1
-                and self.is_status(game, "can_nominate_twice")
+                and derived.has_status(self, "can_nominate_twice")
             )
         )
 
@@ -304,15 +336,12 @@ class Player:
         return message_text
 
     # Gameplay Methods
-    def morning(self, inactive_role: Role):
+    def morning(self, inactive_ids: typing.Set[int]):
         """Handle basic cleanup at the beginning of the day.
 
-        Called by Game.startday.
+        Called by Game.startday, with the IDs of the members with the inactive role.
         """
-        if self.member in inactive_role.members:
-            self.is_inactive = True
-        else:
-            self.is_inactive = False
+        self.is_inactive = self.member.id in inactive_ids
         self.nominations_today = 0
         self.has_been_nominated = False
         self.has_spoken = self.is_inactive
@@ -334,59 +363,78 @@ class Player:
             ctx, f"Messaging {self.nick}. What would you like to send?"
         )
 
-        # messages to storytellers
-        if self.is_status(ctx.bot.game, "storyteller"):
-            for st in ctx.bot.game.storytellers:
+        # delivery only reads the game, so it's read first and other commands can
+        # run at the table while the messages are sent
+        game = ctx.bot.game
+        day_number = game.day_number
+        storytellers = list(game.storytellers)
+        observers = ctx.bot.role_index.members(ctx.bot.observer_role)
+        to_storyteller = self.is_status(game, "storyteller")
+
+        async with unlocked(ctx):
+
+            # messages to storytellers
+            if to_storyteller:
+                for st in storytellers:
+                    message = await safe_send(
+                        st.member,
+                        (
+                            f"{st.member.mention}, message from {frm.nick} to "
+                            f"storyteller {self.nick}: **{content}**"
+                        ),
+                    )  # STs get the
+                    # bolded message for a message to any ST
+
+                for observer in observers:
+                    await queue_send(
+                        observer,
+                        f"**[**{frm.nick} **>** {self.nick}**]** {content}",
+                        RELAY,
+                    )
+
+            # other messages
+            else:
                 message = await safe_send(
-                    st.member,
-                    (
-                        f"{st.member.mention}, message from {frm.nick} to "
-                        f"storyteller {self.nick}: **{content}**"
-                    ),
-                )  # STs get the
-                # bolded message for a message to any ST
-
-            for observer in ctx.bot.observer_role.members:
-                await safe_send(
-                    observer, f"**[**{frm.nick} **>** {self.nick}**]** {content}",
-                )
-
-        # other messages
-        else:
-            message = await safe_send(
-                self.member, f"Message from {frm.nick}: **{content}**",
-            )
-
-            # inform sts and observers
-            for st in ctx.bot.game.storytellers:
-                await safe_send(
-                    st.member, f"**[**{frm.nick} **>** {self.nick}**]** {content}",
-                )
-
-            for observer in ctx.bot.observer_role.members:
-                await safe_send(
-                    observer, f"**[**{frm.nick} **>** {self.nick}**]** {content}",
+                    self.member, f"Message from {frm.nick}: **{content}**",
                 )
 
-        # public report
-        if ctx.bot.instant_message_reporting:
-            await safe_send(ctx.bot.channel, f"**{frm.nick}** > **{self.nick}**")
-
-        # update message histories
-        # noinspection PyUnboundLocalVariable
-        # think this is a false positive
-        message_dict = {
-            "from": frm,
-            "to": self,
-            "content": content,
-            "day": ctx.bot.game.day_number,
-            "time": message.created_at,
-        }
-        self.message_history.append(message_dict)
-        frm.message_history.append(message_dict)
+                # inform sts and observers
+                for st in storytellers:
+                    await queue_send(
+                        st.member,
+                        f"**[**{frm.nick} **>** {self.nick}**]** {content}",
+                        RELAY,
+                    )
+
+                for observer in observers:
+                    await queue_send(
+                        observer,
+                        f"**[**{frm.nick} **>** {self.nick}**]** {content}",
+                        RELAY,
+                    )
+
+            # public report
+            if ctx.bot.instant_message_reporting:
+                await safe_send(ctx.bot.channel, f"**{frm.nick}** > **{self.nick}**")
+
+        # the game may have ended, or another started, while the lock was released
+        if ctx.bot.game is game:
+
+            # update message histories
+            # noinspection PyUnboundLocalVariable
+            # think this is a false positive
+            message_dict = {
+                "from": frm,
+                "to": self,
+                "content": content,
+                "day": day_number,
+                "time": message.created_at,
+            }
+            self.message_history.append(message_dict)
+            frm.message_history.append(message_dict)
+            await frm.make_active(game)
 
         # complete
-        await frm.make_active(ctx.bot.game)
         await safe_send(frm.member, "Message sent!")
         return
 
@@ -408,8 +456,11 @@ class Player:
             if effect.status(game, "dead") or effect.status(game, "used_ability"):
                 # TODO: figure out how this should work with registers_status
                 self.effects.remove(effect)
+        game.changed()
 
-        for effect in self.source_effects(game):
+        for effect in subscribed(
+            self.source_effects(game), "source_starts_functioning"
+        ):
             effect.source_starts_functioning(game)
 
         return f"{self.nick} has come back to life."
@@ -453,7 +504,9 @@ class Player:
             """Add the effect to the player's effects list."""
             self.effects.append(effect_object)
 
-        return effect_object.turn_on(game, effect_adder)
+        effect_object.turn_on(game, effect_adder)
+        game.scheduler.add(effect_object)
+        return effect_object
 
     async def execute(self, ctx: "GameContext"):
         """Execute the player."""
@@ -482,14 +535,7 @@ class Player:
 
     async def make_active(self, game: "Game"):
         """Set has_spoken to true and update storytellers."""
-
-        def _updater_func(inner_game: "Game") -> typing.List["Player"]:
-            if self.has_spoken:
-                raise _UpdateUnnecessaryError
-            self.has_spoken = True
-            return inner_game.not_active
-
-        await _update_activity(game, _updater_func, "spoken", "speak")
+        await make_active(game, self.member.id)
 
     async def add_nomination(self, ctx: "DayContext", skip: bool = False):
         """Set has_spoken to true and update storytellers."""
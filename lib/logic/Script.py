@@ -1,12 +1,22 @@
 """Contains the Script class and script_list generator."""
 
 from os import listdir
-from typing import TYPE_CHECKING, Generator, List, Tuple, Type
-
-from dill import dump, load
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Generator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 from lib.logic.Character import Character, Demon, Minion, Outsider, Townsfolk
-from lib.utils import list_to_plural_string
+from lib.logic.characterindex import CharacterIndex
+from lib.logic.registry import resolve_all
+from lib.utils import list_to_plural_string, load_pickle, save_pickle
 from resources.basegame import characters
 
 try:
@@ -18,6 +28,9 @@ except ImportError:
 if TYPE_CHECKING:
     from lib.typings.context import Context
 
+BASEGAME_SCRIPTS = "resources/basegame/scripts/"
+PLAYTEST_SCRIPTS = "resources/playtest/scripts/"
+
 
 class Script:
     """Stores information about a specific script.
@@ -26,13 +39,14 @@ class Script:
     ----------
     name : str
         The scripts's name.
-    character_input : List[Type[Character]]
-        The characters on the script.
+    character_input : Sequence[Union[str, Type[Character]]]
+        The characters on the script. Basegame characters may be given by class name,
+        in which case they aren't imported until the script is used.
     aliases : List[str]
         The script's aliases.
-    first_night : List[Type[Character]]
+    first_night : Sequence[Union[str, Type[Character]]]
         The first night _order.
-    other_nights : List[Type[Character]]
+    other_nights : Sequence[Union[str, Type[Character]]]
         The _order for other nights.
     editors : List[int]
         IDs of users authorized to edit the script.
@@ -42,7 +56,7 @@ class Script:
     Attributes
     ----------
     name
-    character_input
+    character_list
     aliases
     editors
     playtest
@@ -52,15 +66,20 @@ class Script:
 
     aliases: List[str]
     editors: List[int]
+    # class names, or the classes once they're resolved
+    _character_list: List[Any]
+    _first_night: List[Any]
+    _other_nights: List[Any]
+    _character_index: CharacterIndex
 
     def __init__(
         self,
         name: str,
-        character_input: List[Type[Character]],
-        aliases: List[str] = None,
-        first_night: List[Type[Character]] = None,
-        other_nights: List[Type[Character]] = None,
-        editors: List[int] = None,
+        character_input: Sequence[Union[str, Type[Character]]],
+        aliases: Optional[List[str]] = None,
+        first_night: Optional[Sequence[Union[str, Type[Character]]]] = None,
+        other_nights: Optional[Sequence[Union[str, Type[Character]]]] = None,
+        editors: Optional[List[int]] = None,
         playtest: bool = False,
     ):
         self.name = name
@@ -71,9 +90,53 @@ class Script:
         self.first_night = first_night or []
         self.other_nights = other_nights or []
 
-    def has_character(self, character: Character) -> bool:
+    @property
+    def character_list(self) -> List[Type[Character]]:
+        """Determine the characters on the script, importing them if necessary."""
+        self._character_list = resolve_all(self._character_list, characters.resolve)
+        return self._character_list
+
+    @character_list.setter
+    def character_list(self, value: Sequence[Union[str, Type[Character]]]):
+        self._character_list = list(value)
+        self.__dict__.pop("_character_index", None)
+
+    @property
+    def first_night(self) -> List[Type[Character]]:
+        """Determine the first night order, importing characters if necessary."""
+        self._first_night = resolve_all(self._first_night, characters.resolve)
+        return self._first_night
+
+    @first_night.setter
+    def first_night(self, value: Sequence[Union[str, Type[Character]]]):
+        self._first_night = list(value)
+
+    @property
+    def other_nights(self) -> List[Type[Character]]:
+        """Determine the order for other nights, importing characters if necessary."""
+        self._other_nights = resolve_all(self._other_nights, characters.resolve)
+        return self._other_nights
+
+    @other_nights.setter
+    def other_nights(self, value: Sequence[Union[str, Type[Character]]]):
+        self._other_nights = list(value)
+
+    @property
+    def character_index(self) -> CharacterIndex:
+        """Index the script's characters by name.
+
+        Built on first use and not pickled, so scripts saved before the index existed
+        still load.
+        """
+        try:
+            return self._character_index
+        except AttributeError:
+            self._character_index = CharacterIndex.from_classes(self.character_list)
+            return self._character_index
+
+    def has_character(self, character: Type[Character]) -> bool:
         """Whether character is on the script."""
-        return character in self.character_list
+        return character in self.character_index
 
     @property
     def has_atheist(self) -> bool:
@@ -83,18 +146,29 @@ class Script:
         except NameError:
             return False
 
+    def __getstate__(self) -> dict:
+        """Cleanup when pickled."""
+        state = self.__dict__.copy()
+        state.pop("_character_index", None)  # rebuilt on demand
+        return state
+
+    def __setstate__(self, state: dict):
+        """Restore when unpickled.
+
+        Scripts pickled before characters were loaded lazily store their character
+        lists under the public names, which are now properties.
+        """
+        for attribute in ("character_list", "first_night", "other_nights"):
+            if attribute in state:
+                state["_" + attribute] = state.pop(attribute)
+        self.__dict__.update(state)
+
     def save(self):
         """Save the script."""
         if self.playtest:
-            with open(
-                "resources/playtest/scripts/" + self.name + ".pckl", "wb"
-            ) as file:
-                dump(self, file)
+            save_pickle(PLAYTEST_SCRIPTS + self.name + ".pckl", self)
         else:
-            with open(
-                "resources/basegame/scripts/" + self.name + ".pckl", "wb"
-            ) as file:
-                dump(self, file)
+            save_pickle(BASEGAME_SCRIPTS + self.name + ".pckl", self)
 
     # noinspection PyTypeChecker
     # this is bugged with the combination of property and classmethod decorators
@@ -174,51 +248,51 @@ def script_list(
     yield Script(
         "Trouble Brewing",
         [
-            characters.Investigator,
-            characters.Chef,
-            characters.Washerwoman,
-            characters.Librarian,
-            characters.Empath,
-            characters.FortuneTeller,
-            characters.Undertaker,
-            characters.Monk,
-            characters.Slayer,
-            characters.Soldier,
-            characters.Ravenkeeper,
-            characters.Virgin,
-            characters.Mayor,
-            characters.Butler,
-            characters.Saint,
-            characters.Recluse,
-            characters.Drunk,
-            characters.Poisoner,
-            characters.Spy,
-            characters.Baron,
-            characters.ScarletWoman,
-            characters.Imp,
+            "Investigator",
+            "Chef",
+            "Washerwoman",
+            "Librarian",
+            "Empath",
+            "FortuneTeller",
+            "Undertaker",
+            "Monk",
+            "Slayer",
+            "Soldier",
+            "Ravenkeeper",
+            "Virgin",
+            "Mayor",
+            "Butler",
+            "Saint",
+            "Recluse",
+            "Drunk",
+            "Poisoner",
+            "Spy",
+            "Baron",
+            "ScarletWoman",
+            "Imp",
         ],
         first_night=[
-            characters.Poisoner,
-            characters.Washerwoman,
-            characters.Librarian,
-            characters.Chef,
-            characters.Investigator,
-            characters.Empath,
-            characters.FortuneTeller,
-            characters.Butler,
-            characters.Spy,
+            "Poisoner",
+            "Washerwoman",
+            "Librarian",
+            "Chef",
+            "Investigator",
+            "Empath",
+            "FortuneTeller",
+            "Butler",
+            "Spy",
         ],
         other_nights=[
-            characters.Poisoner,
-            characters.Monk,
-            characters.ScarletWoman,
-            characters.Imp,
-            characters.Ravenkeeper,
-            characters.Empath,
-            characters.FortuneTeller,
-            characters.Butler,
-            characters.Undertaker,
-            characters.Spy,
+            "Poisoner",
+            "Monk",
+            "ScarletWoman",
+            "Imp",
+            "Ravenkeeper",
+            "Empath",
+            "FortuneTeller",
+            "Butler",
+            "Undertaker",
+            "Spy",
         ],
         aliases=["TB"],
         editors=[],
@@ -227,63 +301,63 @@ def script_list(
     yield Script(
         "Bad Moon Rising",
         [
-            characters.Grandmother,
-            characters.Sailor,
-            characters.Chambermaid,
-            characters.Innkeeper,
-            characters.Gambler,
-            characters.Exorcist,
-            characters.Gossip,
-            characters.Courtier,
-            characters.Professor,
-            characters.Fool,
-            characters.Pacifist,
-            characters.TeaLady,
-            characters.Minstrel,
-            characters.Tinker,
-            characters.Moonchild,
-            characters.Goon,
-            characters.Lunatic,
-            characters.Godfather,
-            characters.DevilSAdvocate,
-            characters.Assassin,
-            characters.Mastermind,
-            characters.Pukka,
-            characters.Shabaloth,
-            characters.Po,
-            characters.Zombuul,
+            "Grandmother",
+            "Sailor",
+            "Chambermaid",
+            "Innkeeper",
+            "Gambler",
+            "Exorcist",
+            "Gossip",
+            "Courtier",
+            "Professor",
+            "Fool",
+            "Pacifist",
+            "TeaLady",
+            "Minstrel",
+            "Tinker",
+            "Moonchild",
+            "Goon",
+            "Lunatic",
+            "Godfather",
+            "DevilSAdvocate",
+            "Assassin",
+            "Mastermind",
+            "Pukka",
+            "Shabaloth",
+            "Po",
+            "Zombuul",
         ],
         first_night=[
-            characters.Lunatic,
-            characters.Sailor,
-            characters.Courtier,
-            characters.Godfather,
-            characters.DevilSAdvocate,
-            characters.Pukka,
-            characters.Grandmother,
-            characters.Chambermaid,
-            characters.Goon,
+            "Lunatic",
+            "Sailor",
+            "Courtier",
+            "Godfather",
+            "DevilSAdvocate",
+            "Pukka",
+            "Grandmother",
+            "Chambermaid",
+            "Goon",
         ],
         other_nights=[
-            characters.Sailor,
-            characters.Innkeeper,
-            characters.Courtier,
-            characters.DevilSAdvocate,
-            characters.Gambler,
-            characters.Exorcist,
-            characters.Lunatic,
-            characters.Zombuul,
-            characters.Pukka,
-            characters.Shabaloth,
-            characters.Po,
-            characters.Assassin,
-            characters.Gossip,
-            characters.Tinker,
-            characters.Moonchild,
-            characters.Godfather,
-            characters.Professor,
-            characters.Chambermaid,
-            characters.Goon,
+            "Sailor",
+            "Innkeeper",
+            "Courtier",
+            "DevilSAdvocate",
+            "Gambler",
+            "Exorcist",
+            "Lunatic",
+            "Zombuul",
+            "Pukka",
+            "Shabaloth",
+            "Po",
+            "Assassin",
+            "Gossip",
+            "Tinker",
+            "Moonchild",
+            "Godfather",
+            "Professor",
+            "Chambermaid",
+            "Goon",
         ],
         aliases=["BMR"],
         editors=[],
@@ -292,77 +366,89 @@ def script_list(
     yield Script(
         "Sects & Violets",
         [
-            characters.Clockmaker,
-            characters.Dreamer,
-            characters.SnakeCharmer,
-            characters.Mathematician,
-            characters.Flowergirl,
-            characters.TownCrier,
-            characters.Oracle,
-            characters.Savant,
-            characters.Artist,
-            characters.Seamstress,
-            characters.Philosopher,
-            characters.Juggler,
-            characters.Sage,
-            characters.Sweetheart,
-            characters.Mutant,
-            characters.Barber,
-            characters.Klutz,
-            characters.EvilTwin,
-            characters.Witch,
-            characters.Cerenovus,
-            characters.PitHag,
-            characters.NoDashii,
-            characters.Vigormortis,
-            characters.FangGu,
-            characters.Vortox,
+            "Clockmaker",
+            "Dreamer",
+            "SnakeCharmer",
+            "Mathematician",
+            "Flowergirl",
+            "TownCrier",
+            "Oracle",
+            "Savant",
+            "Artist",
+            "Seamstress",
+            "Philosopher",
+            "Juggler",
+            "Sage",
+            "Sweetheart",
+            "Mutant",
+            "Barber",
+            "Klutz",
+            "EvilTwin",
+            "Witch",
+            "Cerenovus",
+            "PitHag",
+            "NoDashii",
+            "Vigormortis",
+            "FangGu",
+            "Vortox",
         ],
         first_night=[
-            characters.Philosopher,
-            characters.SnakeCharmer,
-            characters.EvilTwin,
-            characters.Witch,
-            characters.Cerenovus,
-            characters.Clockmaker,
-            characters.Dreamer,
-            characters.Seamstress,
-            characters.Mathematician,
+            "Philosopher",
+            "SnakeCharmer",
+            "EvilTwin",
+            "Witch",
+            "Cerenovus",
+            "Clockmaker",
+            "Dreamer",
+            "Seamstress",
+            "Mathematician",
         ],
         other_nights=[
-            characters.Philosopher,
-            characters.SnakeCharmer,
-            characters.Witch,
-            characters.Cerenovus,
-            characters.PitHag,
-            characters.FangGu,
-            characters.NoDashii,
-            characters.Vortox,
-            characters.Vigormortis,
-            characters.Barber,
-            characters.Sage,
-            characters.Dreamer,
-            characters.Seamstress,
-            characters.Flowergirl,
-            characters.TownCrier,
-            characters.Oracle,
-            characters.Juggler,
-            characters.Mathematician,
+            "Philosopher",
+            "SnakeCharmer",
+            "Witch",
+            "Cerenovus",
+            "PitHag",
+            "FangGu",
+            "NoDashii",
+            "Vortox",
+            "Vigormortis",
+            "Barber",
+            "Sage",
+            "Dreamer",
+            "Seamstress",
+            "Flowergirl",
+            "TownCrier",
+            "Oracle",
+            "Juggler",
+            "Mathematician",
         ],
         aliases=["Sects and Violets", "SV", "S&V", "SnV"],
         editors=[],
     )
 
     # get custom scripts from resources
-    for filename in listdir("resources/basegame/scripts/"):
-        if filename.endswith(".pckl"):
-            with open("resources/basegame/scripts/" + filename, "rb") as file:
-                script: Script = load(file)
-                yield script
+    yield from _load_scripts(BASEGAME_SCRIPTS)
 
     if playtest:
-        for filename in listdir("resources/playtest/scripts/"):
-            if filename.endswith(".pckl"):
-                with open("resources/playtest/scripts/" + filename, "rb") as file:
-                    playtest_script: Script = load(file)
-                    yield playtest_script
+        yield from _load_scripts(PLAYTEST_SCRIPTS)
+
+
+def script_paths(directory: str) -> List[str]:
+    """Find the files of all custom scripts saved in directory."""
+    return [
+        directory + filename
+        for filename in listdir(directory)
+        if filename.endswith(".pckl")
+    ]
+
+
+def _load_scripts(directory: str) -> Generator[Script, None, None]:
+    """Load all custom scripts saved in directory.
+
+    Scripts are cached by lib.utils.load_pickle, so this only unpickles new or changed
+    files.
+    """
+    for path in script_paths(directory):
+        script: Script = load_pickle(path)
+        yield script
@@ -3,6 +3,7 @@
 from typing import TYPE_CHECKING, Dict, List
 
 from lib.preferences import load_preferences
+from lib.sending import VOTE
 from lib.utils import get_bool_input, list_to_plural_string, safe_send
 
 if TYPE_CHECKING:
@@ -82,16 +83,8 @@ class Vote:
         if self.traveler:
             self.majority = float(len(self.order) / 2)
         else:
-            self.majority = float(
-                len(
-                    [
-                        player
-                        for player in self.order
-                        if not player.ghost(game, registers=True)
-                    ]
-                )
-                / 2
-            )
+            # the order is the seating order, rotated
+            self.majority = float(game.derived.majority_base / 2)
             if game.current_day.about_to_die:
                 self.majority = max(
                     self.majority, float(game.current_day.about_to_die[1] + 1)
@@ -162,11 +155,10 @@ class Vote:
     async def call_next(self, ctx: "VoteContext"):
         """Call the next voter."""
         # check dead votes
-        if not self.to_vote.can_vote(ctx.bot.game, self.traveler):
-            await self.vote(ctx, self.to_vote, 0)
-            return await safe_send(
-                self.to_vote.member, "You have no dead votes. Voting no."
-            )
+        voter = self.to_vote
+        if not voter.can_vote(ctx.bot.game, self.traveler):
+            await self.vote(ctx, voter, 0)
+            return await safe_send(voter.member, "You have no dead votes. Voting no.")
 
         # check prevote
         if self.to_vote in self.prevotes:
@@ -176,6 +168,7 @@ class Vote:
         await safe_send(
             ctx.bot.channel,
             f"{self.to_vote.member.mention}, your vote on {self.nominee.nick}.",
+            priority=VOTE,
         )
 
         # TODO: emergency vote processing
@@ -0,0 +1,71 @@
+"""Contains the ActivityTracker class, for tracking who has spoken today."""
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+if TYPE_CHECKING:
+    from lib.logic.Game import Game
+    from lib.logic.Player import Player
+
+
+class ActivityTracker:
+    """Tracks the players who have yet to speak today, updating incrementally.
+
+    The tracker is built from the players' has_spoken flags, and is only valid for the
+    day and seating order it was built with; Game.activity rebuilds it when either
+    changes. After that, marking a player active is a set removal, and checking one who
+    has already spoken is a set lookup.
+
+    Parameters
+    ----------
+    game : Game
+        The game to track.
+    """
+
+    def __init__(self, game: "Game"):
+        self._day = game.current_day
+        self._order = game.seating_order
+        self._size = len(game.seating_order)
+        self._players = {
+            player.member.id: player for player in game.seating_order
+        }  # type: Dict[int, Player]
+        self._not_active = {
+            idn for idn, player in self._players.items() if not player.has_spoken
+        }  # type: Set[int]
+
+    def tracks(self, game: "Game") -> bool:
+        """Determine whether the tracker is still valid for the game."""
+        return (
+            self._day is game.current_day
+            and self._order is game.seating_order
+            and self._size == len(game.seating_order)
+        )
+
+    def __len__(self) -> int:
+        """Determine the number of players yet to speak."""
+        return len(self._not_active)
+
+    def speak(self, idn: int) -> bool:
+        """Mark the player with the ID as having spoken.
+
+        Returns whether this changed anything; that is, whether the ID is a player's who
+        hadn't yet spoken.
+        """
+        if idn not in self._not_active:
+            return False
+        self._not_active.remove(idn)
+        self._players[idn].has_spoken = True
+        return True
+
+    def last(self) -> Optional["Player"]:
+        """Determine the only player yet to speak, or None if there isn't just one."""
+        if len(self._not_active) != 1:
+            return None
+        return self._players[next(iter(self._not_active))]
+
+    def not_active(self) -> List["Player"]:
+        """Determine the players yet to speak, in seating order."""
+        return [
+            player
+            for player in self._order
+            if player.member.id in self._not_active
+        ]
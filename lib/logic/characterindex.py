@@ -0,0 +1,164 @@
+"""Contains the CharacterIndex class, for fast and forgiving character lookups."""
+
+import re
+from difflib import SequenceMatcher
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set, Type
+
+if TYPE_CHECKING:
+    from lib.logic.Character import Character
+
+# matches everything that isn't a lowercase letter or a digit
+_IGNORED = re.compile(r"[^a-z0-9]")
+
+# the maximum number of deletions to index for typo suggestions
+_MAX_EDIT_DISTANCE = 2
+
+# the minimum similarity ratio for a name to be suggested
+_SUGGESTION_CUTOFF = 0.6
+
+# alternate names and misspellings people commonly use, mapped to class names
+_MISSPELLINGS = {
+    "da": "DevilSAdvocate",
+    "devils advocate": "DevilSAdvocate",
+    "ft": "FortuneTeller",
+    "fortune teler": "FortuneTeller",
+    "ww": "Washerwoman",
+    "washer woman": "Washerwoman",
+    "rk": "Ravenkeeper",
+    "raven keeper": "Ravenkeeper",
+    "sw": "ScarletWoman",
+    "scarlett woman": "ScarletWoman",
+    "pit hag": "PitHag",
+    "snake charmer": "SnakeCharmer",
+    "nodashi": "NoDashii",
+    "no dashi": "NoDashii",
+    "fanggu": "FangGu",
+    "vigormortus": "Vigormortis",
+    "vig": "Vigormortis",
+    "shabalath": "Shabaloth",
+    "zombull": "Zombuul",
+    "mathmatician": "Mathematician",
+    "chamber maid": "Chambermaid",
+    "inn keeper": "Innkeeper",
+    "tea lady": "TeaLady",
+    "town crier": "TownCrier",
+    "evil twin": "EvilTwin",
+    "grandma": "Grandmother",
+    "under taker": "Undertaker",
+}
+
+
+def normalize(text: str) -> str:
+    """Normalize a character name for lookup.
+
+    Lowercases the text and strips everything but letters and digits, so "Pit-Hag",
+    "pit hag", "PitHag", and the script creator's "pithag" are all equivalent.
+    """
+    return _IGNORED.sub("", text.lower())
+
+
+def _deletes(key: str, distance: int = _MAX_EDIT_DISTANCE) -> Set[str]:
+    """Generate every string reachable from key by deleting up to distance letters."""
+    out = {key}
+    frontier = {key}
+    for _ in range(distance):
+        frontier = {
+            word[:i] + word[i + 1 :] for word in frontier for i in range(len(word))
+        }
+        out |= frontier
+    return out
+
+
+class CharacterIndex:
+    """Maps normalized character names to character classes.
+
+    The index is built once, so lookups are a single dictionary access regardless of
+    the number of characters. Typo suggestions use a symmetric-deletion index, so they
+    only compare against names which share a deletion variant with the input.
+
+    Parameters
+    ----------
+    names : Dict[str, str]
+        The indexed characters' class names, mapped to their display names.
+    resolve : Callable[[str], Type[Character]]
+        A function returning the character class with a given class name.
+
+    Attributes
+    ----------
+    names : Dict[str, str]
+        The indexed characters' class names, mapped to their display names.
+    """
+
+    def __init__(
+        self, names: Dict[str, str], resolve: Callable[[str], Type["Character"]]
+    ):
+        self.names = names
+        self._resolve = resolve
+        self._keys = {}  # type: Dict[str, str]
+        self._deletes = {}  # type: Dict[str, Set[str]]
+
+        for class_name, display_name in names.items():
+            self._add(class_name, class_name)
+            self._add(display_name, class_name)
+
+        for alias, class_name in _MISSPELLINGS.items():
+            if class_name in names:
+                self._add(alias, class_name)
+
+    @classmethod
+    def from_classes(cls, characters: Iterable[Type["Character"]]) -> "CharacterIndex":
+        """Build an index over a collection of already-imported character classes."""
+        classes = {character.__name__: character for character in characters}
+        return cls(
+            {name: character.name for name, character in classes.items()},
+            classes.__getitem__,
+        )
+
+    def _add(self, name: str, class_name: str):
+        """Index name, and its deletion variants, as referring to class_name."""
+        key = normalize(name)
+        if not key:
+            return
+        self._keys.setdefault(key, class_name)
+        for variant in _deletes(key):
+            self._deletes.setdefault(variant, set()).add(key)
+
+    def __contains__(self, character: Type["Character"]) -> bool:
+        """Determine whether the character class is indexed."""
+        return character.__name__ in self.names and (
+            self._resolve(character.__name__) is character
+        )
+
+    def __len__(self) -> int:
+        """Determine the number of indexed characters."""
+        return len(self.names)
+
+    def get(self, text: str) -> Optional[Type["Character"]]:
+        """Find the character class matching text, or None."""
+        class_name = self._keys.get(normalize(text))
+        if class_name is None:
+            return None
+        return self._resolve(class_name)
+
+    def suggestions(self, text: str, n: int = 3) -> List[str]:
+        """Suggest up to n display names of characters text is likely a typo of."""
+        key = normalize(text)
+        candidates = set()  # type: Set[str]
+        for variant in _deletes(key):
+            candidates |= self._deletes.get(variant, set())
+
+        # rank the candidates by similarity, then collapse keys to unique characters
+        scored = [
+            (SequenceMatcher(None, key, candidate).ratio(), candidate)
+            for candidate in candidates
+        ]
+        out = []  # type: List[str]
+        for ratio, candidate in sorted(scored, reverse=True):
+            if ratio < _SUGGESTION_CUTOFF:
+                break
+            display_name = self.names[self._keys[candidate]]
+            if display_name not in out:
+                out.append(display_name)
+            if len(out) == n:
+                break
+        return out
@@ -211,34 +211,36 @@ def class_decorator_factory(func_name):
     return wrapper_func_getter
 
 
-@class_decorator_factory("evening_cleanup")
-def evening_delete(*args):
+def _expiry_decorator(expires, attributes):
+    """Create a class decorator setting when an effect expires, and other attributes.
+
+    The game's PhaseScheduler deletes the effect at the right phase.
+    """
+
+    def class_decorator(cls):
+        """Get the class to decorate."""
+        cls.expires = expires
+        for attribute in attributes:
+            setattr(cls, attribute[0], attribute[1])
+        return cls
+
+    return class_decorator
+
+
+def evening_delete(*attributes):
     """Delete the wrapped effect at the end of the day.
 
-    Should be called with a "days" attribute; deletes after that many days.
+    Can be called with a "days" attribute; deletes at the end of that many days.
     """
-    try:
-        if args[0].days == 1:
-            args[0].delete(args[1])
-        else:
-            args[0].days -= 1
-    except AttributeError:  # if days is not set
-        args[0].delete(args[1])
+    return _expiry_decorator("evening", attributes)
 
 
-@class_decorator_factory("morning_cleanup")
-def morning_delete(*args):
+def morning_delete(*attributes):
     """Delete the wrapped effect at the start of the day.
 
-    Should be called with a "days" attribute; deletes after that many days.
+    Can be called with a "days" attribute; deletes at the start of that many days.
     """
-    try:
-        if args[0].days == 1:
-            args[0].delete(args[1])
-        else:
-            args[0].days -= 1
-    except AttributeError:  # if days is not set
-        args[0].delete(args[1])
+    return _expiry_decorator("morning", attributes)
 
 
 @class_decorator_factory("source_drunkpoisoned_cleanup")
@@ -328,6 +330,8 @@ async def add_targeted_effect(
         f"Who did {character.parent.formatted_epithet(epithet_string)}, {verb}?",
         condition=condition,
     )
+    if target is None:
+        return [], []
     effect_object = target.add_effect(ctx.bot.game, effect, character.parent)
     if not enabled:
         effect_object.disable(ctx.bot.game)
@@ -385,7 +389,9 @@ class MorningTargetCallMixin(Character):
     _OPTIONAL_TARGETER = False
 
     @if_functioning(True)
-    async def morning_call(self, ctx: "GameContext"):
+    async def morning_call(
+        self, ctx: "GameContext", enabled=True, epithet_string=""
+    ) -> str:
         """Determine the morning call."""
         condition = self._MORNING_CONDITION_STRING
         if condition:
@@ -402,7 +408,10 @@ class MorningTargetCallMixin(Character):
             number_word = str(self._TARGETS)
         target_string = f"{number_word} {condition}player{plural}{optional}"
 
-        return f"Ask {self.parent.epithet}, to choose {target_string}."
+        return (
+            f"Ask {self.parent.formatted_epithet(epithet_string)}, "
+            f"to choose {target_string}."
+        )
 
 
 class MorningTargeterMixin(MorningTargetCallMixin, ABC):
@@ -1,11 +1,14 @@
 """Contains several pseudo-converters for coercing strings to custom types."""
 
+from types import ModuleType
 from typing import TYPE_CHECKING, List, Optional, Type
 
 from discord.ext import commands
 
+from lib.actor import get_actor
+from lib.logic.Character import Character
+from lib.logic.characterindex import CharacterIndex
 from lib.logic.Script import script_list
-from lib.utils import str_cleanup
 from resources.basegame import characters
 
 try:
@@ -16,16 +19,47 @@ except ImportError:
 
 if TYPE_CHECKING:
     from lib.logic.Script import Script
-    from lib.logic.Character import Character
     from lib.typings.context import Context
 
 
+def _index_module(module: ModuleType) -> CharacterIndex:
+    """Build a character index over every character exported by module.
+
+    Lazily loaded packages are indexed from their registry, without importing anything.
+    """
+    try:
+        names = dict(module.REGISTRY)
+    except AttributeError:
+        names = {
+            name: value.name
+            for name, value in vars(module).items()
+            if isinstance(value, type) and issubclass(value, Character)
+        }
+    return CharacterIndex(names, lambda name: getattr(module, name))
+
+
+# built once at load time; to_character is called once per line of user input
+BASEGAME_INDEX = _index_module(characters)
+PLAYTEST_INDEX = (
+    _index_module(playtestcharacters) if playtestcharacters is not None else None
+)
+
+
+def _not_found(message: str, index: CharacterIndex, argument: str) -> str:
+    """Add typo suggestions from index to a character not found message."""
+    suggestions = index.suggestions(argument)
+    if suggestions:
+        message += " Did you mean " + " or ".join(suggestions) + "?"
+    return message
+
+
 def to_character(
     ctx: "Context", argument: str, script: Optional["Script"] = None
 ) -> Type["Character"]:
     """Convert a string to a Character class with a matching name.
 
-    The string must be an exact match, except capitalization and special characters.
+    The string must be an exact match, except capitalization and special characters,
+    or one of a few common alternate names or misspellings.
 
     Parameters
     ----------
@@ -41,44 +75,41 @@ def to_character(
     Type["Character"]
         The matching character class.
     """
-    text = str_cleanup(argument)
-
     if script:
-        character: Type["Character"]
-        for character in script.character_list:
-            if text == character.__name__:
-                return character
-        raise commands.BadArgument(
-            f'Character "{argument}" not found on the script {script.name}.'
-        )
+        character = script.character_index.get(argument)
+        if character is None:
+            raise commands.BadArgument(
+                _not_found(
+                    f'Character "{argument}" not found on the script {script.name}.',
+                    script.character_index,
+                    argument,
+                )
+            )
+        return character
 
-    try:
-        return getattr(characters, text)
-    except AttributeError:
-        if (
-            ctx.bot.playtest_role
-            in ctx.bot.server.get_member(ctx.message.author.id).roles
-        ):
-            try:
-                character = getattr(playtestcharacters, text)
-                if ctx.bot.playtest:
-                    raise commands.BadArgument(
-                        "Playtest characters are not enabled on this bot."
-                    )
-                return character
-            except AttributeError:
-                pass
-        raise commands.BadArgument(f'Character "{argument}" not found.')
+    character = BASEGAME_INDEX.get(argument)
+    if character is not None:
+        return character
+
+    if PLAYTEST_INDEX is not None and get_actor(ctx).is_playtester:
+        character = PLAYTEST_INDEX.get(argument)
+        if character is not None:
+            if not ctx.bot.playtest:
+                raise commands.BadArgument(
+                    "Playtest characters are not enabled on this bot."
+                )
+            return character
+
+    raise commands.BadArgument(
+        _not_found(f'Character "{argument}" not found.', BASEGAME_INDEX, argument)
+    )
 
 
 def to_character_list(
     ctx: "Context", arguments: List[str], script: Optional["Script"] = None
 ) -> List[Type["Character"]]:
     """Convert a list of strings into characters with corresponding names."""
-    out = []  # type: List[Type[Character]]
-    for character in arguments:
-        out.append(to_character(ctx, character, script))
-    return out
+    return [to_character(ctx, character, script) for character in arguments]
 
 
 def to_script(ctx: "Context", argument: str) -> "Script":
@@ -100,8 +131,7 @@ def to_script(ctx: "Context", argument: str) -> "Script":
     """
     for script in script_list(
         ctx,
-        playtest=ctx.bot.playtest_role
-        in ctx.bot.server.get_member(ctx.message.author.id).roles,
+        playtest=get_actor(ctx).is_playtester,
     ):
         if argument.lower() in script.name.lower() or argument.lower() in [
             x.lower() for x in script.aliases
@@ -0,0 +1,89 @@
+"""Contains the DerivedState class, caching who has which status."""
+
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Tuple
+
+if TYPE_CHECKING:
+    from lib.logic.Game import Game
+    from lib.logic.Player import Player
+
+
+class DerivedState:
+    """Caches which players have each status, until effects or seating change.
+
+    Each status is computed for the whole seating order the first time it's asked
+    for, so later checks are set lookups rather than walks over the players' effects.
+    Game.derived discards the cache at each dawn and dusk and whenever the seating
+    order changes, and Game.changed discards it when an effect is turned on or off.
+
+    Parameters
+    ----------
+    game : Game
+        The game to cache.
+    """
+
+    def __init__(self, game: "Game"):
+        self._game = game
+        self._phase = game.phase
+        self._order = game.seating_order
+        self._size = len(game.seating_order)
+        self._statuses = {}  # type: Dict[Tuple[str, bool], List[Player]]
+        self._ids = {}  # type: Dict[Tuple[str, bool], FrozenSet[int]]
+
+    def tracks(self, game: "Game") -> bool:
+        """Determine whether the cache is still valid for the game."""
+        return (
+            self._phase == game.phase
+            and self._order is game.seating_order
+            and self._size == len(game.seating_order)
+        )
+
+    def with_status(self, status_name: str, registers: bool = False) -> List["Player"]:
+        """Determine the players with (or registering as) a status, in seating order."""
+        key = (status_name, registers)
+        try:
+            return self._statuses[key]
+        except KeyError:
+            players = self._statuses[key] = [
+                player
+                for player in self._order
+                if player.is_status(self._game, status_name, registers)
+            ]
+            self._ids[key] = frozenset(id(player) for player in players)
+            return players
+
+    def has_status(
+        self, player: "Player", status_name: str, registers: bool = False
+    ) -> bool:
+        """Determine whether a player has (or registers as) a status.
+
+        Players outside the seating order, like storytellers, are checked directly.
+        """
+        key = (status_name, registers)
+        if key not in self._ids:
+            self.with_status(status_name, registers)
+        if id(player) in self._ids[key]:
+            return True
+        if any(x is player for x in self._order):
+            return False
+        return player.is_status(self._game, status_name, registers)
+
+    @property
+    def alive(self) -> List["Player"]:
+        """Determine the living players, in seating order."""
+        dead = self._dead_ids(False)
+        return [player for player in self._order if id(player) not in dead]
+
+    @property
+    def dead(self) -> List["Player"]:
+        """Determine the dead players, in seating order."""
+        return self.with_status("dead")
+
+    @property
+    def majority_base(self) -> int:
+        """Determine the number of players registering as alive, for majorities."""
+        return self._size - len(self._dead_ids(True))
+
+    def _dead_ids(self, registers: bool) -> FrozenSet[int]:
+        """Determine the IDs of the players who are (or register as) dead."""
+        self.with_status("dead", registers)
+        return self._ids["dead", registers]
@@ -0,0 +1,45 @@
+"""Contains the hook registry, recording which classes override which hooks.
+
+Character and Effect define their hooks, like nomination and morning_cleanup, as
+no-ops marked with default_hook, and nearly every subclass keeps them. Dispatching
+through subscribed skips those objects, rather than calling or awaiting the no-op.
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, Tuple, TypeVar
+
+_T = TypeVar("_T")
+_F = TypeVar("_F", bound=Callable)
+
+# (class, hook name): whether the class overrides the hook
+_OVERRIDES = {}  # type: Dict[Tuple[type, str], bool]
+
+
+def default_hook(func: _F) -> _F:
+    """Mark a base class's no-op hook, so classes which don't override it are skipped.
+
+    Apply beneath staticmethod, if both are used.
+    """
+    func.default_hook = True  # type: ignore
+    return func
+
+
+def overrides(cls: type, hook: str) -> bool:
+    """Determine whether a class overrides a hook, caching the result per class.
+
+    Classes are decorated as they're defined, so this is fixed by the time any
+    instance exists.
+    """
+    try:
+        return _OVERRIDES[cls, hook]
+    except KeyError:
+        out = _OVERRIDES[cls, hook] = not getattr(
+            getattr(cls, hook), "default_hook", False
+        )
+        return out
+
+
+def subscribed(objects: Iterable[_T], hook: str) -> Iterator[_T]:
+    """Yield the objects whose classes override a hook."""
+    for obj in objects:
+        if overrides(type(obj), hook):
+            yield obj
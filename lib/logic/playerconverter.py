@@ -86,7 +86,7 @@ async def to_member(
         message_text += "\n({i}). ".format(i=possibilities.index(person) + 1)
         if (
             ctx.bot.game and person in ctx.bot.game.storytellers
-        ) or person in ctx.bot.storyteller_role.members:
+        ) or ctx.bot.role_index.has(ctx.bot.storyteller_role, person):
             message_text += "**[ST]** "
         message_text += f"{load_preferences(person).nick}"
 
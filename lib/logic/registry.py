@@ -0,0 +1,75 @@
+"""Contains the lazy character package loader.
+
+Nothing here may import a character implementation, or anything that imports discord,
+since the registry is read at startup before any character module is loaded.
+"""
+
+from importlib import import_module
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Type
+
+if TYPE_CHECKING:
+    from lib.logic.Character import Character
+
+
+class LazyCharacterPackage(ModuleType):
+    """A character package which imports each of its characters on first use.
+
+    Each character lives in a module of the same name in the package. A package opts in
+    by defining REGISTRY and then replacing its module class:
+    sys.modules[__name__].__class__ = LazyCharacterPackage
+
+    Attributes
+    ----------
+    REGISTRY : Dict[str, str]
+        The package's characters' class names, mapped to their display names.
+    """
+
+    REGISTRY: Dict[str, str]
+
+    def resolve(self, class_name: str) -> Type["Character"]:
+        """Find the character class with class_name, importing it if necessary."""
+        try:
+            return self.__dict__[class_name]
+        except KeyError:
+            pass
+
+        if class_name not in self.REGISTRY:
+            raise AttributeError(
+                f"module {self.__name__!r} has no attribute {class_name!r}"
+            )
+
+        module = import_module(f"{self.__name__}.{class_name}")
+        character = getattr(module, class_name)
+        super().__setattr__(class_name, character)
+        return character
+
+    def __getattr__(self, name: str) -> Type["Character"]:
+        """Import characters on first attribute access."""
+        return self.resolve(name)
+
+    def __setattr__(self, name: str, value: Any):
+        """Bind character classes, rather than their modules, to the package.
+
+        The import system binds each submodule to its package once it's loaded, for
+        instance when dill imports a character while restoring a backup.
+        """
+        if isinstance(value, ModuleType) and name in self.REGISTRY:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+    def __dir__(self) -> List[str]:
+        """List the package's attributes, including characters which aren't loaded."""
+        return sorted(set(self.__dict__) | set(self.REGISTRY))
+
+
+def resolve_all(
+    characters: List[Any], resolve: Callable[[str], Type["Character"]]
+) -> List[Type["Character"]]:
+    """Resolve any class names in a list of characters to classes."""
+    if all(isinstance(character, type) for character in characters):
+        return characters
+    return [
+        resolve(character) if isinstance(character, str) else character
+        for character in characters
+    ]
@@ -0,0 +1,90 @@
+"""Contains the PhaseScheduler class, for running effects' dawn and dusk cleanups."""
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+from lib.logic.Effect import Effect
+from lib.logic.hooks import overrides
+
+if TYPE_CHECKING:
+    from lib.logic.Game import Game
+    from lib.logic.Player import Player
+
+# the kinds of phase transition, and the parity of their phase numbers
+# dawn of day n is phase 2n - 1, and dusk of day n is phase 2n
+MORNING = "morning"
+EVENING = "evening"
+_PARITY = {MORNING: 1, EVENING: 0}
+
+# the Effect methods called at each kind of transition, if an effect overrides them
+_HOOKS = {MORNING: "morning_cleanup", EVENING: "evening_cleanup"}
+
+
+class PhaseScheduler:
+    """Runs effects' cleanups at the dawns and dusks they're due, as a timing wheel.
+
+    Each effect is scheduled when it's added: its expiry at the phase it expires, and
+    its cleanup methods, if it overrides any, at the next phase of their kind. A
+    transition then only touches the effects due at it, rather than every effect in
+    the game. Effects deleted early are skipped when their phase comes.
+
+    Parameters
+    ----------
+    phase : int
+        The number of dawns and dusks the game has already had.
+    """
+
+    def __init__(self, phase: int):
+        self._phase = phase
+        self._wheel = {}  # type: Dict[int, List[Tuple[Effect, str]]]
+
+    @classmethod
+    def for_players(cls, phase: int, players: Iterable["Player"]) -> "PhaseScheduler":
+        """Build a scheduler for effects the players already have."""
+        scheduler = cls(phase)
+        for player in players:
+            scheduler.add_player(player)
+        return scheduler
+
+    def __len__(self) -> int:
+        """Determine the number of scheduled calls."""
+        return sum(len(calls) for calls in self._wheel.values())
+
+    def next_phase(self, kind: str, count: int = 1) -> int:
+        """Determine the phase number of the count-th next dawn or dusk."""
+        first = self._phase + 1
+        if first % 2 != _PARITY[kind]:
+            first += 1
+        return first + 2 * (count - 1)
+
+    def add(self, effect: Effect):
+        """Schedule a new effect's expiry and cleanups."""
+        if effect.expires is not None:
+            self._schedule(
+                self.next_phase(effect.expires, getattr(effect, "days", 1)),
+                effect,
+                "delete",
+            )
+        for kind, hook in _HOOKS.items():
+            if overrides(type(effect), hook):
+                self._schedule(self.next_phase(kind), effect, hook)
+
+    def add_player(self, player: "Player"):
+        """Schedule every effect a player has, such as a new traveler's defaults."""
+        for effect in player.effects:
+            self.add(effect)
+
+    def run(self, game: "Game", kind: str):
+        """Pass the next dawn or dusk, running the effects due at it."""
+        self._phase = self.next_phase(kind)
+        for effect, hook in self._wheel.pop(self._phase, []):
+            if not any(x is effect for x in effect.affected_player.effects):
+                continue  # deleted already
+            if hook == "delete":
+                effect.delete(game)
+            else:
+                getattr(effect, hook)(game)
+                self._schedule(self.next_phase(kind), effect, hook)
+
+    def _schedule(self, phase: int, effect: Effect, hook: str):
+        """Schedule a call to one of an effect's methods."""
+        self._wheel.setdefault(phase, []).append((effect, hook))
@@ -1,10 +1,12 @@
 """Contains the preferences class and load_preferences funciton."""
 
+from copy import deepcopy
 from typing import Dict, Tuple, Optional, Union, TYPE_CHECKING
 
-from dill import load, dump
 from discord import Member
 
+from lib.utils import load_pickle, save_pickle
+
 if TYPE_CHECKING:
     from lib.logic.Player import Player
 
@@ -55,8 +57,7 @@ class Preferences:
 
     def save_preferences(self):
         """Save preferences."""
-        with open("resources/preferences/" + str(self.id) + ".pckl", "wb") as file:
-            dump(self, file)
+        save_pickle(_preferences_path(self.id), self)
 
     def get_emergency_vote(self, bot_id: int) -> Tuple[int, Optional[int]]:
         """Generate the (potentially bot-specific) emergency vote.
@@ -77,6 +78,11 @@ class Preferences:
             return self.emergency_vote
 
 
+def _preferences_path(idn: int) -> str:
+    """Determine the file storing a member's preferences."""
+    return "resources/preferences/" + str(idn) + ".pckl"
+
+
 def load_preferences(member: Union["Player", Member]) -> Preferences:
     """Load a member's preferences.
 
@@ -89,9 +95,29 @@ def load_preferences(member: Union["Player", Member]) -> Preferences:
     -------
     Preferences
         The member's preferences.
+
+    Notes
+    -----
+    Loaded preferences are cached in memory until the file changes, and shared
+    between callers, so they're read-only; use edit_preferences to change them.
     """
     try:
-        with open("resources/preferences/" + str(member.id) + ".pckl", "rb") as file:
-            return load(file)
+        return load_pickle(_preferences_path(member.id))
     except FileNotFoundError:
         return Preferences(member)
+
+
+def edit_preferences(member: Union["Player", Member]) -> Preferences:
+    """Load a copy of a member's preferences, to change and then save.
+
+    Parameters
+    ----------
+    member : Union[Player, Member]
+        The preferences to load.
+
+    Returns
+    -------
+    Preferences
+        A copy of the member's preferences, unshared until it's saved.
+    """
+    return deepcopy(load_preferences(member))
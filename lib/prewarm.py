@@ -0,0 +1,138 @@
+"""Contains the prewarm coroutine, for loading caches at startup."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from os import listdir
+from os.path import isdir, isfile
+from time import perf_counter
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List
+
+from lib.logic.Character import (
+    BASEGAME_CHARACTER_INFO,
+    PLAYTEST_CHARACTER_INFO,
+    load_character_info,
+)
+from lib.logic.Script import BASEGAME_SCRIPTS, PLAYTEST_SCRIPTS, script_paths
+from lib.utils import load_pickle
+from resources.basegame import characters
+
+if TYPE_CHECKING:
+    from lib.bot import BOTCBot
+
+PREFERENCES = "resources/preferences/"
+
+# the thread pool for disk-bound loading; unpickling mostly waits on the disk
+_WORKERS = 8
+
+# whether playtest caches are loaded: the task loading the caches bots share
+_shared = {}  # type: Dict[bool, asyncio.Future]
+
+
+async def _timed(name: str, stage: Callable[[], Awaitable[int]]):
+    """Run a prewarm stage and report how long it took."""
+    start = perf_counter()
+    try:
+        count = await stage()
+    except Exception as e:  # pylint: disable=broad-except
+        # a failed stage only means a slower first command, so don't stop startup
+        print(f"Prewarming {name} failed: {e!r}")
+        return
+    print(f"Prewarmed {count} {name} in {perf_counter() - start:.3f}s.")
+
+
+async def _load_all(executor: ThreadPoolExecutor, paths: List[str]) -> int:
+    """Load pickles into lib.utils.load_pickle's cache in the thread pool."""
+    loop = asyncio.get_event_loop()
+    await asyncio.gather(
+        *(loop.run_in_executor(executor, load_pickle, path) for path in paths)
+    )
+    return len(paths)
+
+
+async def _prewarm_shared(playtest: bool):
+    """Load the caches shared by every bot in the process."""
+    loop = asyncio.get_event_loop()
+
+    with ThreadPoolExecutor(max_workers=_WORKERS) as executor:
+
+        async def scripts() -> int:
+            paths = script_paths(BASEGAME_SCRIPTS)
+            if playtest and isdir(PLAYTEST_SCRIPTS):
+                paths += script_paths(PLAYTEST_SCRIPTS)
+            return await _load_all(executor, paths)
+
+        async def preferences() -> int:
+            return await _load_all(
+                executor,
+                [
+                    PREFERENCES + filename
+                    for filename in listdir(PREFERENCES)
+                    if filename.endswith(".pckl")
+                ],
+            )
+
+        async def character_info() -> int:
+            paths = [BASEGAME_CHARACTER_INFO]
+            if playtest and isfile(PLAYTEST_CHARACTER_INFO):
+                paths.append(PLAYTEST_CHARACTER_INFO)
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(executor, load_character_info, path)
+                    for path in paths
+                )
+            )
+            return len(paths)
+
+        async def character_modules() -> int:
+            # imports take the import lock, so one thread is as fast as several
+            await loop.run_in_executor(
+                executor,
+                lambda: [characters.resolve(name) for name in characters.REGISTRY],
+            )
+            return len(characters.REGISTRY)
+
+        await asyncio.gather(
+            _timed("scripts", scripts),
+            _timed("preferences", preferences),
+            _timed("character info files", character_info),
+            _timed("character modules", character_modules),
+        )
+
+
+async def prewarm(bot: "BOTCBot"):
+    """Load everything which would otherwise be loaded by the first command using it.
+
+    Stages run concurrently, with disk-bound loading in a thread pool, so the event
+    loop stays responsive throughout. Each stage reports its timing to the console.
+
+    The caches are shared by every bot in the process, so they're only loaded by the
+    first bot to prewarm; the rest wait for it, and then only load their members.
+
+    Parameters
+    ----------
+    bot : BOTCBot
+        The bot to prewarm.
+    """
+    start = perf_counter()
+
+    shared = _shared.get(bot.playtest)
+    if shared is None:
+        shared = _shared[bot.playtest] = asyncio.ensure_future(
+            _prewarm_shared(bot.playtest)
+        )
+
+    async def members() -> int:
+        # role membership is read from the guild's member cache, and loading it
+        # dispatches no member updates, so the role index is seeded again after
+        if not bot.server.chunked:
+            await bot.request_offline_members(bot.server)
+            bot.role_index.seed(bot.indexed_roles)
+        return bot.server.member_count
+
+    stages = [_timed("members", members)]  # type: List[Awaitable]
+    if not shared.done():
+        # shielded, so the other bots still get the caches if this one closes
+        stages.append(asyncio.shield(shared))
+    await asyncio.gather(*stages)
+
+    print(f"Prewarming complete in {perf_counter() - start:.3f}s.")
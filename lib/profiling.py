@@ -0,0 +1,128 @@
+"""Contains the Profiler class, for profiling the running bot on demand."""
+
+import cProfile
+import pstats
+import tracemalloc
+from io import BytesIO, StringIO
+from typing import TYPE_CHECKING, Optional
+
+import discord
+
+if TYPE_CHECKING:
+    from lib.typings.context import Context
+
+# the number of entries in each report
+ENTRIES = 40
+
+# the frames kept for each traced allocation
+_FRAMES = 1
+
+
+async def send_report(ctx: "Context", text: str, file_name: str):
+    """Send a report to the context as a file attachment."""
+    await ctx.send(
+        f"Attached {file_name}.",
+        file=discord.File(BytesIO(text.encode()), filename=file_name),
+    )
+
+
+class Profiler:
+    """Profiles the bot with cProfile, and compares tracemalloc snapshots.
+
+    cProfile profiles everything the event loop runs while it's enabled, so
+    profiling the next few commands includes whatever else runs between them.
+
+    Attributes
+    ----------
+    profile : Optional[cProfile.Profile]
+        The running profile, or None.
+    owner : Optional[Context]
+        The invocation which started the running profile.
+    remaining : Optional[int]
+        The number of commands left to profile, or None if the profile isn't
+        counting commands.
+    baseline : Optional[tracemalloc.Snapshot]
+        The snapshot later snapshots are compared with, or None.
+    """
+
+    def __init__(self):
+        self.profile = None  # type: Optional[cProfile.Profile]
+        self.owner = None  # type: Optional[Context]
+        self.remaining = None  # type: Optional[int]
+        self.baseline = None  # type: Optional[tracemalloc.Snapshot]
+
+    @property
+    def running(self) -> bool:
+        """Determine whether a profile is running."""
+        return self.profile is not None
+
+    def start(self, ctx: "Context", commands: Optional[int] = None):
+        """Start profiling, for a number of commands or until stopped.
+
+        Parameters
+        ----------
+        ctx : Context
+            The invocation starting the profile, which isn't counted.
+        commands : Optional[int]
+            The number of commands to profile, or None to profile until stopped.
+        """
+        self.profile = cProfile.Profile()
+        self.owner = ctx
+        self.remaining = commands
+        self.profile.enable()
+
+    def stop(self) -> str:
+        """Stop profiling, returning the report.
+
+        The report lists the ENTRIES functions with the most cumulative time, and
+        then the ENTRIES with the most time of their own.
+        """
+        assert self.profile
+        self.profile.disable()
+        stream = StringIO()
+        stats = pstats.Stats(self.profile, stream=stream).strip_dirs()
+        stats.sort_stats("cumulative").print_stats(ENTRIES)
+        stats.sort_stats("tottime").print_stats(ENTRIES)
+        self.profile = self.owner = self.remaining = None
+        return stream.getvalue()
+
+    async def count(self, ctx: "Context"):
+        """Count a finished command, sending the report if it was the last."""
+        if self.remaining is None or ctx is self.owner:
+            return
+
+        self.remaining -= 1
+        if self.remaining <= 0:
+            owner = self.owner
+            report = self.stop()
+            if owner is not None:
+                await send_report(owner, report, "profile.txt")
+
+    def take_baseline(self):
+        """Start tracing allocations, if they aren't traced, and take a baseline."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(_FRAMES)
+        self.baseline = tracemalloc.take_snapshot()
+
+    def compare(self, entries: int = ENTRIES) -> str:
+        """Compare a snapshot with the baseline, returning the report.
+
+        The report lists the lines whose allocations grew the most, then the total
+        change.
+        """
+        assert self.baseline
+        snapshot = tracemalloc.take_snapshot()
+        diff = snapshot.compare_to(self.baseline, "lineno")
+        lines = [str(stat) for stat in diff[:entries]]
+        change = sum(stat.size_diff for stat in diff)
+        current, peak = tracemalloc.get_traced_memory()
+        lines.append(
+            f"\nTotal change: {change / 1024:+.1f} KiB; traced {current / 1024:.1f} "
+            f"KiB, peak {peak / 1024:.1f} KiB."
+        )
+        return "\n".join(lines)
+
+    def stop_tracing(self):
+        """Stop tracing allocations and drop the baseline."""
+        tracemalloc.stop()
+        self.baseline = None
@@ -0,0 +1,150 @@
+"""Contains lazy handles for Discord objects restored from backups."""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, List, Optional
+
+import discord
+
+if TYPE_CHECKING:
+    from lib.bot import BOTCBot
+
+# the attributes a LazyMember answers itself, rather than passing to its member
+_OWN_ATTRIBUTES = frozenset(
+    {"_lazy_id", "_lazy_batch", "_lazy_member", "resolve", "resolved"}
+)
+
+
+class MemberBatch:
+    """Resolves a group of LazyMembers together from the guild's member cache.
+
+    Parameters
+    ----------
+    get_guild : Callable[[], discord.Guild]
+        A function returning the guild, called when the batch is resolved.
+    """
+
+    def __init__(self, get_guild: Callable[[], discord.Guild]):
+        self._get_guild = get_guild
+        self._pending = []  # type: List[LazyMember]
+
+    def add(self, handle: "LazyMember"):
+        """Add an unresolved handle to the batch."""
+        self._pending.append(handle)
+
+    def resolve(self):
+        """Resolve every unresolved handle in the batch."""
+        if not self._pending:
+            return
+        guild = self._get_guild()
+        for handle in self._pending:
+            handle._lazy_member = guild.get_member(handle._lazy_id)
+        self._pending = []
+
+
+class LazyMember(discord.Member):
+    """A handle for a member, which looks the member up on first use.
+
+    The handle is a Member, so it compares and hashes equal to the real member, and
+    answers id without resolving. Accessing any other attribute resolves every handle
+    in its batch and then forwards to the real member.
+
+    Parameters
+    ----------
+    idn : int
+        The member's ID.
+    batch : MemberBatch
+        The batch to resolve the handle with.
+    """
+
+    # noinspection PyMissingConstructor
+    def __init__(  # pylint: disable=super-init-not-called
+        self, idn: int, batch: MemberBatch
+    ):
+        self._lazy_id = idn
+        self._lazy_batch = batch
+        self._lazy_member = None  # type: Optional[discord.Member]
+        batch.add(self)
+
+    def __getattribute__(self, name: str):
+        """Answer id directly, and forward everything else to the resolved member."""
+        if name in _OWN_ATTRIBUTES:
+            return object.__getattribute__(self, name)
+        if name == "id":
+            return object.__getattribute__(self, "_lazy_id")
+        return getattr(object.__getattribute__(self, "resolve")(), name)
+
+    def __hash__(self) -> int:
+        """Hash the handle like its member, without resolving it."""
+        return self.id >> 22
+
+    @property
+    def resolved(self) -> bool:
+        """Determine whether the handle has looked up its member."""
+        return self._lazy_member is not None
+
+    def resolve(self) -> discord.Member:
+        """Find the real member, resolving the handle's batch if necessary."""
+        if self._lazy_member is None:
+            self._lazy_batch.resolve()
+            if self._lazy_member is None:
+                raise AttributeError(f"Member {self._lazy_id} is not in the server.")
+        return self._lazy_member
+
+
+def restore_members(bot: "BOTCBot", ids: List[int]) -> List[LazyMember]:
+    """Create handles for members from a backup, sharing a single batch."""
+    batch = MemberBatch(lambda: bot.server)
+    return [LazyMember(idn, batch) for idn in ids]
+
+
+class LazyMessage:
+    """A handle for a message from a backup, which fetches the message on first use.
+
+    The handle knows its ID and creation time without a fetch. Its edit, pin, unpin,
+    and delete methods fetch the message once and forward to it; if the message was
+    deleted, they raise NotFound.
+
+    Parameters
+    ----------
+    channel : discord.TextChannel
+        The message's channel.
+    idn : int
+        The message's ID.
+    """
+
+    def __init__(self, channel: discord.TextChannel, idn: int):
+        self.channel = channel
+        self.id = idn
+        self._message = None  # type: Optional[discord.Message]
+
+    @property
+    def created_at(self) -> datetime:
+        """Determine when the message was sent, from its ID."""
+        return discord.utils.snowflake_time(self.id)
+
+    async def fetch(self) -> discord.Message:
+        """Fetch the real message, if it hasn't been fetched yet."""
+        if self._message is None:
+            self._message = await self.channel.fetch_message(self.id)
+        return self._message
+
+    async def edit(self, **fields):
+        """Edit the message."""
+        await (await self.fetch()).edit(**fields)
+
+    async def pin(self):
+        """Pin the message."""
+        await (await self.fetch()).pin()
+
+    async def unpin(self):
+        """Unpin the message."""
+        await (await self.fetch()).unpin()
+
+    async def delete(self):
+        """Delete the message."""
+        await (await self.fetch()).delete()
+
+
+def restore_message(channel: discord.TextChannel, idn: int) -> LazyMessage:
+    """Create a handle for a message from a backup, without fetching it."""
+    return LazyMessage(channel, idn)
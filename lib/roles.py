@@ -0,0 +1,68 @@
+"""Contains the RoleIndex class, for quick role membership tests."""
+
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+import discord
+
+
+class RoleIndex:
+    """Stores the IDs of the members with each of the bot's roles.
+
+    Role.members walks the server's entire member cache, which the bot did for every
+    storyteller check. Here each role's members are collected once, then kept up to
+    date from member updates, so testing membership is a set lookup.
+
+    Roles which weren't seeded are indexed the first time they're used.
+    """
+
+    def __init__(self):
+        self._members = {}  # type: Dict[int, Set[int]]
+
+    def seed(self, roles: Iterable[Optional[discord.Role]]):
+        """Index roles from the member cache, discarding anything already indexed."""
+        self._members.clear()
+        for role in roles:
+            if role is not None:
+                self.ids(role)
+
+    def ids(self, role: discord.Role) -> Set[int]:
+        """Determine the IDs of a role's members."""
+        try:
+            return self._members[role.id]
+        except KeyError:
+            ids = self._members[role.id] = {member.id for member in role.members}
+            return ids
+
+    def has(
+        self,
+        role: Optional[discord.Role],
+        user: Union[discord.User, discord.Member, discord.Object],
+    ) -> bool:
+        """Determine whether a user has a role, which may be None."""
+        return role is not None and user.id in self.ids(role)
+
+    def members(self, role: discord.Role) -> List[discord.Member]:
+        """Determine a role's members.
+
+        This returns a new list, so the role can be edited while iterating over it.
+        """
+        out = []
+        for idn in self.ids(role):
+            member = role.guild.get_member(idn)
+            if member is not None:
+                out.append(member)
+        return out
+
+    def update(self, after: discord.Member):
+        """Update the indexed roles from a member's new roles."""
+        roles = {role.id for role in after.roles}
+        for role_id, ids in self._members.items():
+            if role_id in roles:
+                ids.add(after.id)
+            else:
+                ids.discard(after.id)
+
+    def remove(self, member: Union[discord.Member, discord.Object]):
+        """Remove a member who left the server from every indexed role."""
+        for ids in self._members.values():
+            ids.discard(member.id)
@@ -0,0 +1,81 @@
+"""Contains the InputRouter class, for delivering replies to pending prompts."""
+
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+
+class InputRouter:
+    """Delivers messages to the prompts waiting on their author and channel.
+
+    bot.wait_for checks every incoming message against every pending predicate, so
+    each message costs time proportional to the number of open prompts. Prompts here
+    are keyed by (author ID, channel ID), so routing a message is a dictionary lookup.
+
+    As with wait_for, a message resolves every prompt waiting on its author and
+    channel, not just the oldest.
+    """
+
+    def __init__(self):
+        self._pending = {}  # type: Dict[Tuple[int, int], List[asyncio.Future]]
+
+    def __len__(self) -> int:
+        """Determine the number of pending prompts."""
+        return sum(len(futures) for futures in self._pending.values())
+
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        """Determine whether a prompt is waiting on an (author ID, channel ID)."""
+        return key in self._pending
+
+    async def wait(
+        self, author_id: int, channel_id: int, timeout: Optional[float] = None
+    ) -> discord.Message:
+        """Wait for the next message from author_id in channel_id.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If no message arrives within timeout seconds.
+        """
+        key = (author_id, channel_id)
+        future = asyncio.get_event_loop().create_future()
+        self._pending.setdefault(key, []).append(future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            futures = self._pending.get(key)
+            if futures is not None:
+                if future in futures:
+                    futures.remove(future)
+                if not futures:
+                    del self._pending[key]
+
+    def route(self, message: discord.Message) -> bool:
+        """Deliver a message to its waiting prompts, returning whether any were."""
+        futures = self._pending.pop((message.author.id, message.channel.id), None)
+        if not futures:
+            return False
+        for future in futures:
+            if not future.done():
+                future.set_result(message)
+        return True
+
+    def cancel(self, author_id: int, channel_id: Optional[int] = None) -> int:
+        """Cancel an author's pending prompts, in one channel or all of them.
+
+        The prompts raise ValueError("cancelled"), as if the author had replied
+        "cancel". Returns the number of prompts cancelled.
+        """
+        keys = [
+            key
+            for key in self._pending
+            if key[0] == author_id and channel_id in (None, key[1])
+        ]
+        count = 0
+        for key in keys:
+            for future in self._pending.pop(key):
+                if not future.done():
+                    future.set_exception(ValueError("cancelled"))
+                    count += 1
+        return count
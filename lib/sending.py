@@ -0,0 +1,302 @@
+"""Contains the SendScheduler class, for ordering a bot's messages by priority.
+
+Every message is sent in a turn granted by the scheduler. Messages to the same
+channel or user are sent one at a time, in the order they were queued, and when
+there are more messages waiting than can be in flight, the channel or user with the
+most urgent waiting message goes first. Channels which discord.py is holding for
+their rate limits are skipped until they reopen, so they don't take turns from the
+others.
+"""
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from itertools import count
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+)
+
+from discord import HTTPException
+
+if TYPE_CHECKING:
+    from discord import Message
+    from discord.abc import Messageable
+    from discord.http import HTTPClient
+
+# priority classes, most urgent first
+GAME = 0  # public game flow, and replies
+VOTE = 1  # calls for the next vote
+NOTICE = 2  # notices to the storytellers
+RELAY = 3  # copies of PMs for the storytellers and observers
+
+# the number of messages in flight at once
+CONCURRENCY = 4
+
+# the number of queued messages not yet sent, from which queueing more waits
+BACKLOG = 50
+
+# the seconds between checks of channels held for their rate limits
+RETRY = 0.25
+
+# discord.py's rate limit bucket for sending messages to a channel
+BUCKET = "{}:None:/channels/{{channel_id}}/messages"
+
+# the scheduler of the bot whose command is running in the current task
+_scheduler = ContextVar(
+    "scheduler", default=None
+)  # type: ContextVar[Optional[SendScheduler]]
+
+# the sends queued by the command running in the current task
+_queued = ContextVar(
+    "queued", default=None
+)  # type: ContextVar[Optional[List[asyncio.Future]]]
+
+
+class _Turn(NamedTuple):
+    """A message waiting for its turn."""
+
+    priority: int
+    order: int
+    target: Any
+    granted: asyncio.Future
+
+
+def route_key(target: "Messageable") -> int:
+    """Determine the ID a target's messages are ordered by.
+
+    That's the ID of its channel, or for direct messages, of the user.
+    """
+    target = getattr(target, "channel", target)  # contexts
+    target = getattr(target, "recipient", target)  # DM channels
+    return target.id
+
+
+async def deliver(target: "Messageable", content: str) -> "Message":
+    """Send a message, splitting it in half until discord accepts its length.
+
+    Returns
+    -------
+    Message
+        The first message sent.
+    """
+    try:
+        return await target.send(content)
+    except HTTPException as e:
+        if e.code != 50035:
+            raise
+
+        n = len(content) // 2
+        out = await deliver(target, content[:n])
+        await deliver(target, content[n:])
+        return out
+
+
+def current() -> Optional["SendScheduler"]:
+    """Determine the scheduler for the current task, if a command is running in it."""
+    return _scheduler.get()
+
+
+class SendScheduler:
+    """Sends a bot's messages, in turns ordered by priority and rate limits.
+
+    Parameters
+    ----------
+    http : Optional[HTTPClient]
+        The bot's HTTP client, whose rate limits are respected, if any.
+    concurrency : int
+        The number of messages in flight at once.
+    backlog : int
+        The number of queued messages not yet sent, from which queueing more waits.
+
+    Attributes
+    ----------
+    waiting : int
+        The number of messages waiting for their turn.
+    queued : Set[asyncio.Future]
+        The sends queued without waiting for them.
+    """
+
+    def __init__(
+        self,
+        http: Optional["HTTPClient"] = None,
+        concurrency: int = CONCURRENCY,
+        backlog: int = BACKLOG,
+    ):
+        self.http = http
+        self.concurrency = concurrency
+        self.backlog = backlog
+        self.queued = set()  # type: Set[asyncio.Future]
+        # route key: turns waiting for it, oldest first
+        self._waiting = {}  # type: Dict[int, Deque[_Turn]]
+        # the route keys with a message in flight
+        self._busy = set()  # type: Set[int]
+        self._order = count()
+        self._retrying = False
+
+    @property
+    def waiting(self) -> int:
+        """Determine the number of messages waiting for their turn."""
+        return sum(len(turns) for turns in self._waiting.values())
+
+    def use(self):
+        """Send the current task's messages with the scheduler."""
+        _scheduler.set(self)
+
+    async def send(
+        self, target: "Messageable", content: str, priority: int = GAME
+    ) -> "Message":
+        """Send a message in its turn.
+
+        Parameters
+        ----------
+        target : Messageable
+            The object to send the message to.
+        content : str
+            The message.
+        priority : int
+            The message's priority class.
+
+        Returns
+        -------
+        Message
+            The first message sent.
+        """
+        async with self._turn(target, priority):
+            return await deliver(target, content)
+
+    async def queue(self, target: "Messageable", content: str, priority: int = NOTICE):
+        """Queue a message to be sent in its turn, without waiting for it.
+
+        While the backlog is full, this waits for a queued message to be sent. If the
+        message can't be sent, the error is printed.
+        """
+        while len(self.queued) >= self.backlog:
+            await asyncio.wait(set(self.queued), return_when=asyncio.FIRST_COMPLETED)
+
+        sending = asyncio.ensure_future(self.send(target, content, priority))
+        self.queued.add(sending)
+        sending.add_done_callback(self._sent)
+        invocation = _queued.get()
+        if invocation is not None:
+            invocation.append(sending)
+
+    @staticmethod
+    def start():
+        """Start collecting the messages the current task's command queues."""
+        _queued.set([])
+
+    @staticmethod
+    async def finish():
+        """Wait until the messages the current task's command queued are sent."""
+        invocation = _queued.get()
+        _queued.set(None)
+        if invocation:
+            await asyncio.wait(invocation)
+
+    def _sent(self, sending: asyncio.Future):
+        """Forget a queued send once it's done, printing its error, if any."""
+        self.queued.discard(sending)
+        if not sending.cancelled() and sending.exception() is not None:
+            print(f"Couldn't send a queued message: {sending.exception()!r}")
+
+    @asynccontextmanager
+    async def _turn(self, target: "Messageable", priority: int) -> AsyncIterator[None]:
+        """Wait for a message's turn, and hold it within an async with block."""
+        key = route_key(target)
+        turn = _Turn(
+            priority,
+            next(self._order),
+            target,
+            asyncio.get_event_loop().create_future(),
+        )
+        self._waiting.setdefault(key, deque()).append(turn)
+        self._grant()
+
+        try:
+            await turn.granted
+        except asyncio.CancelledError:
+            # turns cancelled while waiting are dropped by the next grant
+            if not turn.granted.cancelled():
+                self._release(key)
+            raise
+
+        try:
+            yield
+        finally:
+            self._release(key)
+
+    def _release(self, key: int):
+        """End the turn of the message in flight to a route."""
+        self._busy.discard(key)
+        self._grant()
+
+    def _grant(self):
+        """Grant turns to the most urgent routes which are free, while there's room.
+
+        A route's urgency is that of its most urgent waiting message, so a message
+        queued behind a less urgent one to the same route doesn't wait for others.
+        """
+        for key in list(self._waiting):
+            turns = deque(
+                turn for turn in self._waiting[key] if not turn.granted.cancelled()
+            )
+            if turns:
+                self._waiting[key] = turns
+            else:
+                del self._waiting[key]
+
+        held = False
+        ready = []
+        for key, turns in self._waiting.items():
+            if key in self._busy:
+                continue
+            if self._limited(turns[0].target):
+                held = True
+                continue
+            ready.append((min(turn.priority for turn in turns), turns[0].order, key))
+
+        for _, _, key in sorted(ready):
+            if len(self._busy) >= self.concurrency:
+                break
+            turn = self._waiting[key].popleft()
+            if not self._waiting[key]:
+                del self._waiting[key]
+            self._busy.add(key)
+            turn.granted.set_result(None)
+
+        if held and not self._retrying:
+            self._retrying = True
+            asyncio.get_event_loop().call_later(RETRY, self._retry)
+
+    def _retry(self):
+        """Check the routes held for their rate limits again."""
+        self._retrying = False
+        self._grant()
+
+    def _limited(self, target: "Messageable") -> bool:
+        """Determine whether discord.py is holding a target's messages.
+
+        It holds every message while the bot is globally rate limited, and a
+        channel's bucket lock until its rate limit resets once it's exhausted.
+        """
+        # pylint: disable=protected-access
+        if self.http is None:
+            return False
+        if not self.http._global_over.is_set():
+            return True
+
+        channel = getattr(target, "channel", target)  # contexts
+        channel = getattr(channel, "dm_channel", channel)  # users
+        if channel is None:
+            return False
+        lock = self.http._locks.get(BUCKET.format(channel.id))
+        return lock is not None and lock.locked()
@@ -0,0 +1,260 @@
+"""Contains the versioned game state format, replacing dill for backups.
+
+A saved state is two lines of compact JSON, compressed with zlib:
+{"version": 1, "types": ["module:qualname", ...]}
+{"objects": [state, ...], "root": value}
+
+The header comes first so the loader can allocate every object before parsing the body,
+and then decode references as the parser meets them.
+
+Every instance of a class is stored once in the object table, in the state returned by
+its __getstate__ if it has one, and referenced as {"$ref": index}; so shared players,
+and cycles between players and their characters and effects, survive a round trip.
+Dictionaries referenced more than once, like the PMs in both players' histories, are
+moved to the object table on their second reference, with type "builtins:dict".
+Discord objects are never stored, since __getstate__ replaces them with their ids.
+Classes and functions are stored by name, so loading never depends on how the
+decorators in lib.logic.charcreation built them, only on them still existing.
+
+Other values which JSON can't represent are tagged with single-key objects: $tuple,
+$set, $map (dictionaries whose keys aren't strings), $datetime, and $global (a class
+or function stored by name).
+"""
+
+import json
+import zlib
+from datetime import datetime
+from importlib import import_module
+from typing import IO, Any, Dict, List, Tuple
+
+from dill import loads as loads_pickle
+
+from lib.exceptions import SerializationError
+
+FORMAT_VERSION = 1
+
+# pickles begin with the PROTO opcode, which is never the first byte of a zlib stream
+_PICKLE_PREFIX = b"\x80"
+
+# the compression level; higher levels barely shrink game states further
+_COMPRESSION = 6
+
+# the types stored as themselves
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+
+def _qualified_name(obj: Any) -> str:
+    """Determine the name to store a class or function under."""
+    name = f"{obj.__module__}:{obj.__qualname__}"
+    if "<locals>" in name or "<lambda>" in name:
+        raise SerializationError(f"{name} can't be loaded by name.")
+    if _resolve_name(name) is not obj:
+        raise SerializationError(f"{name} doesn't refer to {obj!r}.")
+    return name
+
+
+def _resolve_name(name: str) -> Any:
+    """Find the class or function stored under name."""
+    module_name, qualname = name.split(":")
+    out = import_module(module_name)
+    for attribute in qualname.split("."):
+        out = getattr(out, attribute)
+    return out
+
+
+class _Encoder:
+    """Encodes a value and everything it references."""
+
+    def __init__(self):
+        # the object table, as parallel lists
+        self.types = []  # type: List[str]
+        self.states = []  # type: List[Any]
+        self._refs = {}  # type: Dict[int, int]
+        # id: encoded dictionary, for every dictionary seen once
+        self._dicts = {}  # type: Dict[int, Dict[str, Any]]
+        # (index, first copy) for every dictionary seen more than once
+        self._shared = []  # type: List[Tuple[int, Dict[str, Any]]]
+        self._keepalive = []  # type: List[Any]
+
+    def encode(self, value: Any) -> Any:
+        """Encode value as a JSON-compatible value."""
+        if isinstance(value, _PRIMITIVES):
+            return value
+
+        if isinstance(value, list):
+            return [self.encode(item) for item in value]
+
+        if isinstance(value, dict):
+            if all(isinstance(key, str) and key[:1] != "$" for key in value):
+                return self._encode_dict(value)
+            return {
+                "$map": [
+                    [self.encode(key), self.encode(item)] for key, item in value.items()
+                ]
+            }
+
+        if isinstance(value, tuple):
+            return {"$tuple": [self.encode(item) for item in value]}
+
+        if isinstance(value, (set, frozenset)):
+            return {"$set": [self.encode(item) for item in value]}
+
+        if isinstance(value, datetime):
+            return {"$datetime": value.isoformat()}
+
+        if isinstance(value, type) or hasattr(value, "__qualname__"):
+            return {"$global": _qualified_name(value)}
+
+        if hasattr(value, "__dict__"):
+            return {"$ref": self._reference(value)}
+
+        raise SerializationError(f"Can't serialize {type(value).__name__} objects.")
+
+    def _encode_dict(self, value: Dict[str, Any]) -> Dict[str, Any]:
+        """Encode a dictionary with string keys, referencing it if it's shared."""
+        encoded = self._dicts.get(id(value))
+        if encoded is None:
+            encoded = self._dicts[id(value)] = {}
+            self._keepalive.append(value)
+            for key, item in value.items():
+                encoded[key] = self.encode(item)
+            return encoded
+
+        if id(value) not in self._refs:
+            # the first copy may still be being encoded, so it's moved in finish
+            self._refs[id(value)] = len(self.types)
+            self.types.append("builtins:dict")
+            self.states.append(None)
+            self._shared.append((self._refs[id(value)], encoded))
+        return {"$ref": self._refs[id(value)]}
+
+    def finish(self):
+        """Move every shared dictionary to the object table, referencing it in place."""
+        for index, encoded in self._shared:
+            self.states[index] = dict(encoded)
+            encoded.clear()
+            encoded["$ref"] = index
+
+    def _reference(self, obj: Any) -> int:
+        """Find obj's index in the object table, adding it if necessary."""
+        try:
+            return self._refs[id(obj)]
+        except KeyError:
+            pass
+
+        index = len(self.types)
+        self._refs[id(obj)] = index
+        self._keepalive.append(obj)  # ids are only unique among live objects
+        self.types.append(_qualified_name(type(obj)))
+        self.states.append(None)
+
+        get_state = getattr(obj, "__getstate__", None)
+        state = get_state() if get_state else obj.__dict__
+        self.states[index] = self.encode({} if state is None else state)
+        return index
+
+
+class _Decoder:
+    """Decodes a saved state's body, given the types in its object table."""
+
+    def __init__(self, types: List[str]):
+        self._globals = {}  # type: Dict[str, Any]
+        self.objects = [self._allocate(name) for name in types]
+        # maps and sets are filled last, since their keys may hash by their state
+        self._deferred = []  # type: List[Tuple[Any, List]]
+
+    def _global(self, name: str) -> Any:
+        """Find the class or function stored under name, caching it."""
+        try:
+            return self._globals[name]
+        except KeyError:
+            out = self._globals[name] = _resolve_name(name)
+            return out
+
+    def _allocate(self, name: str) -> Any:
+        """Create an empty instance of the class stored under name."""
+        cls = self._global(name)
+        return cls.__new__(cls)
+
+    def decode_tag(self, value: Dict[str, Any]) -> Any:
+        """Decode a tagged value; called by the JSON parser for every object."""
+        if len(value) != 1:
+            return value
+
+        # references are by far the most common tag
+        ref = value.get("$ref")
+        if ref is not None:
+            return self.objects[ref]
+
+        ((tag, data),) = value.items()
+        if tag == "$tuple":
+            return tuple(data)
+        if tag == "$datetime":
+            return datetime.fromisoformat(data)
+        if tag == "$global":
+            return self._global(data)
+        if tag == "$map":
+            out = {}  # type: Dict[Any, Any]
+            self._deferred.append((out, data))
+            return out
+        if tag == "$set":
+            out_set = set()  # type: set
+            self._deferred.append((out_set, data))
+            return out_set
+        return value
+
+    def load(self, body: Dict[str, Any]) -> Any:
+        """Restore every object's state and fill every map and set."""
+        for obj, state in zip(self.objects, body["objects"]):
+            if isinstance(obj, dict):
+                obj.update(state)
+            elif hasattr(obj, "__setstate__"):
+                obj.__setstate__(state)
+            else:
+                obj.__dict__.update(state)
+
+        for out, data in self._deferred:
+            out.update(data)  # data is a list of items or of key-value pairs
+        return body["root"]
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize obj in the current format."""
+    encoder = _Encoder()
+    root = encoder.encode(obj)
+    encoder.finish()
+    header = {"version": FORMAT_VERSION, "types": encoder.types}
+    body = {"objects": encoder.states, "root": root}
+    text = "\n".join(json.dumps(part, separators=(",", ":")) for part in (header, body))
+    return zlib.compress(text.encode(), _COMPRESSION)
+
+
+def loads(data: bytes) -> Any:
+    """Deserialize an object saved by dumps, or a legacy dill pickle.
+
+    States saved before this format existed are dill pickles, which are detected and
+    loaded with dill. Empty or truncated data raises EOFError, as with dill.
+    """
+    if data[:1] == _PICKLE_PREFIX:
+        return loads_pickle(data)
+
+    try:
+        header_text, body_text = zlib.decompress(data).split(b"\n", 1)
+        header = json.loads(header_text)
+    except (zlib.error, ValueError) as e:
+        raise EOFError("The saved state is incomplete.") from e
+    if header.get("version") != FORMAT_VERSION:
+        raise SerializationError(f"Unknown format version {header.get('version')}.")
+
+    decoder = _Decoder(header["types"])
+    return decoder.load(json.loads(body_text, object_hook=decoder.decode_tag))
+
+
+def dump(obj: Any, file: IO[bytes]):
+    """Serialize obj to a binary file in the current format."""
+    file.write(dumps(obj))
+
+
+def load(file: IO[bytes]) -> Any:
+    """Deserialize an object from a binary file in either format."""
+    return loads(file.read())
@@ -0,0 +1,81 @@
+"""Contains the Table class, for the channels a bot hosts games in."""
+
+import asyncio
+from typing import TYPE_CHECKING, Optional
+
+from lib.archive import Archive
+
+if TYPE_CHECKING:
+    from lib.logic.Game import Game
+
+BACKUPS = "resources/backup/"
+
+
+class Table:
+    """Stores a gameplay channel, its roles, and its game.
+
+    Each table keeps its backups in its own directory, named for the table, and
+    archives its games there.
+
+    Parameters
+    ----------
+    name : str
+        The table's name; a bot's first table is named for the bot.
+    channelid : int
+        The gameplay channel's ID.
+    storytellerid : int
+        The table's storyteller role's ID.
+    playerid : int
+        The table's player role's ID.
+    inactiveid : int
+        The table's inactive role's ID.
+    playtestid : int
+        The table's playtest role's ID.
+    observerid : int
+        The table's observer role's ID.
+
+    Attributes
+    ----------
+    game : Optional[Game]
+        The table's ongoing game, or None.
+    archive : Archive
+        The table's archived games.
+    lock : asyncio.Lock
+        Held by the command running at the table; see lib.locking.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        channelid: int,
+        storytellerid: int,
+        playerid: int,
+        inactiveid: int,
+        playtestid: int,
+        observerid: int,
+    ):
+        self.name = name
+        self.channelid = channelid
+        self.storytellerid = storytellerid
+        self.playerid = playerid
+        self.inactiveid = inactiveid
+        self.playtestid = playtestid
+        self.observerid = observerid
+        self.game = None  # type: Optional[Game]
+        self.archive = Archive(self.directory + "old/")
+        self._lock = None  # type: Optional[asyncio.Lock]
+
+    def __repr__(self) -> str:
+        return f"<Table name={self.name!r} channelid={self.channelid}>"
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        """Determine the table's lock, made on first use in the running event loop."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    @property
+    def directory(self) -> str:
+        """Determine the directory the table's backups are kept in."""
+        return BACKUPS + self.name + "/"
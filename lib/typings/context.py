@@ -20,12 +20,15 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 DEALINGS IN THE SOFTWARE.
 """
 
-from typing import Generic, TypeVar
+import asyncio
+from collections import Counter
+from typing import Dict, Generic, Optional, TypeVar
 
 import discord.abc
 import discord.ext.commands
 import discord.utils
 
+from lib.actor import ActorProfile
 from lib.bot import BOTCBot
 from lib.logic.Day import Day
 from lib.logic.Game import Game
@@ -73,8 +76,29 @@ class Context(discord.ext.commands.Context):
     command_failed: :class:`bool`
         A boolean that indicates if the command failed to be parsed, checked,
         or invoked.
+    actor: Optional[:class:`ActorProfile`]
+        The invoker's roles and player, resolved by BOTCBot.get_context and again
+        once the invocation holds the table's lock; None after the lock is given
+        up and taken back, until lib.actor.get_actor resolves it again.
+    api_calls: :class:`Counter`
+        The discord API calls the command has made, by route.
+    started: :class:`float`
+        The perf_counter time the invocation started at.
+    timings: Dict[:class:`str`, :class:`float`]
+        The milliseconds each finished phase of the invocation took.
+    timing_mark: :class:`float`
+        The perf_counter time the invocation's current phase started at.
+    table_lock: Optional[:class:`asyncio.Lock`]
+        The table's lock while the invocation holds it, or None.
     """
 
+    actor: Optional[ActorProfile]
+    api_calls: Counter
+    started: float
+    timings: Dict[str, float]
+    timing_mark: float
+    table_lock: Optional[asyncio.Lock]
+
     def __init__(self, **attrs):
         self.message = attrs.pop("message", None)
         self.bot = attrs.pop("bot", None)
@@ -1,13 +1,19 @@
 """Contains several utilities, generally not for game logic management."""
 
 import re
-from typing import TYPE_CHECKING, Any, List, Tuple
+from functools import lru_cache
+from os import stat
+from typing import TYPE_CHECKING, Any, Dict, List, Pattern, Tuple
 
-from discord import HTTPException, Message
+from dill import dump, load
+from discord import Message
 from discord.abc import Messageable
 from discord.ext import commands
 
 from lib.exceptions import PlayerNotFoundError
+from lib.latency import LatencyTracker
+from lib.locking import unlocked
+from lib.sending import GAME, NOTICE, current, deliver
 
 if TYPE_CHECKING:
     from lib.logic.Game import Game
@@ -15,6 +21,10 @@ if TYPE_CHECKING:
     from lib.typings.context import Context
 
 
+# path: (modification time, unpickled object)
+_pickle_cache = {}  # type: Dict[str, Tuple[int, Any]]
+
+
 async def aexec(code: str, ctx: "Context") -> Any:
     """Execute code asynchronously.
 
@@ -76,6 +86,10 @@ def get_player(game: "Game", idn: int, include_storytellers: bool = True) -> "Pl
 async def get_input(ctx: "Context", text: str, timeout: int = 200) -> str:
     """Ask for a response in a given context.
 
+    The table's lock is released while waiting for the response, so other commands
+    at the table can run. If the table's game ended or changed meanwhile, the
+    command is stopped, since what it read from the game is out of date.
+
     Parameters
     ----------
     ctx : Context
@@ -89,13 +103,22 @@ async def get_input(ctx: "Context", text: str, timeout: int = 200) -> str:
     -------
     str
         The content of the first message sent in ctx.channel by ctx.author.
+
+    Raises
+    ------
+    ValueError
+        If the response is "cancel" or a command, or the game changed meanwhile.
     """
+    game = ctx.bot.game
     await safe_send(ctx, text)
-    out = await ctx.bot.wait_for(
-        "message",
-        check=(lambda x: x.author == ctx.author and x.channel == ctx.channel),
-        timeout=timeout,
-    )
+    async with unlocked(ctx):
+        with LatencyTracker.waiting(ctx):
+            out = await ctx.bot.input_router.wait(
+                ctx.author.id, ctx.channel.id, timeout
+            )
+
+    if ctx.bot.game is not game:
+        raise ValueError("game changed")
 
     if out.content.lower() == "cancel":
         raise ValueError("cancelled")
@@ -138,19 +161,26 @@ def str_cleanup(text: str, chars: Tuple[str, ...] = (",", " ", "-", "'", "_")) -
 
     Notes
     -----
-    Uses a regex matcher for matching all of chars, so does not work with special
-    characters, could potentially be sanitized.
+    The delimiter regex is compiled once per tuple of chars and then cached.
     """
-    # the regex matcher is a disjoint of all the given characters
-    regex = "|".join(chars)
-    split = re.split(regex, text)
+    split = _delimiter_regex(chars).split(text)
     return "".join(s.capitalize() for s in split)
 
 
-async def safe_send(target: Messageable, msg: str, pin: bool = False) -> Message:
+@lru_cache(maxsize=None)
+def _delimiter_regex(chars: Tuple[str, ...]) -> Pattern:
+    """Compile a regex matching any one of chars."""
+    # the regex matcher is a disjoint of all the given characters
+    return re.compile("|".join(re.escape(char) for char in chars))
+
+
+async def safe_send(
+    target: Messageable, msg: str, pin: bool = False, priority: int = GAME
+) -> Message:
     """Send a message with protection from message length errors.
 
-    Functionally a wrapper of target.send.
+    Functionally a wrapper of target.send. While a command is running, the message
+    waits for its turn with the bot's send scheduler.
 
     Parameters
     ----------
@@ -160,21 +190,19 @@ async def safe_send(target: Messageable, msg: str, pin: bool = False) -> Message
         The message to be sent.
     pin: bool
         Whether to pin the message.
+    priority : int
+        The message's priority class, from lib.sending.
 
     Returns
     -------
     Message
         The first message sent this way.
     """
-    try:
-        out = await target.send(msg)
-    except HTTPException as e:
-        if e.code != 50035:
-            raise
-
-        n = len(msg) // 2
-        out = await safe_send(target, msg[:n])
-        await safe_send(target, msg[n:])
+    scheduler = current()
+    if scheduler is None:
+        out = await deliver(target, msg)
+    else:
+        out = await scheduler.send(target, msg, priority)
 
     if pin:
         await out.pin()
@@ -182,6 +210,28 @@ async def safe_send(target: Messageable, msg: str, pin: bool = False) -> Message
     return out
 
 
+async def queue_send(target: Messageable, msg: str, priority: int = NOTICE):
+    """Send a message without waiting for it to arrive.
+
+    The message is queued with the bot's send scheduler, and sent before the command
+    finishes. Outside of commands, it's sent immediately.
+
+    Parameters
+    ----------
+    target : Messageable
+        The object to send the message to.
+    msg : str
+        The message to be sent.
+    priority : int
+        The message's priority class, from lib.sending.
+    """
+    scheduler = current()
+    if scheduler is None:
+        await deliver(target, msg)
+    else:
+        await scheduler.queue(target, msg, priority)
+
+
 def list_to_plural_string(initial_list: List[str], alt: str) -> Tuple[str, bool]:
     """Convert a list of strings into a list with appropriate punctuation.
 
@@ -225,4 +275,50 @@ def safe_bug_report(ctx: "Context") -> bool:
     For instance, it's unsafe to send those messages in public.
     This is because they may contain privileged game info.
     """
-    return ctx.guild is None and ctx.author in ctx.bot.storyteller_role.members
+    return ctx.guild is None and ctx.bot.role_index.has(
+        ctx.bot.storyteller_role, ctx.author
+    )
+
+
+def load_pickle(path: str) -> Any:
+    """Load a pickled object, reusing the previous load if the file hasn't changed.
+
+    The file's modification time is checked on every call, so changes made by other
+    bot processes are still picked up. Objects are shared between callers, so they're
+    read-only: to change a file, change a copy of its object and save that with
+    save_pickle, the only writer to the cache.
+
+    Parameters
+    ----------
+    path : str
+        The file to load.
+
+    Returns
+    -------
+    Any
+        The unpickled object.
+
+    Raises
+    ------
+    FileNotFoundError
+        If there is no such file.
+    """
+    mtime = stat(path).st_mtime_ns
+    try:
+        cached_mtime, obj = _pickle_cache[path]
+        if cached_mtime == mtime:
+            return obj
+    except KeyError:
+        pass
+
+    with open(path, "rb") as file:
+        obj = load(file)
+    _pickle_cache[path] = (mtime, obj)
+    return obj
+
+
+def save_pickle(path: str, obj: Any):
+    """Pickle an object to a file, and cache it for load_pickle."""
+    with open(path, "wb") as file:
+        dump(obj, file)
+    _pickle_cache[path] = (stat(path).st_mtime_ns, obj)
@@ -0,0 +1,110 @@
+"""Contains the LoopWatchdog class, for finding callbacks which block the event loop."""
+
+import asyncio
+import json
+import sys
+import threading
+import traceback
+from collections import deque
+from datetime import datetime
+from os import makedirs
+from os.path import dirname
+from time import perf_counter
+from typing import Any, Deque, Dict, List, Optional
+
+# the seconds between heartbeats
+INTERVAL = 0.05
+
+# the number of recent stalls kept
+HISTORY = 50
+
+
+class LoopWatchdog:
+    """Measures event loop lag, and logs the stacks of callbacks which block it.
+
+    A task on the loop beats every INTERVAL seconds, and a thread watches the beats.
+    When a beat is late by the threshold, the thread captures the stack the loop's
+    thread is running, which is the blocking callback's. Once the loop catches up,
+    the stall is logged with its length and that stack, one JSON object per line.
+
+    Parameters
+    ----------
+    log_path : str
+        The stall log's file name.
+    threshold : float
+        The lag in milliseconds from which the loop is considered blocked, or 0 to
+        disable the watchdog.
+
+    Attributes
+    ----------
+    stalls : Deque[Dict[str, Any]]
+        The last HISTORY stalls' log entries, oldest first.
+    """
+
+    def __init__(self, log_path: str, threshold: float):
+        self.log_path = log_path
+        self.threshold = threshold / 1000
+        self.stalls = deque(maxlen=HISTORY)  # type: Deque[Dict[str, Any]]
+        self._beat_time = 0.0
+        self._stack = None  # type: Optional[List[str]]
+        self._stopped = threading.Event()
+        self._task = None  # type: Optional[asyncio.Task]
+
+    @property
+    def enabled(self) -> bool:
+        """Determine whether the watchdog has a threshold."""
+        return self.threshold > 0
+
+    def start(self):
+        """Start watching the running event loop, from inside it."""
+        self._beat_time = perf_counter()
+        self._stopped.clear()
+        self._task = asyncio.ensure_future(self._beat())
+        threading.Thread(
+            target=self._watch,
+            args=(threading.get_ident(),),
+            name="loop-watchdog",
+            daemon=True,
+        ).start()
+
+    def stop(self):
+        """Stop watching."""
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _beat(self):
+        """Record the time every INTERVAL seconds, reporting late beats."""
+        while True:
+            expected = perf_counter() + INTERVAL
+            await asyncio.sleep(INTERVAL)
+            self._beat_time = perf_counter()
+            lag = self._beat_time - expected
+            if lag >= self.threshold:
+                self._report(lag)
+
+    def _watch(self, ident: int):
+        """Capture the loop thread's stack when a beat is late, in another thread."""
+        while not self._stopped.wait(INTERVAL):
+            late = perf_counter() - self._beat_time - INTERVAL
+            if late >= self.threshold and self._stack is None:
+                frame = sys._current_frames().get(ident)  # pylint: disable=W0212
+                if frame is not None:
+                    self._stack = traceback.format_stack(frame)
+
+    def _report(self, lag: float):
+        """Log a stall, with the stack captured during it, if there was one."""
+        stack, self._stack = self._stack, None
+        entry = {
+            "time": datetime.utcnow().isoformat(),
+            "lag_ms": round(lag * 1000, 3),
+            "stack": "".join(stack) if stack else None,
+        }
+        self.stalls.append(entry)
+        print(f"The event loop was blocked for {lag * 1000:.0f}ms.")
+
+        if dirname(self.log_path):
+            makedirs(dirname(self.log_path), exist_ok=True)
+        with open(self.log_path, "a") as file:
+            file.write(json.dumps(entry) + "\n")
@@ -1,75 +1,97 @@
-"""Contains basegame characters."""
+"""Contains basegame characters.
 
-from .Artist import Artist
-from .Assassin import Assassin
-from .Barber import Barber
-from .Baron import Baron
-from .Butler import Butler
-from .Cerenovus import Cerenovus
-from .Chambermaid import Chambermaid
-from .Chef import Chef
-from .Clockmaker import Clockmaker
-from .Courtier import Courtier
-from .DevilSAdvocate import DevilSAdvocate
-from .Dreamer import Dreamer
-from .Drunk import Drunk
-from .Empath import Empath
-from .EvilTwin import EvilTwin
-from .Exorcist import Exorcist
-from .FangGu import FangGu
-from .Flowergirl import Flowergirl
-from .Fool import Fool
-from .FortuneTeller import FortuneTeller
-from .Gambler import Gambler
-from .Godfather import Godfather
-from .Goon import Goon
-from .Gossip import Gossip
-from .Grandmother import Grandmother
-from .Gunslinger import Gunslinger
-from .Imp import Imp
-from .Innkeeper import Innkeeper
-from .Investigator import Investigator
-from .Juggler import Juggler
-from .Klutz import Klutz
-from .Librarian import Librarian
-from .Lunatic import Lunatic
-from .Mastermind import Mastermind
-from .Mathematician import Mathematician
-from .Mayor import Mayor
-from .Minstrel import Minstrel
-from .Monk import Monk
-from .Moonchild import Moonchild
-from .Mutant import Mutant
-from .NoDashii import NoDashii
-from .Oracle import Oracle
-from .Pacifist import Pacifist
-from .Philosopher import Philosopher
-from .PitHag import PitHag
-from .Po import Po
-from .Poisoner import Poisoner
-from .Professor import Professor
-from .Pukka import Pukka
-from .Ravenkeeper import Ravenkeeper
-from .Recluse import Recluse
-from .Sage import Sage
-from .Sailor import Sailor
-from .Saint import Saint
-from .Savant import Savant
-from .ScarletWoman import ScarletWoman
-from .Seamstress import Seamstress
-from .Shabaloth import Shabaloth
-from .Slayer import Slayer
-from .SnakeCharmer import SnakeCharmer
-from .Soldier import Soldier
-from .Spy import Spy
-from .Sweetheart import Sweetheart
-from .TeaLady import TeaLady
-from .Tinker import Tinker
-from .TownCrier import TownCrier
-from .Undertaker import Undertaker
-from .Vigormortis import Vigormortis
-from .Virgin import Virgin
-from .Vortox import Vortox
-from .Washerwoman import Washerwoman
-from .Witch import Witch
-from .Zombuul import Zombuul
+Characters are imported on first use rather than with the package, since each one pulls
+in the game logic and discord. The registry records their display names, which are
+needed before then.
+Access characters as attributes (characters.Imp) or with characters.resolve("Imp").
+"""
+
+import sys
+from typing import TYPE_CHECKING, Dict, Type
+
+from lib.logic.registry import LazyCharacterPackage
+
+if TYPE_CHECKING:
+    from lib.logic.Character import Character
+
+    # answered by LazyCharacterPackage once the module class is replaced below
+    def resolve(class_name: str) -> Type[Character]:
+        """Find the character class with class_name, importing it if necessary."""
+
+REGISTRY: Dict[str, str] = {
+    "Artist": "Artist",
+    "Assassin": "Assassin",
+    "Barber": "Barber",
+    "Baron": "Baron",
+    "Butler": "Butler",
+    "Cerenovus": "Cerenovus",
+    "Chambermaid": "Chambermaid",
+    "Chef": "Chef",
+    "Clockmaker": "Clockmaker",
+    "Courtier": "Courtier",
+    "DevilSAdvocate": "Devil's Advocate",
+    "Dreamer": "Dreamer",
+    "Drunk": "Drunk",
+    "Empath": "Empath",
+    "EvilTwin": "Evil Twin",
+    "Exorcist": "Exorcist",
+    "FangGu": "Fang Gu",
+    "Flowergirl": "Flowergirl",
+    "Fool": "Fool",
+    "FortuneTeller": "Fortune Teller",
+    "Gambler": "Gambler",
+    "Godfather": "Godfather",
+    "Goon": "Goon",
+    "Gossip": "Gossip",
+    "Grandmother": "Grandmother",
+    "Gunslinger": "Gunslinger",
+    "Imp": "Imp",
+    "Innkeeper": "Innkeeper",
+    "Investigator": "Investigator",
+    "Juggler": "Juggler",
+    "Klutz": "Klutz",
+    "Librarian": "Librarian",
+    "Lunatic": "Lunatic",
+    "Mastermind": "Mastermind",
+    "Mathematician": "Mathematician",
+    "Mayor": "Mayor",
+    "Minstrel": "Minstrel",
+    "Monk": "Monk",
+    "Moonchild": "Moonchild",
+    "Mutant": "Mutant",
+    "NoDashii": "No Dashii",
+    "Oracle": "Oracle",
+    "Pacifist": "Pacifist",
+    "Philosopher": "Philosopher",
+    "PitHag": "Pit-Hag",
+    "Po": "Po",
+    "Poisoner": "Poisoner",
+    "Professor": "Professor",
+    "Pukka": "Pukka",
+    "Ravenkeeper": "Ravenkeeper",
+    "Recluse": "Recluse",
+    "Sage": "Sage",
+    "Sailor": "Sailor",
+    "Saint": "Saint",
+    "Savant": "Savant",
+    "ScarletWoman": "Scarlet Woman",
+    "Seamstress": "Seamstress",
+    "Shabaloth": "Shabaloth",
+    "Slayer": "Slayer",
+    "SnakeCharmer": "Snake Charmer",
+    "Soldier": "Soldier",
+    "Spy": "Spy",
+    "Sweetheart": "Sweetheart",
+    "TeaLady": "Tea Lady",
+    "Tinker": "Tinker",
+    "TownCrier": "Town Crier",
+    "Undertaker": "Undertaker",
+    "Vigormortis": "Vigormortis",
+    "Virgin": "Virgin",
+    "Vortox": "Vortox",
+    "Washerwoman": "Washerwoman",
+    "Witch": "Witch",
+    "Zombuul": "Zombuul",
+}
+
+sys.modules[__name__].__class__ = LazyCharacterPackage
@@ -0,0 +1,22 @@
+"""Tests that the basegame character registry matches the characters it names."""
+
+from os import listdir
+from os.path import dirname, splitext
+
+from resources.basegame import characters
+
+
+def test_registry_lists_every_character_module():
+    modules = {
+        splitext(file)[0]
+        for file in listdir(dirname(characters.__file__))
+        if file.endswith(".py") and file != "__init__.py"
+    }
+    assert set(characters.REGISTRY) == modules
+
+
+def test_registry_names_match_the_classes():
+    for class_name, name in characters.REGISTRY.items():
+        character = characters.resolve(class_name)
+        assert character.__name__ == class_name
+        assert character.name == name
@@ -0,0 +1,58 @@
+"""Tests for lib.router.InputRouter's cancellation of pending prompts."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from lib.router import InputRouter
+from lib.utils import get_input
+
+AUTHOR = 1
+CHANNEL = 2
+
+
+def _context(router: InputRouter) -> SimpleNamespace:
+    """Build the parts of a context get_input uses."""
+
+    async def send(content: str):
+        pass
+
+    return SimpleNamespace(
+        bot=SimpleNamespace(input_router=router, command_prefix=",", game=None),
+        author=SimpleNamespace(id=AUTHOR),
+        channel=SimpleNamespace(id=CHANNEL),
+        send=send,
+    )
+
+
+def test_cancel_raises_in_pending_get_input():
+    async def run():
+        router = InputRouter()
+        prompt = asyncio.ensure_future(get_input(_context(router), "What?"))
+        await asyncio.sleep(0)
+        assert (AUTHOR, CHANNEL) in router
+
+        assert router.cancel(AUTHOR) == 1
+        with pytest.raises(ValueError, match="^cancelled$"):
+            await prompt
+        assert len(router) == 0
+
+    asyncio.run(run())
+
+
+def test_cancel_only_touches_the_channel_given():
+    async def run():
+        router = InputRouter()
+        prompt = asyncio.ensure_future(get_input(_context(router), "What?"))
+        await asyncio.sleep(0)
+
+        assert router.cancel(AUTHOR, CHANNEL + 1) == 0
+        assert router.cancel(AUTHOR + 1) == 0
+        assert not prompt.done()
+
+        assert router.cancel(AUTHOR, CHANNEL) == 1
+        with pytest.raises(ValueError, match="^cancelled$"):
+            await prompt
+
+    asyncio.run(run())
@@ -0,0 +1,26 @@
+"""Tests playing whole games on the headless bot with lib.headless.Simulation."""
+
+import asyncio
+
+import pytest
+
+from lib.headless.simulation import Simulation
+
+# players, travelers, and seed for each game
+GAMES = [(5, 0, 0), (7, 1, 1), (10, 2, 2), (15, 3, 3)]
+
+
+@pytest.mark.parametrize("players,travelers,seed", GAMES)
+def test_games_play_without_errors(players: int, travelers: int, seed: int):
+    async def run():
+        simulation = await Simulation.create(players, travelers, seed=seed)
+        try:
+            await simulation.play(3)
+            assert simulation.bot.command_errors == []
+            assert simulation.bot.errors == []
+            assert simulation.bot.game is None
+            assert len(simulation.bot.archive) == 1
+        finally:
+            await simulation.close()
+
+    asyncio.run(run())